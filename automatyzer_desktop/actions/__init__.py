@@ -3,46 +3,75 @@
 
 """
 Inicjalizacja modułu akcji.
-Importuje wszystkie dostępne akcje z podmodułów.
+Udostępnia wszystkie dostępne akcje z podmodułów. Podmoduły są importowane
+przy pierwszym odwołaniu do akcji - akcje pulpitu wymagają pyautogui
+(i działającego ekranu), a klasa bazowa akcji działa bez nich.
 """
 
+import importlib
+
 # Importuj akcję bazową
 from automatyzer_desktop.actions.base import BaseAction
 
-# Importuj podmoduły z akcjami
-from automatyzer_desktop.actions.app import *
-from automatyzer_desktop.actions.mouse import *
-from automatyzer_desktop.actions.keyboard import *
-
-# Można dodać więcej importów dla innych kategorii akcji
-
-# Lista wszystkich dostępnych akcji
-__all__ = [
-    # Akcja bazowa
-    'BaseAction',
-
+# Podmoduł, w którym zdefiniowana jest każda akcja
+_ACTION_MODULES = {
     # Akcje aplikacji
-    'OpenApplicationAction',
-    'CloseApplicationAction',
-    'FocusApplicationAction',
+    'OpenApplicationAction': 'app',
+    'CloseApplicationAction': 'app',
+    'FocusApplicationAction': 'app',
 
     # Akcje myszy
-    'ClickAction',
-    'RightClickAction',
-    'DoubleClickAction',
-    'DragAction',
-    'ScrollAction',
-    'MoveToAction',
-    'ScreenContainsAction',
+    'ClickAction': 'mouse',
+    'RightClickAction': 'mouse',
+    'DoubleClickAction': 'mouse',
+    'DragAction': 'mouse',
+    'ScrollAction': 'mouse',
+    'MoveToAction': 'mouse',
+    'ScreenContainsAction': 'mouse',
+    'ClickTextAction': 'mouse',
 
     # Akcje klawiatury
-    'TypeTextAction',
-    'PressKeyAction',
-    'HotkeyAction',
-    'KeyDownAction',
-    'KeyUpAction',
-    'PasteTextAction',
-    'CopyTextAction',
+    'TypeTextAction': 'keyboard',
+    'PressKeyAction': 'keyboard',
+    'HotkeyAction': 'keyboard',
+    'KeyDownAction': 'keyboard',
+    'KeyUpAction': 'keyboard',
+    'PasteTextAction': 'keyboard',
+    'CopyTextAction': 'keyboard',
+
+    # Akcje ekranu
+    'FindAnyOnScreenAction': 'screen',
+    'WaitForImageAction': 'screen',
+    'WaitForScreenSettledAction': 'screen',
+    'ReadTextAction': 'screen',
+    'FindTextAction': 'screen',
+    'ClassifyScreenAction': 'screen',
+    'TakeScreenshotAction': 'screen',
 
     # Można dodać więcej akcji
-]
\ No newline at end of file
+}
+
+# Lista wszystkich dostępnych akcji
+__all__ = ['BaseAction'] + list(_ACTION_MODULES)
+
+
+def __getattr__(name: str):
+    """
+    Importuje podmoduł akcji przy pierwszym odwołaniu do niej.
+
+    Args:
+        name: Nazwa klasy akcji
+
+    Returns:
+        Klasa akcji
+
+    Raises:
+        AttributeError: Jeśli akcja o tej nazwie nie istnieje
+    """
+    module_name = _ACTION_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    action_class = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = action_class
+    return action_class
@@ -12,7 +12,41 @@ Bazowa klasa dla wszystkich akcji wykonywanych przez bota.
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Type, ClassVar
+from typing import Any, Callable, Collection, Dict, Optional, Type, ClassVar
+
+
+def _type_name(param_type: Any) -> str:
+    """
+    Zwraca czytelną nazwę typu parametru (również dla krotki dopuszczalnych typów).
+
+    Args:
+        param_type: Typ lub krotka typów
+
+    Returns:
+        Nazwa typu
+    """
+    if isinstance(param_type, tuple):
+        return " lub ".join(t.__name__ for t in param_type)
+    return param_type.__name__
+
+
+def _check_type(param_name: str, value: Any, param_type: Any) -> None:
+    """
+    Sprawdza typ wartości parametru.
+
+    Args:
+        param_name: Nazwa parametru
+        value: Wartość parametru
+        param_type: Oczekiwany typ lub krotka dopuszczalnych typów
+
+    Raises:
+        TypeError: Gdy wartość ma nieprawidłowy typ
+    """
+    if not isinstance(value, param_type):
+        raise TypeError(
+            f"Parametr {param_name} powinien być typu {_type_name(param_type)}, "
+            f"otrzymano {type(value).__name__}"
+        )
 
 
 class BaseAction(ABC):
@@ -51,28 +85,75 @@ class BaseAction(ABC):
             if param_name not in kwargs:
                 raise ValueError(f"Brak wymaganego parametru: {param_name}")
 
-            value = kwargs[param_name]
-            if not isinstance(value, param_type):
-                raise TypeError(
-                    f"Parametr {param_name} powinien być typu {param_type.__name__}, "
-                    f"otrzymano {type(value).__name__}"
-                )
+            _check_type(param_name, kwargs[param_name], param_type)
 
         # Ustawienie opcjonalnych parametrów z wartościami domyślnymi
         for param_name, (param_type, default_value) in self.OPTIONAL_PARAMS.items():
             if param_name in kwargs:
-                value = kwargs[param_name]
-                if not isinstance(value, param_type):
-                    raise TypeError(
-                        f"Parametr {param_name} powinien być typu {param_type.__name__}, "
-                        f"otrzymano {type(value).__name__}"
-                    )
+                _check_type(param_name, kwargs[param_name], param_type)
             else:
                 kwargs[param_name] = default_value
 
         # Zapisanie parametrów
         self.params = kwargs
 
+    @classmethod
+    def bind_params(cls, constants: Dict[str, Any],
+                    dynamic: Collection[str]) -> Callable[[Any, Dict[str, Any]], "BaseAction"]:
+        """
+        Sprawdza z góry parametry znane przed wykonaniem (np. literały w skrypcie DSL)
+        i zwraca konstruktor akcji, który przy każdym wywołaniu sprawdza tylko
+        parametry dynamiczne.
+
+        Args:
+            constants: Parametry o stałych wartościach
+            dynamic: Nazwy parametrów, których wartości będą znane dopiero przy wykonaniu
+
+        Returns:
+            Funkcja (bot, wartości parametrów dynamicznych) -> instancja akcji
+
+        Raises:
+            ValueError: Gdy brakuje wymaganego parametru
+            TypeError: Gdy stały parametr ma nieprawidłowy typ
+        """
+        param_types = {name: param_type for name, (param_type, _) in cls.OPTIONAL_PARAMS.items()}
+        param_types.update(cls.REQUIRED_PARAMS)
+
+        for param_name in cls.REQUIRED_PARAMS:
+            if param_name not in constants and param_name not in dynamic:
+                raise ValueError(f"Brak wymaganego parametru: {param_name}")
+        for param_name, value in constants.items():
+            if param_name in param_types:
+                _check_type(param_name, value, param_types[param_name])
+
+        # Stałe parametry i wartości domyślne brakujących parametrów opcjonalnych
+        base_params = dict(constants)
+        for param_name, (_, default_value) in cls.OPTIONAL_PARAMS.items():
+            if param_name not in constants and param_name not in dynamic:
+                base_params[param_name] = default_value
+
+        checks = tuple((name, param_types[name]) for name in dynamic if name in param_types)
+        # Podklasy z własnym __init__ są tworzone zwykłym konstruktorem
+        direct = cls.__init__ is BaseAction.__init__
+        logger = logging.getLogger(f"{__name__}.{cls.__name__}")
+
+        def create(bot, values: Dict[str, Any]) -> "BaseAction":
+            for param_name, param_type in checks:
+                _check_type(param_name, values[param_name], param_type)
+
+            params = dict(base_params)
+            params.update(values)
+            if not direct:
+                return cls(bot=bot, **params)
+
+            action = cls.__new__(cls)
+            action.bot = bot
+            action.logger = logger
+            action.params = params
+            return action
+
+        return create
+
     @classmethod
     def get_action_name(cls) -> str:
         """
@@ -126,6 +207,25 @@ class BaseAction(ABC):
         """
         return self.params.get(name, default)
 
+    def wait_after(self, delay: float) -> float:
+        """
+        Czeka po wykonaniu akcji zgodnie z trybem synchronizacji: stały czas delay
+        (tryb "static") lub do ustabilizowania ekranu, obserwując region z parametru
+        settle_region (tryb "adaptive").
+
+        Args:
+            delay: Stałe opóźnienie po akcji (w sekundach)
+
+        Returns:
+            Czas oczekiwania (w sekundach)
+        """
+        # Import przy użyciu - klasa bazowa nie wymaga OpenCV (np. w interpreterze DSL i testach)
+        from automatyzer_desktop.utils.image_utils import parse_region
+        from automatyzer_desktop.utils.settle import get_settle_synchronizer
+
+        region = parse_region(self.get_param("settle_region"))
+        return get_settle_synchronizer().wait(self.ACTION_NAME, delay, region)
+
     @abstractmethod
     def execute(self) -> Any:
         """
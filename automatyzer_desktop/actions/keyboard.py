@@ -10,12 +10,12 @@ keyboard.py
 Implementacja akcji związanych z klawiaturą.
 """
 
-import time
 import logging
 from typing import Any, Dict, Optional, List, Union
 import pyautogui
 
 from automatyzer_desktop.actions.base import BaseAction
+from automatyzer_desktop.utils.frame_provider import invalidate_frames
 
 
 class TypeTextAction(BaseAction):
@@ -32,7 +32,8 @@ class TypeTextAction(BaseAction):
     OPTIONAL_PARAMS = {
         "selector": (str, None),  # Selektor CSS elementu, w który wpisać tekst
         "interval": (float, 0.0),  # Czas oczekiwania między wpisaniem kolejnych znaków (w sekundach)
-        "delay": (float, 0.1)  # Opóźnienie po wpisaniu całego tekstu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po wpisaniu całego tekstu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def execute(self) -> bool:
@@ -66,9 +67,11 @@ class TypeTextAction(BaseAction):
             pyautogui.write(text, interval=interval)
             self.logger.info(f"Wpisano tekst: {text}")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po wpisaniu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -90,7 +93,8 @@ class PressKeyAction(BaseAction):
     OPTIONAL_PARAMS = {
         "presses": (int, 1),  # Liczba naciśnięć
         "interval": (float, 0.0),  # Czas oczekiwania między naciśnięciami (w sekundach)
-        "delay": (float, 0.1)  # Opóźnienie po naciśnięciu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po naciśnięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def execute(self) -> bool:
@@ -111,9 +115,11 @@ class PressKeyAction(BaseAction):
             pyautogui.press(key, presses=presses, interval=interval)
             self.logger.info(f"Naciśnięto klawisz: {key} (x{presses})")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po naciśnięciu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -133,7 +139,8 @@ class HotkeyAction(BaseAction):
         "keys": list  # Lista klawiszy do naciśnięcia jednocześnie
     }
     OPTIONAL_PARAMS = {
-        "delay": (float, 0.1)  # Opóźnienie po naciśnięciu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po naciśnięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def validate(self) -> bool:
@@ -167,9 +174,11 @@ class HotkeyAction(BaseAction):
             pyautogui.hotkey(*keys)
             self.logger.info(f"Naciśnięto kombinację klawiszy: {' + '.join(keys)}")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po naciśnięciu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -189,7 +198,8 @@ class KeyDownAction(BaseAction):
         "key": str  # Klawisz do wciśnięcia
     }
     OPTIONAL_PARAMS = {
-        "delay": (float, 0.1)  # Opóźnienie po wciśnięciu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po wciśnięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def execute(self) -> bool:
@@ -208,9 +218,11 @@ class KeyDownAction(BaseAction):
             pyautogui.keyDown(key)
             self.logger.info(f"Wciśnięto klawisz: {key}")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po wciśnięciu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -230,7 +242,8 @@ class KeyUpAction(BaseAction):
         "key": str  # Klawisz do zwolnienia
     }
     OPTIONAL_PARAMS = {
-        "delay": (float, 0.1)  # Opóźnienie po zwolnieniu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po zwolnieniu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def execute(self) -> bool:
@@ -249,9 +262,11 @@ class KeyUpAction(BaseAction):
             pyautogui.keyUp(key)
             self.logger.info(f"Zwolniono klawisz: {key}")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po zwolnieniu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -271,7 +286,8 @@ class PasteTextAction(BaseAction):
     OPTIONAL_PARAMS = {
         "text": (str, None),  # Tekst do ustawienia w schowku przed wklejeniem
         "selector": (str, None),  # Selektor CSS elementu, w który wkleić tekst
-        "delay": (float, 0.1)  # Opóźnienie po wklejeniu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po wklejeniu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def execute(self) -> bool:
@@ -314,9 +330,11 @@ class PasteTextAction(BaseAction):
 
             self.logger.info("Wklejono tekst ze schowka")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po wklejeniu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -335,7 +353,8 @@ class CopyTextAction(BaseAction):
     REQUIRED_PARAMS = {}
     OPTIONAL_PARAMS = {
         "selector": (str, None),  # Selektor CSS elementu do zaznaczenia przed kopiowaniem
-        "delay": (float, 0.1)  # Opóźnienie po kopiowaniu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po kopiowaniu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def execute(self) -> Union[bool, str]:
@@ -374,9 +393,11 @@ class CopyTextAction(BaseAction):
             else:  # Windows/Linux
                 pyautogui.hotkey('ctrl', 'c')
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po kopiowaniu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             # Pobierz tekst ze schowka
             import pyperclip
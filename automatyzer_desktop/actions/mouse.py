@@ -10,7 +10,6 @@ mouse.py
 Implementacja akcji związanych z myszą.
 """
 
-import time
 import logging
 from typing import Any, Dict, Optional, Tuple, Union
 import pyautogui
@@ -19,7 +18,9 @@ import numpy as np
 from PIL import ImageGrab, Image
 
 from automatyzer_desktop.actions.base import BaseAction
-from automatyzer_desktop.utils.image_utils import find_image_on_screen
+from automatyzer_desktop.utils.image_utils import find_image_on_screen, parse_region, parse_scales
+from automatyzer_desktop.utils.frame_provider import invalidate_frames
+from automatyzer_desktop.utils.word_index import find_text_on_screen
 
 
 class ClickAction(BaseAction):
@@ -37,8 +38,14 @@ class ClickAction(BaseAction):
         "image": (str, None),  # Ścieżka do obrazu
         "selector": (str, None),  # Selektor CSS (dla aplikacji webowych)
         "confidence": (float, 0.8),  # Pewność dopasowania obrazu (0.0 - 1.0)
+        "region": ((tuple, list, str), None),  # Region wyszukiwania obrazu (x, y, width, height) lub nazwa monitora (np. monitor2)
+        "strategy": (str, "exact"),  # Strategia dopasowania obrazu (exact, pyramid, features)
+        "color_mode": (str, "bgr"),  # Tryb kolorów dopasowania (bgr, gray, edges, masked)
+        "scales": ((tuple, list, str), None),  # Skale wzorca (np. "1.0,1.25,1.5" lub "auto")
+        "changed_only": (bool, False),  # Szukaj tylko w obszarach zmienionych od poprzedniego wyszukiwania
         "duration": (float, 0.1),  # Czas ruchu myszy (w sekundach)
-        "delay": (float, 0.1)  # Opóźnienie po kliknięciu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po kliknięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def validate(self) -> bool:
@@ -73,6 +80,11 @@ class ClickAction(BaseAction):
         image = self.get_param("image")
         selector = self.get_param("selector")
         confidence = self.get_param("confidence")
+        region = self.get_param("region")
+        strategy = self.get_param("strategy")
+        color_mode = self.get_param("color_mode")
+        scales = self.get_param("scales")
+        changed_only = self.get_param("changed_only")
         duration = self.get_param("duration")
         delay = self.get_param("delay")
 
@@ -93,7 +105,9 @@ class ClickAction(BaseAction):
         # Jeśli podano obraz, znajdź go na ekranie
         elif image:
             try:
-                position = find_image_on_screen(image, confidence=confidence)
+                position = find_image_on_screen(image, confidence=confidence, region=parse_region(region),
+                                                strategy=strategy, color_mode=color_mode,
+                                                scales=parse_scales(scales), changed_only=changed_only)
                 if position:
                     x, y = position
                 else:
@@ -111,9 +125,11 @@ class ClickAction(BaseAction):
             pyautogui.click(x, y)
             self.logger.info(f"Kliknięto w pozycji ({x}, {y})")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po kliknięciu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -136,8 +152,14 @@ class RightClickAction(BaseAction):
         "image": (str, None),  # Ścieżka do obrazu
         "selector": (str, None),  # Selektor CSS (dla aplikacji webowych)
         "confidence": (float, 0.8),  # Pewność dopasowania obrazu (0.0 - 1.0)
+        "region": ((tuple, list, str), None),  # Region wyszukiwania obrazu (x, y, width, height) lub nazwa monitora (np. monitor2)
+        "strategy": (str, "exact"),  # Strategia dopasowania obrazu (exact, pyramid, features)
+        "color_mode": (str, "bgr"),  # Tryb kolorów dopasowania (bgr, gray, edges, masked)
+        "scales": ((tuple, list, str), None),  # Skale wzorca (np. "1.0,1.25,1.5" lub "auto")
+        "changed_only": (bool, False),  # Szukaj tylko w obszarach zmienionych od poprzedniego wyszukiwania
         "duration": (float, 0.1),  # Czas ruchu myszy (w sekundach)
-        "delay": (float, 0.1)  # Opóźnienie po kliknięciu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po kliknięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def validate(self) -> bool:
@@ -172,6 +194,11 @@ class RightClickAction(BaseAction):
         image = self.get_param("image")
         selector = self.get_param("selector")
         confidence = self.get_param("confidence")
+        region = self.get_param("region")
+        strategy = self.get_param("strategy")
+        color_mode = self.get_param("color_mode")
+        scales = self.get_param("scales")
+        changed_only = self.get_param("changed_only")
         duration = self.get_param("duration")
         delay = self.get_param("delay")
 
@@ -191,7 +218,9 @@ class RightClickAction(BaseAction):
         # Jeśli podano obraz, znajdź go na ekranie
         elif image:
             try:
-                position = find_image_on_screen(image, confidence=confidence)
+                position = find_image_on_screen(image, confidence=confidence, region=parse_region(region),
+                                                strategy=strategy, color_mode=color_mode,
+                                                scales=parse_scales(scales), changed_only=changed_only)
                 if position:
                     x, y = position
                 else:
@@ -209,9 +238,11 @@ class RightClickAction(BaseAction):
             pyautogui.rightClick(x, y)
             self.logger.info(f"Kliknięto prawym przyciskiem w pozycji ({x}, {y})")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po kliknięciu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -234,8 +265,14 @@ class DoubleClickAction(BaseAction):
         "image": (str, None),  # Ścieżka do obrazu
         "selector": (str, None),  # Selektor CSS (dla aplikacji webowych)
         "confidence": (float, 0.8),  # Pewność dopasowania obrazu (0.0 - 1.0)
+        "region": ((tuple, list, str), None),  # Region wyszukiwania obrazu (x, y, width, height) lub nazwa monitora (np. monitor2)
+        "strategy": (str, "exact"),  # Strategia dopasowania obrazu (exact, pyramid, features)
+        "color_mode": (str, "bgr"),  # Tryb kolorów dopasowania (bgr, gray, edges, masked)
+        "scales": ((tuple, list, str), None),  # Skale wzorca (np. "1.0,1.25,1.5" lub "auto")
+        "changed_only": (bool, False),  # Szukaj tylko w obszarach zmienionych od poprzedniego wyszukiwania
         "duration": (float, 0.1),  # Czas ruchu myszy (w sekundach)
-        "delay": (float, 0.1)  # Opóźnienie po kliknięciu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po kliknięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def validate(self) -> bool:
@@ -270,6 +307,11 @@ class DoubleClickAction(BaseAction):
         image = self.get_param("image")
         selector = self.get_param("selector")
         confidence = self.get_param("confidence")
+        region = self.get_param("region")
+        strategy = self.get_param("strategy")
+        color_mode = self.get_param("color_mode")
+        scales = self.get_param("scales")
+        changed_only = self.get_param("changed_only")
         duration = self.get_param("duration")
         delay = self.get_param("delay")
 
@@ -289,7 +331,9 @@ class DoubleClickAction(BaseAction):
         # Jeśli podano obraz, znajdź go na ekranie
         elif image:
             try:
-                position = find_image_on_screen(image, confidence=confidence)
+                position = find_image_on_screen(image, confidence=confidence, region=parse_region(region),
+                                                strategy=strategy, color_mode=color_mode,
+                                                scales=parse_scales(scales), changed_only=changed_only)
                 if position:
                     x, y = position
                 else:
@@ -307,9 +351,11 @@ class DoubleClickAction(BaseAction):
             pyautogui.doubleClick(x, y)
             self.logger.info(f"Podwójnie kliknięto w pozycji ({x}, {y})")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po kliknięciu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -333,7 +379,8 @@ class DragAction(BaseAction):
     }
     OPTIONAL_PARAMS = {
         "duration": (float, 0.5),  # Czas trwania przeciągnięcia (w sekundach)
-        "delay": (float, 0.1)  # Opóźnienie po przeciągnięciu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po przeciągnięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def execute(self) -> bool:
@@ -358,9 +405,11 @@ class DragAction(BaseAction):
             pyautogui.dragTo(x2, y2, duration=duration, button='left')
             self.logger.info(f"Przeciągnięto z ({x1}, {y1}) do ({x2}, {y2})")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po przeciągnięciu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -382,7 +431,8 @@ class ScrollAction(BaseAction):
     OPTIONAL_PARAMS = {
         "x": (int, None),  # Współrzędna X (jeśli None, to aktualna pozycja)
         "y": (int, None),  # Współrzędna Y (jeśli None, to aktualna pozycja)
-        "delay": (float, 0.1)  # Opóźnienie po przewinięciu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po przewinięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def execute(self) -> bool:
@@ -408,9 +458,11 @@ class ScrollAction(BaseAction):
             direction = "dół" if clicks < 0 else "górę"
             self.logger.info(f"Przewinięto w {direction} o {abs(clicks)} kliknięć")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po przewinięciu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -433,8 +485,14 @@ class MoveToAction(BaseAction):
         "image": (str, None),  # Ścieżka do obrazu
         "selector": (str, None),  # Selektor CSS (dla aplikacji webowych)
         "confidence": (float, 0.8),  # Pewność dopasowania obrazu (0.0 - 1.0)
+        "region": ((tuple, list, str), None),  # Region wyszukiwania obrazu (x, y, width, height) lub nazwa monitora (np. monitor2)
+        "strategy": (str, "exact"),  # Strategia dopasowania obrazu (exact, pyramid, features)
+        "color_mode": (str, "bgr"),  # Tryb kolorów dopasowania (bgr, gray, edges, masked)
+        "scales": ((tuple, list, str), None),  # Skale wzorca (np. "1.0,1.25,1.5" lub "auto")
+        "changed_only": (bool, False),  # Szukaj tylko w obszarach zmienionych od poprzedniego wyszukiwania
         "duration": (float, 0.1),  # Czas ruchu myszy (w sekundach)
-        "delay": (float, 0.1)  # Opóźnienie po ruchu (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po ruchu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
     }
 
     def validate(self) -> bool:
@@ -469,6 +527,11 @@ class MoveToAction(BaseAction):
         image = self.get_param("image")
         selector = self.get_param("selector")
         confidence = self.get_param("confidence")
+        region = self.get_param("region")
+        strategy = self.get_param("strategy")
+        color_mode = self.get_param("color_mode")
+        scales = self.get_param("scales")
+        changed_only = self.get_param("changed_only")
         duration = self.get_param("duration")
         delay = self.get_param("delay")
 
@@ -488,7 +551,9 @@ class MoveToAction(BaseAction):
         # Jeśli podano obraz, znajdź go na ekranie
         elif image:
             try:
-                position = find_image_on_screen(image, confidence=confidence)
+                position = find_image_on_screen(image, confidence=confidence, region=parse_region(region),
+                                                strategy=strategy, color_mode=color_mode,
+                                                scales=parse_scales(scales), changed_only=changed_only)
                 if position:
                     x, y = position
                 else:
@@ -503,9 +568,11 @@ class MoveToAction(BaseAction):
             pyautogui.moveTo(x, y, duration=duration)
             self.logger.info(f"Przesunięto kursor na pozycję ({x}, {y})")
 
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
             # Opóźnienie po ruchu
-            if delay > 0:
-                time.sleep(delay)
+            self.wait_after(delay)
 
             return True
         except Exception as e:
@@ -526,6 +593,11 @@ class ScreenContainsAction(BaseAction):
     }
     OPTIONAL_PARAMS = {
         "confidence": (float, 0.8),  # Pewność dopasowania obrazu (0.0 - 1.0)
+        "region": ((tuple, list, str), None),  # Region wyszukiwania obrazu (x, y, width, height) lub nazwa monitora (np. monitor2)
+        "strategy": (str, "exact"),  # Strategia dopasowania obrazu (exact, pyramid, features)
+        "color_mode": (str, "bgr"),  # Tryb kolorów dopasowania (bgr, gray, edges, masked)
+        "scales": ((tuple, list, str), None),  # Skale wzorca (np. "1.0,1.25,1.5" lub "auto")
+        "changed_only": (bool, False),  # Szukaj tylko w obszarach zmienionych od poprzedniego wyszukiwania
         "return_position": (bool, False)  # Czy zwrócić pozycję znalezionego obrazu
     }
 
@@ -540,10 +612,17 @@ class ScreenContainsAction(BaseAction):
         # Pobranie parametrów
         image = self.get_param("image")
         confidence = self.get_param("confidence")
+        region = self.get_param("region")
+        strategy = self.get_param("strategy")
+        color_mode = self.get_param("color_mode")
+        scales = self.get_param("scales")
+        changed_only = self.get_param("changed_only")
         return_position = self.get_param("return_position")
 
         try:
-            position = find_image_on_screen(image, confidence=confidence)
+            position = find_image_on_screen(image, confidence=confidence, region=parse_region(region),
+                                            strategy=strategy, color_mode=color_mode,
+                                            scales=parse_scales(scales), changed_only=changed_only)
 
             if position:
                 self.logger.info(f"Znaleziono obraz {image} na pozycji {position}")
@@ -555,4 +634,64 @@ class ScreenContainsAction(BaseAction):
                 return False
         except Exception as e:
             self.logger.error(f"Błąd podczas wyszukiwania obrazu: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+
+class ClickTextAction(BaseAction):
+    """
+    Akcja kliknięcia lewym przyciskiem myszy na tekście znalezionym na ekranie (OCR).
+    """
+
+    ACTION_NAME = "click_text"
+    ACTION_DESCRIPTION = "Klika na tekście znalezionym na ekranie (bez wzorca PNG dla każdej etykiety)."
+
+    REQUIRED_PARAMS = {
+        "text": str  # Tekst do kliknięcia (słowo lub fraza, np. etykieta przycisku)
+    }
+    OPTIONAL_PARAMS = {
+        "region": ((tuple, list, str), None),  # Region wyszukiwania tekstu (x, y, width, height)
+        "exact": (bool, False),  # Czy słowa muszą być równe (domyślnie wystarczy, że zawierają tekst)
+        "case_sensitive": (bool, False),  # Czy rozróżniać wielkość liter
+        "duration": (float, 0.1),  # Czas ruchu myszy (w sekundach)
+        "delay": (float, 0.1),  # Opóźnienie po kliknięciu (w sekundach)
+        "settle_region": ((tuple, list, str), None)  # Region obserwowany przy synchronizacji adaptive
+    }
+
+    def execute(self) -> bool:
+        """
+        Wykonuje akcję kliknięcia na tekście.
+
+        Returns:
+            True jeśli kliknięcie się powiodło, False w przeciwnym razie
+        """
+        # Pobranie parametrów
+        text = self.get_param("text")
+        region = self.get_param("region")
+        exact = self.get_param("exact")
+        case_sensitive = self.get_param("case_sensitive")
+        duration = self.get_param("duration")
+        delay = self.get_param("delay")
+
+        try:
+            position = find_text_on_screen(text, region=parse_region(region), exact=exact,
+                                           case_sensitive=case_sensitive)
+            if not position:
+                self.logger.error(f"Nie znaleziono tekstu: {text}")
+                return False
+            x, y = position
+
+            # Przesuń kursor i kliknij
+            pyautogui.moveTo(x, y, duration=duration)
+            pyautogui.click(x, y)
+            self.logger.info(f"Kliknięto tekst '{text}' w pozycji ({x}, {y})")
+
+            # Ekran mógł się zmienić - unieważnij współdzieloną klatkę
+            invalidate_frames()
+
+            # Opóźnienie po kliknięciu
+            self.wait_after(delay)
+
+            return True
+        except Exception as e:
+            self.logger.error(f"Błąd podczas kliknięcia na tekście: {str(e)}")
+            return False
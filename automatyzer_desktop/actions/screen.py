@@ -3,3 +3,332 @@
 screen.py
 """
 
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Implementacja akcji związanych z analizą zawartości ekranu.
+"""
+
+from typing import Any, Dict, Tuple, Union
+
+from automatyzer_desktop.actions.base import BaseAction
+from automatyzer_desktop.utils.image_utils import (
+    classify_screen, find_any_on_screen, parse_region, parse_scales, take_screenshot, wait_for_image
+)
+from automatyzer_desktop.utils.ocr import read_text
+from automatyzer_desktop.utils.perceptual_hash import get_screen_state_index, load_screen_states
+from automatyzer_desktop.utils.screen_changes import wait_for_screen_settled
+from automatyzer_desktop.utils.word_index import find_text_on_screen
+
+
+class FindAnyOnScreenAction(BaseAction):
+    """
+    Akcja wyszukująca jeden z wielu alternatywnych obrazów na ekranie.
+    """
+
+    ACTION_NAME = "find_any_on_screen"
+    ACTION_DESCRIPTION = "Sprawdza, który z podanych obrazów jest widoczny na ekranie (jeden zrzut dla wszystkich)."
+
+    REQUIRED_PARAMS = {
+        "images": list  # Lista ścieżek do obrazów (np. różne motywy, języki, stany przycisku)
+    }
+    OPTIONAL_PARAMS = {
+        "confidence": (float, 0.8),  # Pewność dopasowania obrazu (0.0 - 1.0)
+        "region": ((tuple, list, str), None),  # Region wyszukiwania obrazów (x, y, width, height) lub nazwa monitora (np. monitor2)
+        "strategy": (str, "exact"),  # Strategia dopasowania (exact, pyramid, features)
+        "color_mode": (str, "bgr"),  # Tryb kolorów dopasowania (bgr, gray, edges, masked)
+        "scales": ((tuple, list, str), None),  # Skale wzorców (np. "1.0,1.25,1.5" lub "auto")
+        "parallel": (bool, False)  # Czy dopasowywać obrazy równolegle
+    }
+
+    def validate(self) -> bool:
+        """
+        Sprawdza czy parametry akcji są poprawne.
+
+        Returns:
+            True jeśli parametry są poprawne, False w przeciwnym razie
+        """
+        images = self.get_param("images")
+        return len(images) > 0 and all(isinstance(image, str) for image in images)
+
+    def execute(self) -> Union[bool, Dict[str, Any]]:
+        """
+        Wykonuje akcję wyszukiwania obrazów.
+
+        Returns:
+            Słownik {"image": ścieżka, "x": x, "y": y, "confidence": pewność} dla najlepiej
+            dopasowanego obrazu lub False, jeśli żaden nie został znaleziony
+        """
+        if not self.validate():
+            self.logger.error("Parametr 'images' musi być niepustą listą ścieżek do obrazów.")
+            return False
+
+        # Pobranie parametrów
+        images = self.get_param("images")
+        confidence = self.get_param("confidence")
+        region = self.get_param("region")
+        strategy = self.get_param("strategy")
+        color_mode = self.get_param("color_mode")
+        scales = self.get_param("scales")
+        parallel = self.get_param("parallel")
+
+        try:
+            found = find_any_on_screen(images, confidence=confidence, region=parse_region(region), strategy=strategy,
+                                       parallel=parallel, color_mode=color_mode, scales=parse_scales(scales))
+
+            if found:
+                image, (x, y), score = found
+                self.logger.info(f"Znaleziono obraz {image} na pozycji ({x}, {y})")
+                return {"image": image, "x": x, "y": y, "confidence": score}
+            else:
+                self.logger.info(f"Nie znaleziono żadnego z obrazów: {', '.join(images)}")
+                return False
+        except Exception as e:
+            self.logger.error(f"Błąd podczas wyszukiwania obrazów: {str(e)}")
+            return False
+
+
+class WaitForImageAction(BaseAction):
+    """
+    Akcja oczekująca na pojawienie się obrazu na ekranie.
+    """
+
+    ACTION_NAME = "wait_for_image"
+    ACTION_DESCRIPTION = "Czeka na pojawienie się obrazu na ekranie (dopasowanie tylko w zmienionych obszarach)."
+
+    REQUIRED_PARAMS = {
+        "image": str  # Ścieżka do obrazu
+    }
+    OPTIONAL_PARAMS = {
+        "timeout": (float, 10.0),  # Maksymalny czas oczekiwania (w sekundach)
+        "confidence": (float, 0.8),  # Pewność dopasowania obrazu (0.0 - 1.0)
+        "region": ((tuple, list, str), None),  # Region obserwowanego ekranu (x, y, width, height) lub nazwa monitora
+        "strategy": (str, "exact"),  # Strategia dopasowania obrazu (exact, pyramid, features)
+        "color_mode": (str, "bgr"),  # Tryb kolorów dopasowania (bgr, gray, edges, masked)
+        "interval": (float, 0.1),  # Początkowy odstęp między zrzutami ekranu (w sekundach)
+        "max_interval": (float, 1.0)  # Maksymalny odstęp między zrzutami, gdy ekran się nie zmienia
+    }
+
+    def execute(self) -> Union[bool, Tuple[int, int]]:
+        """
+        Wykonuje akcję oczekiwania na obraz.
+
+        Returns:
+            Krotka (x, y) z pozycją środka obrazu lub False po upływie czasu oczekiwania
+        """
+        # Pobranie parametrów
+        image = self.get_param("image")
+        timeout = self.get_param("timeout")
+        confidence = self.get_param("confidence")
+        region = self.get_param("region")
+        strategy = self.get_param("strategy")
+        color_mode = self.get_param("color_mode")
+        interval = self.get_param("interval")
+        max_interval = self.get_param("max_interval")
+
+        try:
+            position, stats = wait_for_image(image, timeout=timeout, confidence=confidence,
+                                             region=parse_region(region), strategy=strategy,
+                                             interval=interval, max_interval=max_interval,
+                                             color_mode=color_mode)
+            self.logger.debug(f"Statystyki oczekiwania na {image}: {stats}")
+
+            if position:
+                return position
+            self.logger.info(f"Obraz {image} nie pojawił się w ciągu {timeout}s")
+            return False
+        except Exception as e:
+            self.logger.error(f"Błąd podczas oczekiwania na obraz: {str(e)}")
+            return False
+
+
+class WaitForScreenSettledAction(BaseAction):
+    """
+    Akcja oczekująca, aż ekran przestanie się zmieniać (np. po animacji lub przeładowaniu okna).
+    """
+
+    ACTION_NAME = "wait_for_screen_settled"
+    ACTION_DESCRIPTION = "Czeka, aż ekran nie zmienia się przez określony czas (zamiast stałego opóźnienia)."
+
+    REQUIRED_PARAMS = {}
+    OPTIONAL_PARAMS = {
+        "settle_time": (float, 0.3),  # Czas bez zmian, po którym ekran uznajemy za ustabilizowany (w sekundach)
+        "timeout": (float, 5.0),  # Maksymalny czas oczekiwania (w sekundach)
+        "region": ((tuple, list, str), None),  # Region obserwowanego ekranu (x, y, width, height) lub nazwa monitora
+        "interval": (float, 0.05)  # Odstęp między zrzutami ekranu (w sekundach)
+    }
+
+    def execute(self) -> bool:
+        """
+        Wykonuje akcję oczekiwania na ustabilizowanie ekranu.
+
+        Returns:
+            True jeśli ekran się ustabilizował, False po upływie czasu oczekiwania
+        """
+        # Pobranie parametrów
+        settle_time = self.get_param("settle_time")
+        timeout = self.get_param("timeout")
+        region = self.get_param("region")
+        interval = self.get_param("interval")
+
+        try:
+            settled, stats = wait_for_screen_settled(settle_time=settle_time, timeout=timeout,
+                                                     region=parse_region(region), interval=interval)
+            self.logger.debug(f"Statystyki oczekiwania na ustabilizowanie ekranu: {stats}")
+            return settled
+        except Exception as e:
+            self.logger.error(f"Błąd podczas oczekiwania na ustabilizowanie ekranu: {str(e)}")
+            return False
+
+
+class ReadTextAction(BaseAction):
+    """
+    Akcja odczytująca tekst z regionu ekranu (OCR).
+    """
+
+    ACTION_NAME = "read_text"
+    ACTION_DESCRIPTION = "Odczytuje tekst z regionu ekranu (OCR z pamięcią wyników dla niezmienionej zawartości)."
+
+    REQUIRED_PARAMS = {}
+    OPTIONAL_PARAMS = {
+        "region": ((tuple, list, str), None)  # Region ekranu (x, y, width, height); domyślnie cały ekran
+    }
+
+    def execute(self) -> Union[bool, str]:
+        """
+        Wykonuje akcję odczytu tekstu.
+
+        Returns:
+            Rozpoznany tekst lub False w przypadku błędu
+        """
+        region = self.get_param("region")
+
+        try:
+            text = read_text(parse_region(region))
+            if text is None:
+                return False
+            return text
+        except Exception as e:
+            self.logger.error(f"Błąd podczas odczytu tekstu z ekranu: {str(e)}")
+            return False
+
+
+class FindTextAction(BaseAction):
+    """
+    Akcja wyszukująca tekst (słowo lub frazę) na ekranie za pomocą OCR.
+    """
+
+    ACTION_NAME = "find_text"
+    ACTION_DESCRIPTION = "Znajduje tekst na ekranie (indeks słów OCR aktualizowany tylko w zmienionych obszarach)."
+
+    REQUIRED_PARAMS = {
+        "text": str  # Szukany tekst (słowo lub fraza)
+    }
+    OPTIONAL_PARAMS = {
+        "region": ((tuple, list, str), None),  # Region wyszukiwania (x, y, width, height)
+        "exact": (bool, False),  # Czy słowa muszą być równe (domyślnie wystarczy, że zawierają tekst)
+        "case_sensitive": (bool, False)  # Czy rozróżniać wielkość liter
+    }
+
+    def execute(self) -> Union[bool, Tuple[int, int]]:
+        """
+        Wykonuje akcję wyszukiwania tekstu.
+
+        Returns:
+            Krotka (x, y) z pozycją środka tekstu lub False, jeśli nie znaleziono
+        """
+        # Pobranie parametrów
+        text = self.get_param("text")
+        region = self.get_param("region")
+        exact = self.get_param("exact")
+        case_sensitive = self.get_param("case_sensitive")
+
+        try:
+            position = find_text_on_screen(text, region=parse_region(region), exact=exact,
+                                           case_sensitive=case_sensitive)
+            if position:
+                return position
+            self.logger.info(f"Nie znaleziono tekstu: {text}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Błąd podczas wyszukiwania tekstu: {str(e)}")
+            return False
+
+
+class ClassifyScreenAction(BaseAction):
+    """
+    Akcja rozpoznająca, który ze znanych stanów ekranu (strona, okno dialogowe) jest widoczny.
+    """
+
+    ACTION_NAME = "classify_screen"
+    ACTION_DESCRIPTION = "Rozpoznaje stan ekranu na podstawie skrótów percepcyjnych zrzutów referencyjnych."
+
+    REQUIRED_PARAMS = {}
+    OPTIONAL_PARAMS = {
+        "states": (str, None),  # Katalog zrzutów referencyjnych (domyślnie globalny indeks stanów)
+        "region": ((tuple, list, str), None),  # Region ekranu do rozpoznania (x, y, width, height)
+        "method": (str, "dhash"),  # Metoda skrótu (ahash, dhash, phash)
+        "max_distance": (int, None)  # Maksymalna odległość Hamminga (z 64 bitów) dla rozpoznania
+    }
+
+    def execute(self) -> Union[bool, str]:
+        """
+        Wykonuje akcję rozpoznawania stanu ekranu.
+
+        Returns:
+            Nazwa rozpoznanego stanu lub False, jeśli żaden stan nie pasuje
+        """
+        # Pobranie parametrów
+        states = self.get_param("states")
+        region = self.get_param("region")
+        method = self.get_param("method")
+        max_distance = self.get_param("max_distance")
+
+        try:
+            index = load_screen_states(states, method) if states else get_screen_state_index()
+            state = classify_screen(parse_region(region), index, max_distance)
+            if state is None:
+                return False
+            return state[0]
+        except Exception as e:
+            self.logger.error(f"Błąd podczas rozpoznawania stanu ekranu: {str(e)}")
+            return False
+
+
+class TakeScreenshotAction(BaseAction):
+    """
+    Akcja zapisująca zrzut ekranu (np. diagnostyczny w pipeline).
+    """
+
+    ACTION_NAME = "take_screenshot"
+    ACTION_DESCRIPTION = "Zapisuje zrzut ekranu do pliku (domyślnie kodowanie w tle, bez wstrzymywania akcji)."
+
+    REQUIRED_PARAMS = {}
+    OPTIONAL_PARAMS = {
+        "path": (str, None),  # Ścieżka do pliku wyjściowego (domyślnie plik tymczasowy)
+        "region": ((tuple, list, str), None),  # Region ekranu (x, y, width, height)
+        "format": (str, None),  # Format zapisu (png, webp, jpg)
+        "background": (bool, True)  # Czy kodować i zapisywać plik w tle
+    }
+
+    def execute(self) -> Union[bool, str]:
+        """
+        Wykonuje akcję zrzutu ekranu.
+
+        Returns:
+            Ścieżka do pliku zrzutu lub False w przypadku błędu
+        """
+        # Pobranie parametrów
+        path = self.get_param("path")
+        region = self.get_param("region")
+        image_format = self.get_param("format")
+        background = self.get_param("background")
+
+        try:
+            output_path = take_screenshot(path, region=parse_region(region), image_format=image_format,
+                                          background=background)
+            return output_path or False
+        except Exception as e:
+            self.logger.error(f"Błąd podczas wykonywania zrzutu ekranu: {str(e)}")
+            return False
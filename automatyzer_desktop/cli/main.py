@@ -18,6 +18,7 @@ from typing import Dict, List, Optional, Any
 
 from automatyzer_desktop.core.bot import AutomationBot
 from automatyzer_desktop.core.config import Config
+from automatyzer_desktop.dsl.checkpoint import CHECKPOINT_SUFFIX
 from automatyzer_desktop.dsl.interpreter import DSLInterpreter
 from automatyzer_desktop.nlp.speech_to_text import SpeechToText
 
@@ -61,6 +62,10 @@ def parse_arguments() -> argparse.Namespace:
     # Komenda: script - wykonanie skryptu DSL
     script_parser = subparsers.add_parser('script', help='Wykonaj skrypt DSL')
     script_parser.add_argument('script_file', type=str, help='Ścieżka do pliku ze skryptem DSL')
+    script_parser.add_argument('--checkpoint', action='store_true',
+                               help='Zapisuj postęp skryptu obok skryptu, aby można go było wznowić po błędzie')
+    script_parser.add_argument('--resume', action='store_true',
+                               help='Wznów skrypt od ostatniego punktu kontrolnego (po przerwaniu błędem)')
 
     # Komenda: task - wykonanie pojedynczego zadania
     task_parser = subparsers.add_parser('task', help='Wykonaj pojedyncze zadanie')
@@ -91,6 +96,11 @@ def parse_arguments() -> argparse.Namespace:
     server_parser.add_argument('--host', type=str, default='localhost', help='Host dla serwera API')
     server_parser.add_argument('--port', type=int, default=8000, help='Port dla serwera API')
 
+    # Komenda: bundle - spakowanie wzorców obrazów do paczki odwzorowywanej w pamięci
+    bundle_parser = subparsers.add_parser('bundle', help='Spakuj katalog wzorców obrazów do jednej paczki')
+    bundle_parser.add_argument('directory', type=str, help='Katalog z plikami wzorców')
+    bundle_parser.add_argument('--output', type=str, help='Ścieżka pliku paczki (domyślnie w katalogu wzorców)')
+
     return parser.parse_args()
 
 
@@ -109,6 +119,11 @@ def main() -> int:
     logger = logging.getLogger(__name__)
 
     try:
+        # Budowanie paczki wzorców nie wymaga bota (krok wdrożenia bez ekranu)
+        if args.command == 'bundle':
+            logger.info(f"Pakowanie wzorców z katalogu: {args.directory}")
+            return build_bundle(args.directory, args.output)
+
         # Inicjalizacja bota
         bot = AutomationBot(config_path=args.env, config_file=args.config)
 
@@ -116,7 +131,7 @@ def main() -> int:
         if args.command == 'script':
             # Wykonanie skryptu DSL
             logger.info(f"Wykonywanie skryptu DSL: {args.script_file}")
-            return execute_script(bot, args.script_file)
+            return execute_script(bot, args.script_file, args.resume, args.checkpoint)
 
         elif args.command == 'task':
             # Wykonanie zadania opisanego w języku naturalnym
@@ -161,13 +176,15 @@ def main() -> int:
         return 1
 
 
-def execute_script(bot: AutomationBot, script_file: str) -> int:
+def execute_script(bot: AutomationBot, script_file: str, resume: bool = False, checkpoint: bool = False) -> int:
     """
     Wykonuje skrypt DSL.
 
     Args:
         bot: Instancja bota
         script_file: Ścieżka do pliku skryptu
+        resume: Czy wznowić skrypt od ostatniego punktu kontrolnego
+        checkpoint: Czy zapisywać punkty kontrolne (niezależnie od DSL_CHECKPOINTS)
 
     Returns:
         Kod wyjścia (0 = sukces, inna wartość = błąd)
@@ -177,11 +194,13 @@ def execute_script(bot: AutomationBot, script_file: str) -> int:
         return 1
 
     try:
-        results = bot.execute_script(script_file)
+        results = bot.execute_script(script_file, resume=resume, checkpoints=checkpoint or None)
         print(f"Skrypt wykonany pomyślnie. Wyniki: {len(results)} operacji")
         return 0
     except Exception as e:
         print(f"Błąd podczas wykonywania skryptu: {str(e)}")
+        if os.path.exists(script_file + CHECKPOINT_SUFFIX):
+            print("Postęp skryptu zapisano - uruchom go ponownie z opcją --resume, aby kontynuować")
         return 1
 
 
@@ -415,5 +434,27 @@ def run_api_server(bot: AutomationBot, host: str, port: int) -> int:
         return 1
 
 
+def build_bundle(directory: str, output_path: Optional[str] = None) -> int:
+    """
+    Pakuje wzorce obrazów z katalogu do paczki odwzorowywanej w pamięci.
+
+    Args:
+        directory: Katalog z plikami wzorców
+        output_path: Ścieżka pliku paczki (opcjonalnie)
+
+    Returns:
+        Kod wyjścia (0 = sukces, inna wartość = błąd)
+    """
+    try:
+        from automatyzer_desktop.utils.template_bundle import build_template_bundle
+
+        path = build_template_bundle(directory, output_path)
+        print(f"Zapisano paczkę wzorców: {path}")
+        return 0
+    except Exception as e:
+        print(f"Błąd podczas pakowania wzorców: {str(e)}")
+        return 1
+
+
 if __name__ == "__main__":
     sys.exit(main())
\ No newline at end of file
@@ -21,8 +21,17 @@ from automatyzer_desktop.actions.base import BaseAction
 from automatyzer_desktop.pipeline.pipeline import Pipeline
 from automatyzer_desktop.pipeline.builder import PipelineBuilder
 from automatyzer_desktop.dsl.interpreter import DSLInterpreter
+from automatyzer_desktop.dsl.program_cache import get_program_cache
 from automatyzer_desktop.nlp.intent_parser import IntentParser
 from automatyzer_desktop.nlp.command_generator import CommandGenerator
+from automatyzer_desktop.utils.template_cache import get_template_cache
+from automatyzer_desktop.utils.template_bundle import load_template_bundle
+from automatyzer_desktop.utils.frame_provider import get_frame_provider
+from automatyzer_desktop.utils.capture import create_capture_backend
+from automatyzer_desktop.utils.screenshot_writer import get_screenshot_writer
+from automatyzer_desktop.utils.settle import get_settle_synchronizer
+from automatyzer_desktop.utils.ocr import get_ocr_service, set_tesseract_cmd
+from automatyzer_desktop.utils.perceptual_hash import get_screen_state_index
 
 
 class AutomationBot:
@@ -41,9 +50,64 @@ class AutomationBot:
         self.logger = logging.getLogger(__name__)
         self.config = Config(config_path)
 
+        # Budżet pamięci podręcznej wzorców obrazów
+        template_cache = get_template_cache()
+        template_cache.max_bytes = int(self.config.get('TEMPLATE_CACHE_MAX_BYTES', template_cache.max_bytes))
+
+        # Paczki wzorców odwzorowywane w pamięci (ścieżki oddzielone przecinkami)
+        for bundle_path in str(self.config.get('TEMPLATE_BUNDLES', '') or '').split(','):
+            if bundle_path.strip():
+                load_template_bundle(bundle_path.strip())
+
+        # Okno świeżości współdzielonej klatki ekranu (w sekundach)
+        frame_provider = get_frame_provider()
+        frame_provider.max_age = float(self.config.get('FRAME_MAX_AGE', frame_provider.max_age))
+
+        # Backend zrzutów ekranu (auto, mss, pil)
+        capture_backend = self.config.get('CAPTURE_BACKEND')
+        if capture_backend:
+            frame_provider.capture = create_capture_backend(str(capture_backend))
+
+        # Format i kompresja zrzutów ekranu zapisywanych w tle
+        screenshot_writer = get_screenshot_writer()
+        screenshot_writer.image_format = str(self.config.get('SCREENSHOT_FORMAT', screenshot_writer.image_format))
+        screenshot_writer.compression = int(self.config.get('SCREENSHOT_COMPRESSION', screenshot_writer.compression))
+        screenshot_writer.quality = int(self.config.get('SCREENSHOT_QUALITY', screenshot_writer.quality))
+
+        # Synchronizacja po akcjach: stałe opóźnienie (static) lub do ustabilizowania ekranu (adaptive)
+        settle_synchronizer = get_settle_synchronizer()
+        settle_synchronizer.mode = str(self.config.get('SYNC_MODE', settle_synchronizer.mode))
+        settle_synchronizer.settle_time = float(self.config.get('SETTLE_TIME', settle_synchronizer.settle_time))
+        settle_synchronizer.reaction_time = float(self.config.get('SETTLE_REACTION_TIME',
+                                                                  settle_synchronizer.reaction_time))
+        settle_synchronizer.interval = float(self.config.get('SETTLE_INTERVAL', settle_synchronizer.interval))
+        settle_synchronizer.max_delay = float(self.config.get('SETTLE_MAX_DELAY', settle_synchronizer.max_delay))
+
+        # Silnik OCR (auto, tesserocr, pytesseract) i język rozpoznawania
+        ocr_service = get_ocr_service()
+        ocr_service.engine_name = str(self.config.get('OCR_ENGINE', ocr_service.engine_name))
+        ocr_service.lang = str(self.config.get('OCR_LANG', ocr_service.lang))
+        tesseract_path = self.config.get('TESSERACT_PATH')
+        if tesseract_path:
+            set_tesseract_cmd(str(tesseract_path))
+
+        # Katalog zrzutów referencyjnych znanych stanów ekranu
+        screen_states_dir = self.config.get('SCREEN_STATES_DIR')
+        if screen_states_dir and os.path.isdir(str(screen_states_dir)):
+            get_screen_state_index().load_directory(str(screen_states_dir))
+
+        # Pamięć podręczna sparsowanych programów DSL (w pamięci i opcjonalnie obok skryptów)
+        program_cache = get_program_cache()
+        program_cache.max_entries = int(self.config.get('DSL_CACHE_SIZE', program_cache.max_entries))
+        program_cache.disk_cache = bool(self.config.get('DSL_DISK_CACHE', program_cache.disk_cache))
+
         # Inicjalizacja interpretera DSL
         self.dsl_interpreter = DSLInterpreter()
 
+        # Punkty kontrolne skryptów (dziennik obok skryptu, do wznowienia po błędzie); domyślnie
+        # wyłączone - dziennik zawiera wartości wszystkich zmiennych skryptu
+        self.script_checkpoints = bool(self.config.get('DSL_CHECKPOINTS', False))
+
         # Inicjalizacja komponentów NLP
         self.intent_parser = IntentParser()
         self.command_generator = CommandGenerator()
@@ -133,21 +197,23 @@ class AutomationBot:
             self.logger.error(f"Błąd podczas wykonywania komendy: {str(e)}")
             raise
 
-    def execute_script(self, script_path: str) -> List[Any]:
+    def execute_script(self, script_path: str, resume: bool = False,
+                       checkpoints: Optional[bool] = None) -> List[Any]:
         """
         Wykonuje skrypt DSL z pliku.
 
         Args:
             script_path: Ścieżka do pliku ze skryptem
+            resume: Czy wznowić skrypt od ostatniego punktu kontrolnego (włącza też ich zapis)
+            checkpoints: Czy zapisywać punkty kontrolne (None - według DSL_CHECKPOINTS)
 
         Returns:
             Lista wyników wykonania komend
         """
+        if checkpoints is None:
+            checkpoints = self.script_checkpoints
         try:
-            with open(script_path, 'r', encoding='utf-8') as f:
-                script_content = f.read()
-
-            return self.dsl_interpreter.interpret_script(script_content, self)
+            return self.dsl_interpreter.interpret_file(script_path, self, checkpoints=checkpoints, resume=resume)
         except Exception as e:
             self.logger.error(f"Błąd podczas wykonywania skryptu: {str(e)}")
             raise
@@ -212,4 +278,13 @@ class AutomationBot:
         Returns:
             Słownik z wynikami wykonania pipeline'u
         """
-        return pipeline.execute()
\ No newline at end of file
+        return pipeline.execute()
+
+    def get_settle_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Zwraca statystyki oczekiwania po akcjach.
+
+        Returns:
+            Słownik nazwa akcji -> statystyki (m.in. czas zaoszczędzony względem stałych opóźnień)
+        """
+        return get_settle_synchronizer().stats()
@@ -0,0 +1,220 @@
+# Punkty kontrolne wykonania skryptów DSL
+"""
+checkpoint.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dziennik punktów kontrolnych wykonania skryptu DSL.
+Po każdej instrukcji najwyższego poziomu zapisywana jest liczba wykonanych
+instrukcji oraz migawka zmiennych i pipeline'ów interpretera, dzięki czemu
+skrypt przerwany błędem można wznowić od miejsca przerwania, bez ponownego
+wykonywania zakończonych kroków (np. kliknięć czy wysłanych wiadomości).
+
+Dziennik jest plikiem <skrypt>.checkpoint obok skryptu, podmienianym
+atomowo po każdej instrukcji i usuwanym po pomyślnym zakończeniu skryptu.
+Zawiera wartości wszystkich zmiennych skryptu (także np. haseł) w postaci
+pickle, dlatego punkty kontrolne trzeba włączyć jawnie. Wartości zmiennych,
+których nie da się zserializować, są pomijane, a ich nazwy zapisywane
+w dzienniku - wznowienie, które by ich potrzebowało, jest odrzucane.
+"""
+
+import os
+import pickle
+import logging
+import tempfile
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Rozszerzenie pliku dziennika zapisywanego obok skryptu
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+# Wersja formatu dziennika (zmiana unieważnia zapisane dzienniki)
+CHECKPOINT_VERSION = 2
+
+
+def _serialize_values(values: Dict[Any, Any]) -> Tuple[Dict[Any, bytes], Dict[Any, str]]:
+    """
+    Serializuje wartości słownika osobno, pomijając te, których nie da się zapisać.
+
+    Args:
+        values: Słownik nazwa -> wartość
+
+    Returns:
+        Krotka (słownik nazwa -> zserializowana wartość, słownik nazwa pominiętej
+        wartości -> przyczyna)
+    """
+    serialized = {}
+    skipped = {}
+    for name, value in values.items():
+        try:
+            serialized[name] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            skipped[name] = str(e)
+    return serialized, skipped
+
+
+def _deserialize_values(serialized: Dict[Any, bytes]) -> Dict[Any, Any]:
+    """
+    Odtwarza wartości zapisane przez _serialize_values (pomijając uszkodzone).
+
+    Args:
+        serialized: Słownik nazwa -> zserializowana wartość
+
+    Returns:
+        Słownik nazwa -> wartość
+    """
+    values = {}
+    for name, data in serialized.items():
+        try:
+            values[name] = pickle.loads(data)
+        except Exception as e:
+            logger.warning(f"Nie udało się odtworzyć wartości '{name}' z punktu kontrolnego: {str(e)}")
+    return values
+
+
+class CheckpointJournal:
+    """
+    Dziennik punktów kontrolnych jednego skryptu.
+    Punkt kontrolny jest ważny tylko dla skryptu o tym samym skrócie kodu źródłowego.
+    """
+
+    def __init__(self, path: str, source_hash: str):
+        """
+        Inicjalizacja dziennika.
+
+        Args:
+            path: Ścieżka do pliku dziennika
+            source_hash: Skrót kodu źródłowego skryptu
+        """
+        self.path = path
+        self.source_hash = source_hash
+        # Wyłączany po pierwszym nieudanym zapisie (np. katalog tylko do odczytu)
+        self.enabled = True
+        # Zmienne, o których pominięciu już ostrzeżono
+        self._warned: Set[str] = set()
+        # Zserializowane wyniki wykonanych instrukcji (None - wyniku nie da się zapisać);
+        # wyniki nie zmieniają się po wykonaniu, więc każdy jest serializowany raz
+        self._results: List[Optional[bytes]] = []
+
+    @classmethod
+    def for_script(cls, script_path: str, source_hash: str) -> "CheckpointJournal":
+        """
+        Tworzy dziennik zapisywany obok pliku skryptu.
+
+        Args:
+            script_path: Ścieżka do pliku skryptu
+            source_hash: Skrót kodu źródłowego skryptu
+
+        Returns:
+            Dziennik punktów kontrolnych
+        """
+        return cls(script_path + CHECKPOINT_SUFFIX, source_hash)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Wczytuje ostatni punkt kontrolny.
+
+        Returns:
+            Słownik z kluczami completed (liczba wykonanych instrukcji najwyższego poziomu),
+            environment, pipelines, results i skipped (nazwy zmiennych, których wartości nie
+            zapisano) lub None, jeśli nie ma ważnego punktu kontrolnego
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Nie udało się wczytać punktu kontrolnego {self.path}: {str(e)}")
+            return None
+
+        if data.get("version") != CHECKPOINT_VERSION:
+            logger.warning(f"Nieobsługiwana wersja punktu kontrolnego: {self.path}")
+            return None
+        if data.get("hash") != self.source_hash:
+            logger.warning(f"Skrypt zmienił się od zapisania punktu kontrolnego {self.path} - "
+                           f"wykonanie od początku")
+            return None
+
+        self._results = list(data["results"])
+        results = _deserialize_values({index: result for index, result in enumerate(self._results)
+                                       if result is not None})
+        environment = _deserialize_values(data["environment"])
+        # Zmienne pominięte przy zapisie lub uszkodzone przy odczycie
+        skipped = set(data["skipped"]) | (set(data["environment"]) - set(environment))
+        return {
+            "completed": data["completed"],
+            "environment": environment,
+            "pipelines": _deserialize_values(data["pipelines"]),
+            "results": [results.get(index) for index in range(len(self._results))],
+            "skipped": sorted(skipped)
+        }
+
+    def record(self, completed: int, environment: Dict[str, Any], pipelines: Dict[str, Any],
+               results: List[Any]) -> None:
+        """
+        Zapisuje punkt kontrolny po wykonaniu instrukcji najwyższego poziomu.
+        Błąd zapisu jest logowany, a dalsze zapisy w tym dzienniku są pomijane.
+
+        Args:
+            completed: Liczba wykonanych instrukcji najwyższego poziomu
+            environment: Zmienne interpretera
+            pipelines: Zdefiniowane pipeline'y (nazwa -> kroki AST)
+            results: Wyniki wykonanych instrukcji
+        """
+        if not self.enabled:
+            return
+
+        del self._results[len(results):]
+        for result in results[len(self._results):]:
+            try:
+                self._results.append(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                self._results.append(None)
+
+        serialized_environment, skipped = _serialize_values(environment)
+        for name in skipped.keys() - self._warned:
+            logger.warning(f"Zmiennej '{name}' nie da się zapisać w punkcie kontrolnym ({skipped[name]}) - "
+                           f"wznowienie skryptu po jej użyciu nie będzie możliwe")
+        self._warned.update(skipped)
+
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "hash": self.source_hash,
+            "completed": completed,
+            "environment": serialized_environment,
+            "skipped": sorted(skipped),
+            "pipelines": _serialize_values(pipelines)[0],
+            # Wyniki, których nie da się zapisać, są odtwarzane jako None
+            "results": self._results
+        }
+        try:
+            # Zapis do pliku tymczasowego i podmiana - przerwanie w trakcie zapisu
+            # nie niszczy poprzedniego punktu kontrolnego
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                os.remove(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"Nie udało się zapisać punktu kontrolnego {self.path}: {str(e)}")
+            self.enabled = False
+
+    def clear(self) -> None:
+        """
+        Usuwa dziennik (po pomyślnym zakończeniu skryptu).
+        """
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception as e:
+            logger.warning(f"Nie udało się usunąć punktu kontrolnego {self.path}: {str(e)}")
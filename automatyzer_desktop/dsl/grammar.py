@@ -285,6 +285,14 @@ TOKEN_PATTERNS = [
 # Skompilowane wyrażenia regularne dla tokenizacji
 COMPILED_PATTERNS = [(re.compile(pattern), token_type) for pattern, token_type in TOKEN_PATTERNS]
 
+# Grupy nazwane wyrażenia głównego (nazwa grupy -> typ tokenu), w kolejności TOKEN_PATTERNS
+TOKEN_GROUPS = {f"T{index}": token_type for index, (_, token_type) in enumerate(TOKEN_PATTERNS)}
+
+# Jedno wyrażenie główne ze wszystkimi wzorcami jako alternatywami - alternatywy są sprawdzane
+# od lewej, więc wygrywa pierwszy pasujący wzorzec, jak przy sprawdzaniu TOKEN_PATTERNS po kolei
+MASTER_PATTERN = re.compile("|".join(f"(?P<T{index}>{pattern})"
+                                     for index, (pattern, _) in enumerate(TOKEN_PATTERNS)))
+
 # Gramatyka DSL
 
 # Definicja gramatyki w formie EBNF (Extended Backus-Naur Form):
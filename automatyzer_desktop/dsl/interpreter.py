@@ -8,17 +8,28 @@ interpreter.py
 
 """
 Interpreter kodu DSL, który wykonuje instrukcje na podstawie drzewa składniowego.
+Drzewo jest raz kompilowane do drzewa domknięć Pythona (z parametrami-literałami
+wyliczonymi z góry), więc pętle wykonują gotowe funkcje zamiast ponownie
+rozpoznawać typy węzłów przy każdej iteracji. Przed wykonaniem faza łączenia
+wiąże każde wywołanie akcji z klasą akcji bota i sprawdza parametry-literały,
+zgłaszając błędy (z numerem linii i kolumny) zanim wykona się jakakolwiek akcja.
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from automatyzer_desktop.dsl.grammar import (
     ASTNode, CommandNode, AssignmentNode,
     VariableNode, LiteralNode, BlockNode, ConditionalNode,
     LoopNode, PipelineNode
 )
-from automatyzer_desktop.dsl.lexer import Lexer
-from automatyzer_desktop.dsl.parser import Parser
+from automatyzer_desktop.dsl.checkpoint import CheckpointJournal
+from automatyzer_desktop.dsl.program_cache import Program, ProgramCache, get_program_cache
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Skompilowany węzeł: funkcja (interpreter, bot) -> wynik wykonania węzła
+Executable = Callable[["DSLInterpreter", Any], Any]
 
 
 class InterpreterError(Exception):
@@ -43,24 +54,64 @@ class InterpreterError(Exception):
         super().__init__(f"{message}{location}")
 
 
+def _referenced_variables(nodes: Iterable[ASTNode]) -> Set[str]:
+    """
+    Zwraca nazwy zmiennych odczytywanych w węzłach AST (także w blokach, pętlach i pipeline'ach).
+
+    Args:
+        nodes: Węzły AST
+
+    Returns:
+        Zbiór nazw zmiennych
+    """
+    names = set()
+    pending = list(nodes)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, VariableNode):
+            names.add(node.name)
+        elif isinstance(node, CommandNode):
+            pending.extend(value for value in node.params.values() if isinstance(value, ASTNode))
+        elif isinstance(node, AssignmentNode):
+            pending.append(node.value)
+        elif isinstance(node, BlockNode):
+            pending.extend(node.statements)
+        elif isinstance(node, ConditionalNode):
+            pending.extend(child for child in (node.condition, node.true_block, node.false_block) if child)
+        elif isinstance(node, LoopNode):
+            pending.extend((node.condition, node.block))
+        elif isinstance(node, PipelineNode):
+            pending.extend(node.steps)
+    return names
+
+
 class DSLInterpreter:
     """
     Interpreter kodu DSL.
     Wykonuje instrukcje na podstawie drzewa składniowego.
     """
 
-    def __init__(self):
+    def __init__(self, program_cache: Optional[ProgramCache] = None):
         """
         Inicjalizacja interpretera.
+
+        Args:
+            program_cache: Pamięć podręczna sparsowanych programów (domyślnie globalna)
         """
         self.logger = logging.getLogger(__name__)
 
+        # Pamięć podręczna AST - powtarzany kod nie jest ponownie tokenizowany i parsowany
+        self.program_cache = program_cache if program_cache is not None else get_program_cache()
+
         # Środowisko wykonania (zmienne)
         self.environment = {}
 
         # Zdefiniowane pipeline'y
         self.pipelines = {}
 
+        # Skompilowane kroki pipeline'ów: nazwa -> (kroki AST, skompilowane kroki)
+        self._compiled_pipelines: Dict[str, Tuple[List[CommandNode], Tuple[Executable, ...]]] = {}
+
     def interpret(self, code: str, bot) -> Any:
         """
         Interpretuje kod DSL.
@@ -76,25 +127,31 @@ class DSLInterpreter:
             InterpreterError: Gdy wystąpi błąd podczas interpretacji
         """
         try:
-            # Tokenizacja
-            tokens = Lexer(code).tokenize()
+            # Tokenizacja, parsowanie i kompilacja (lub program z pamięci podręcznej)
+            program = self._compile(self.program_cache.get(code))
 
-            # Parsowanie
-            ast = Parser(tokens).parse()
+            # Łączenie z akcjami bota
+            program.link(bot)
 
             # Wykonanie
-            return self._execute_statements(ast, bot)
+            result = None
+            for step in program.steps:
+                result = step(self, bot)
+            return result
         except Exception as e:
             self.logger.error(f"Błąd interpretacji DSL: {str(e)}")
             raise
 
-    def interpret_script(self, script: str, bot) -> List[Any]:
+    def interpret_script(self, script: str, bot, journal: Optional[CheckpointJournal] = None,
+                         resume: bool = False) -> List[Any]:
         """
         Interpretuje skrypt DSL.
 
         Args:
             script: Skrypt DSL
             bot: Referencja do głównego obiektu bota
+            journal: Dziennik punktów kontrolnych zapisywanych po każdej instrukcji najwyższego poziomu
+            resume: Czy wznowić wykonanie od ostatniego punktu kontrolnego z dziennika
 
         Returns:
             Lista wyników wykonania instrukcji
@@ -103,270 +160,489 @@ class DSLInterpreter:
             InterpreterError: Gdy wystąpi błąd podczas interpretacji
         """
         try:
-            # Tokenizacja
-            tokens = Lexer(script).tokenize()
+            # Tokenizacja, parsowanie i kompilacja (lub program z pamięci podręcznej)
+            program = self._compile(self.program_cache.get(script))
 
-            # Parsowanie
-            ast = Parser(tokens).parse()
+            # Łączenie z akcjami bota
+            program.link(bot)
 
             # Wykonanie
-            results = []
-            for node in ast:
-                result = self._execute_node(node, bot)
-                results.append(result)
-
-            return results
+            return self._execute_program(program, bot, journal, resume)
         except Exception as e:
             self.logger.error(f"Błąd interpretacji skryptu DSL: {str(e)}")
             raise
 
-    def _execute_statements(self, statements: List[ASTNode], bot) -> Any:
+    def interpret_file(self, script_path: str, bot, checkpoints: bool = False, resume: bool = False) -> List[Any]:
         """
-        Wykonuje listę instrukcji.
+        Interpretuje skrypt DSL z pliku.
+        AST skryptu może pochodzić z pliku pamięci podręcznej obok skryptu.
 
         Args:
-            statements: Lista węzłów AST
+            script_path: Ścieżka do pliku skryptu
             bot: Referencja do głównego obiektu bota
+            checkpoints: Czy zapisywać punkty kontrolne w dzienniku obok skryptu
+            resume: Czy wznowić wykonanie od ostatniego punktu kontrolnego (włącza też ich zapis)
 
         Returns:
-            Wynik wykonania ostatniej instrukcji
-        """
-        result = None
-
-        for node in statements:
-            result = self._execute_node(node, bot)
+            Lista wyników wykonania instrukcji
 
-        return result
+        Raises:
+            InterpreterError: Gdy wystąpi błąd podczas interpretacji
+        """
+        try:
+            cached = self.program_cache.get_file(script_path)
+            program = self._compile(cached)
+            program.link(bot)
+
+            journal = None
+            if checkpoints or resume:
+                journal = CheckpointJournal.for_script(script_path, cached.source_hash)
+            return self._execute_program(program, bot, journal, resume)
+        except Exception as e:
+            self.logger.error(f"Błąd interpretacji skryptu DSL: {str(e)}")
+            raise
 
-    def _execute_node(self, node: ASTNode, bot) -> Any:
+    @staticmethod
+    def _compile(program: Program) -> "CompiledProgram":
         """
-        Wykonuje pojedynczy węzeł AST.
+        Zwraca skompilowaną postać programu (kompilowaną przy pierwszym wykonaniu).
 
         Args:
-            node: Węzeł AST
-            bot: Referencja do głównego obiektu bota
+            program: Program z pamięci podręcznej
 
         Returns:
-            Wynik wykonania węzła
-
-        Raises:
-            InterpreterError: Gdy wystąpi nieobsługiwany typ węzła
+            Skompilowany program
         """
-        if isinstance(node, CommandNode):
-            return self._execute_command(node, bot)
-        elif isinstance(node, AssignmentNode):
-            return self._execute_assignment(node, bot)
-        elif isinstance(node, VariableNode):
-            return self._get_variable_value(node)
-        elif isinstance(node, LiteralNode):
-            return node.value
-        elif isinstance(node, BlockNode):
-            return self._execute_block(node, bot)
-        elif isinstance(node, ConditionalNode):
-            return self._execute_conditional(node, bot)
-        elif isinstance(node, LoopNode):
-            return self._execute_loop(node, bot)
-        elif isinstance(node, PipelineNode):
-            return self._define_pipeline(node)
-        else:
-            raise InterpreterError(f"Nieobsługiwany typ węzła: {type(node).__name__}", node)
+        if program.compiled is None:
+            program.compiled = CompiledProgram(program.statements)
+        return program.compiled
 
-    def _execute_command(self, node: CommandNode, bot) -> Any:
+    def _execute_program(self, program: "CompiledProgram", bot, journal: Optional[CheckpointJournal] = None,
+                         resume: bool = False) -> List[Any]:
         """
-        Wykonuje komendę.
+        Wykonuje instrukcje najwyższego poziomu skryptu.
 
         Args:
-            node: Węzeł komendy
+            program: Skompilowany program
             bot: Referencja do głównego obiektu bota
+            journal: Dziennik punktów kontrolnych (None - bez punktów kontrolnych)
+            resume: Czy wznowić wykonanie od ostatniego punktu kontrolnego z dziennika
 
         Returns:
-            Wynik wykonania komendy
+            Lista wyników wykonania instrukcji (także instrukcji wykonanych przed wznowieniem)
 
         Raises:
-            InterpreterError: Gdy nie znaleziono komendy
+            InterpreterError: Gdy punkt kontrolny nie zawiera zmiennych potrzebnych
+                              pozostałym instrukcjom
         """
-        command_name = node.name
-
-        # Sprawdź czy to wywołanie pipeline'a
-        if command_name == "execute_pipeline":
-            return self._execute_pipeline_call(node, bot)
-
-        # Ewaluacja parametrów
-        params = {}
-        for param_name, param_value_node in node.params.items():
-            params[param_name] = self._execute_node(param_value_node, bot)
-
-        # Wykonanie akcji
-        try:
-            action = bot.create_action(command_name, **params)
-            if action:
-                return action.execute()
-            else:
-                raise InterpreterError(f"Nie znaleziono akcji: {command_name}", node)
-        except Exception as e:
-            self.logger.error(f"Błąd podczas wykonywania komendy {command_name}: {str(e)}")
-            raise InterpreterError(f"Błąd podczas wykonywania komendy {command_name}: {str(e)}", node)
-
-    def _execute_assignment(self, node: AssignmentNode, bot) -> Any:
+        results = []
+        start = 0
+
+        if journal is not None and resume:
+            checkpoint = journal.load()
+            if checkpoint is not None and checkpoint["skipped"]:
+                remaining = list(program.statements[checkpoint["completed"]:])
+                for steps in checkpoint["pipelines"].values():
+                    remaining.extend(steps)
+                needed = sorted(set(checkpoint["skipped"]) & _referenced_variables(remaining))
+                if needed:
+                    raise InterpreterError(
+                        f"Nie można wznowić skryptu: punkt kontrolny nie zawiera zmiennych "
+                        f"{', '.join(needed)} (ich wartości nie dało się zapisać), a używają ich "
+                        f"pozostałe instrukcje - uruchom skrypt od początku, bez opcji resume")
+            if checkpoint is not None:
+                # Odtworzenie stanu - zakończone instrukcje nie są wykonywane ponownie
+                self.environment.update(checkpoint["environment"])
+                self.pipelines.update(checkpoint["pipelines"])
+                results = checkpoint["results"]
+                start = checkpoint["completed"]
+                self.logger.info(f"Wznawianie skryptu od instrukcji {start + 1} z {len(program.steps)}")
+
+        for index in range(start, len(program.steps)):
+            result = program.steps[index](self, bot)
+            results.append(result)
+
+            if journal is not None:
+                journal.record(index + 1, self.environment, self.pipelines, results)
+
+        # Skrypt zakończony - punkt kontrolny nie jest już potrzebny
+        if journal is not None:
+            journal.clear()
+
+        return results
+
+    def _pipeline_steps(self, pipeline_name: str) -> Tuple[Executable, ...]:
         """
-        Wykonuje przypisanie zmiennej.
+        Zwraca skompilowane kroki pipeline'a.
 
         Args:
-            node: Węzeł przypisania
-            bot: Referencja do głównego obiektu bota
+            pipeline_name: Nazwa zdefiniowanego pipeline'a
 
         Returns:
-            Wartość przypisania
+            Skompilowane kroki (kompilowane ponownie, jeśli pipeline'y podmieniono z zewnątrz)
         """
-        var_name = node.variable
-        value = self._execute_node(node.value, bot)
+        steps = self.pipelines[pipeline_name]
+        compiled = self._compiled_pipelines.get(pipeline_name)
+        if compiled is None or compiled[0] is not steps:
+            compiled = (steps, tuple(compile_node(step) for step in steps))
+            self._compiled_pipelines[pipeline_name] = compiled
+        return compiled[1]
 
-        # Zapisz zmienną w środowisku
-        self.environment[var_name] = value
 
-        return value
+class CompiledProgram:
+    """
+    Program DSL skompilowany do drzewa domknięć.
+    Nie zależy od stanu interpretera, więc może być wykonywany wielokrotnie
+    (także przez różne interpretery).
+    """
+
+    __slots__ = ("statements", "steps", "sites", "linked_bot")
 
-    def _get_variable_value(self, node: VariableNode) -> Any:
+    def __init__(self, statements: List[ASTNode]):
         """
-        Pobiera wartość zmiennej.
+        Kompiluje program.
 
         Args:
-            node: Węzeł zmiennej
+            statements: Lista węzłów AST instrukcji najwyższego poziomu
+        """
+        self.statements = statements
+        # Wywołania akcji w całym programie (także w blokach, pętlach i pipeline'ach)
+        self.sites: List[CommandSite] = []
+        self.steps: List[Executable] = [compile_node(node, self.sites) for node in statements]
+        # Bot, z którego akcjami program został ostatnio połączony
+        self.linked_bot = None
+
+    def link(self, bot) -> None:
+        """
+        Faza łączenia: wiąże wszystkie wywołania akcji z klasami akcji bota
+        i sprawdza parametry-literały, zanim wykona się pierwsza instrukcja.
 
-        Returns:
-            Wartość zmiennej
+        Args:
+            bot: Referencja do głównego obiektu bota
 
         Raises:
-            InterpreterError: Gdy zmienna nie istnieje
+            InterpreterError: Gdy akcja nie istnieje lub parametry-literały są nieprawidłowe
+                              (pierwszy błąd; wszystkie są logowane)
         """
-        var_name = node.name
+        if self.linked_bot is bot:
+            return
+
+        errors = []
+        for site in self.sites:
+            try:
+                site.link(bot)
+            except InterpreterError as e:
+                logger.error(f"Błąd łączenia skryptu DSL: {str(e)}")
+                errors.append(e)
+        if errors:
+            raise errors[0]
 
-        # Sprawdź czy zmienna istnieje
-        if var_name not in self.environment:
-            # Sprawdź czy to specjalna zmienna 'env' (do dostępu do zmiennych środowiskowych)
-            if var_name == "env":
-                # Zwracamy proxy dla zmiennych środowiskowych
-                # (będzie obsługiwane specjalnie przez interpreter)
-                return EnvProxy()
+        self.linked_bot = bot
 
-            raise InterpreterError(f"Niezdefiniowana zmienna: {var_name}", node)
 
-        return self.environment[var_name]
+class CommandSite:
+    """
+    Wywołanie akcji w skompilowanym programie.
+    Po połączeniu z botem przechowuje konstruktor akcji, który sprawdza
+    jedynie parametry obliczane przy wykonaniu.
+    """
+
+    __slots__ = ("node", "constants", "dynamic", "binding")
 
-    def _execute_block(self, node: BlockNode, bot) -> Any:
+    def __init__(self, node: CommandNode, constants: Dict[str, Any], dynamic: Tuple[str, ...]):
         """
-        Wykonuje blok kodu.
+        Inicjalizacja wywołania.
 
         Args:
-            node: Węzeł bloku
-            bot: Referencja do głównego obiektu bota
-
-        Returns:
-            Wynik wykonania ostatniej instrukcji w bloku
+            node: Węzeł komendy
+            constants: Parametry-literały
+            dynamic: Nazwy parametrów obliczanych przy wykonaniu
         """
-        return self._execute_statements(node.statements, bot)
+        self.node = node
+        self.constants = constants
+        self.dynamic = dynamic
+        # Ostatnie powiązanie: (bot, konstruktor akcji)
+        self.binding: Tuple[Any, Optional[Callable[[Any, Dict[str, Any]], Any]]] = (None, None)
 
-    def _execute_conditional(self, node: ConditionalNode, bot) -> Any:
+    def link(self, bot) -> Callable[[Any, Dict[str, Any]], Any]:
         """
-        Wykonuje instrukcję warunkową.
+        Wiąże wywołanie z klasą akcji bota i sprawdza parametry-literały.
 
         Args:
-            node: Węzeł instrukcji warunkowej
             bot: Referencja do głównego obiektu bota
 
         Returns:
-            Wynik wykonania odpowiedniego bloku
+            Konstruktor akcji: (bot, wartości parametrów dynamicznych) -> akcja
+
+        Raises:
+            InterpreterError: Gdy akcja nie istnieje lub parametry-literały są nieprawidłowe
         """
-        condition = self._execute_node(node.condition, bot)
+        command_name = self.node.name
+        try:
+            action_class = bot.get_action(command_name)
+        except Exception as e:
+            raise InterpreterError(f"Błąd podczas wyszukiwania akcji {command_name}: {str(e)}", self.node)
+        if action_class is None:
+            raise InterpreterError(f"Nie znaleziono akcji: {command_name}", self.node)
+
+        if hasattr(action_class, "bind_params"):
+            try:
+                create = action_class.bind_params(self.constants, self.dynamic)
+            except (TypeError, ValueError) as e:
+                raise InterpreterError(f"Nieprawidłowe parametry komendy {command_name}: {str(e)}", self.node)
+        else:
+            # Klasa spoza hierarchii BaseAction - zwykły konstruktor
+            constants = self.constants
 
-        if condition:
-            return self._execute_node(node.true_block, bot)
-        elif node.false_block:
-            return self._execute_node(node.false_block, bot)
+            def create(bot, values: Dict[str, Any]) -> Any:
+                return action_class(bot=bot, **constants, **values)
 
-        return None
+        self.binding = (bot, create)
+        return create
 
-    def _execute_loop(self, node: LoopNode, bot) -> Any:
-        """
-        Wykonuje pętlę.
 
-        Args:
-            node: Węzeł pętli
-            bot: Referencja do głównego obiektu bota
+def compile_node(node: ASTNode, sites: Optional[List["CommandSite"]] = None) -> Executable:
+    """
+    Kompiluje węzeł AST do funkcji wykonującej go.
 
-        Returns:
-            Wynik ostatniego wykonania bloku pętli
-        """
+    Args:
+        node: Węzeł AST
+        sites: Lista, do której są dodawane wywołania akcji (do fazy łączenia);
+               wywołania spoza niej są łączone przy pierwszym wykonaniu
+
+    Returns:
+        Funkcja (interpreter, bot) -> wynik wykonania węzła
+    """
+    if sites is None:
+        sites = []
+    for node_type in type(node).__mro__:
+        compiler = _COMPILERS.get(node_type)
+        if compiler is not None:
+            return compiler(node, sites)
+
+    # Błąd zgłaszany dopiero przy wykonaniu węzła, jak przy interpretacji drzewa
+    return _failing(f"Nieobsługiwany typ węzła: {type(node).__name__}", node)
+
+
+def _constant(value: Any) -> Executable:
+    """Zwraca funkcję zwracającą stałą wartość."""
+    def constant(interpreter: "DSLInterpreter", bot) -> Any:
+        return value
+    return constant
+
+
+def _failing(message: str, node: ASTNode) -> Executable:
+    """Zwraca funkcję zgłaszającą błąd interpretera przy wykonaniu."""
+    def failing(interpreter: "DSLInterpreter", bot) -> Any:
+        raise InterpreterError(message, node)
+    return failing
+
+
+def _compile_command(node: CommandNode, sites: List[CommandSite]) -> Executable:
+    """
+    Kompiluje komendę: parametry-literały są zbierane raz, a konstruktor akcji
+    pochodzi z fazy łączenia.
+    """
+    command_name = node.name
+
+    # Sprawdź czy to wywołanie pipeline'a
+    if command_name == "execute_pipeline":
+        return _compile_pipeline_call(node, sites)
+
+    constants = {}
+    dynamic = []
+    for param_name, param_value_node in node.params.items():
+        if isinstance(param_value_node, LiteralNode):
+            constants[param_name] = param_value_node.value
+        else:
+            dynamic.append((param_name, compile_node(param_value_node, sites)))
+    dynamic = tuple(dynamic)
+
+    site = CommandSite(node, constants, tuple(name for name, _ in dynamic))
+    sites.append(site)
+
+    def command(interpreter: "DSLInterpreter", bot) -> Any:
+        # Ewaluacja parametrów (tylko tych, które nie są literałami)
+        values = {param_name: evaluate(interpreter, bot) for param_name, evaluate in dynamic}
+
+        # Wykonanie akcji
+        try:
+            owner, create = site.binding
+            if owner is not bot:
+                create = site.link(bot)
+            return create(bot, values).execute()
+        except Exception as e:
+            interpreter.logger.error(f"Błąd podczas wykonywania komendy {command_name}: {str(e)}")
+            raise InterpreterError(f"Błąd podczas wykonywania komendy {command_name}: {str(e)}", node)
+
+    return command
+
+
+def _compile_assignment(node: AssignmentNode, sites: List[CommandSite]) -> Executable:
+    """Kompiluje przypisanie zmiennej."""
+    var_name = node.variable
+    evaluate = compile_node(node.value, sites)
+
+    def assignment(interpreter: "DSLInterpreter", bot) -> Any:
+        value = evaluate(interpreter, bot)
+
+        # Zapisz zmienną w środowisku
+        interpreter.environment[var_name] = value
+
+        return value
+
+    return assignment
+
+
+def _compile_variable(node: VariableNode, sites: List[CommandSite]) -> Executable:
+    """Kompiluje odczyt zmiennej."""
+    var_name = node.name
+
+    def variable(interpreter: "DSLInterpreter", bot) -> Any:
+        environment = interpreter.environment
+        if var_name in environment:
+            return environment[var_name]
+
+        # Specjalna zmienna 'env' daje dostęp do zmiennych środowiskowych
+        if var_name == "env":
+            return EnvProxy()
+
+        raise InterpreterError(f"Niezdefiniowana zmienna: {var_name}", node)
+
+    return variable
+
+
+def _compile_literal(node: LiteralNode, sites: List[CommandSite]) -> Executable:
+    """Kompiluje literał."""
+    return _constant(node.value)
+
+
+def _compile_block(node: BlockNode, sites: List[CommandSite]) -> Executable:
+    """Kompiluje blok kodu (zwraca wynik ostatniej instrukcji)."""
+    steps = tuple(compile_node(statement, sites) for statement in node.statements)
+    if not steps:
+        return _constant(None)
+    if len(steps) == 1:
+        return steps[0]
+
+    def block(interpreter: "DSLInterpreter", bot) -> Any:
         result = None
+        for step in steps:
+            result = step(interpreter, bot)
+        return result
+
+    return block
 
-        if node.is_repeat:
-            # Pętla repeat (określona liczba powtórzeń)
-            count = self._execute_node(node.condition, bot)
 
+def _compile_conditional(node: ConditionalNode, sites: List[CommandSite]) -> Executable:
+    """Kompiluje instrukcję warunkową; warunek-literał wybiera gałąź już przy kompilacji."""
+    true_branch = compile_node(node.true_block, sites)
+    false_branch = compile_node(node.false_block, sites) if node.false_block else _constant(None)
+
+    if isinstance(node.condition, LiteralNode):
+        return true_branch if node.condition.value else false_branch
+
+    condition = compile_node(node.condition, sites)
+
+    def conditional(interpreter: "DSLInterpreter", bot) -> Any:
+        if condition(interpreter, bot):
+            return true_branch(interpreter, bot)
+        return false_branch(interpreter, bot)
+
+    return conditional
+
+
+def _compile_loop(node: LoopNode, sites: List[CommandSite]) -> Executable:
+    """Kompiluje pętlę repeat lub while."""
+    body = compile_node(node.block, sites)
+
+    if node.is_repeat:
+        # Pętla repeat (określona liczba powtórzeń)
+        if isinstance(node.condition, LiteralNode):
+            if not isinstance(node.condition.value, int):
+                return _failing("Liczba powtórzeń musi być liczbą całkowitą", node)
+            count_of = _constant(node.condition.value)
+        else:
+            count_of = compile_node(node.condition, sites)
+
+        def repeat(interpreter: "DSLInterpreter", bot) -> Any:
+            count = count_of(interpreter, bot)
             if not isinstance(count, int):
                 raise InterpreterError("Liczba powtórzeń musi być liczbą całkowitą", node)
 
+            result = None
             for _ in range(count):
-                result = self._execute_node(node.block, bot)
-        else:
-            # Pętla while (wykonuje się, dopóki warunek jest prawdziwy)
-            while self._execute_node(node.condition, bot):
-                result = self._execute_node(node.block, bot)
+                result = body(interpreter, bot)
+            return result
 
+        return repeat
+
+    # Pętla while (wykonuje się, dopóki warunek jest prawdziwy)
+    if isinstance(node.condition, LiteralNode) and not node.condition.value:
+        return _constant(None)
+    condition = compile_node(node.condition, sites)
+
+    def while_loop(interpreter: "DSLInterpreter", bot) -> Any:
+        result = None
+        while condition(interpreter, bot):
+            result = body(interpreter, bot)
         return result
 
-    def _define_pipeline(self, node: PipelineNode) -> None:
-        """
-        Definiuje pipeline.
+    return while_loop
 
-        Args:
-            node: Węzeł pipeline
 
-        Returns:
-            None
-        """
-        pipeline_name = node.name
+def _compile_pipeline(node: PipelineNode, sites: List[CommandSite]) -> Executable:
+    """Kompiluje definicję pipeline'a (kroki są kompilowane od razu)."""
+    pipeline_name = node.name
+    steps = tuple(compile_node(step, sites) for step in node.steps)
 
+    def define_pipeline(interpreter: "DSLInterpreter", bot) -> None:
         # Zapisz pipeline w rejestrze
-        self.pipelines[pipeline_name] = node.steps
+        interpreter.pipelines[pipeline_name] = node.steps
+        interpreter._compiled_pipelines[pipeline_name] = (node.steps, steps)
 
-        self.logger.info(f"Zdefiniowano pipeline: {pipeline_name} z {len(node.steps)} krokami")
+        interpreter.logger.info(f"Zdefiniowano pipeline: {pipeline_name} z {len(node.steps)} krokami")
 
         return None
 
-    def _execute_pipeline_call(self, node: CommandNode, bot) -> Any:
-        """
-        Wykonuje wywołanie pipeline'a.
+    return define_pipeline
 
-        Args:
-            node: Węzeł komendy wywołującej pipeline
-            bot: Referencja do głównego obiektu bota
 
-        Returns:
-            Wynik wykonania ostatniego kroku pipeline'a
+def _compile_pipeline_call(node: CommandNode, sites: List[CommandSite]) -> Executable:
+    """Kompiluje wywołanie pipeline'a (execute_pipeline)."""
+    # Pobierz nazwę pipeline'a
+    pipeline_name_node = node.params.get("name")
+    if not pipeline_name_node:
+        return _failing("Brak parametru 'name' w wywołaniu execute_pipeline", node)
+    name_of = compile_node(pipeline_name_node, sites)
 
-        Raises:
-            InterpreterError: Gdy nie znaleziono pipeline'a
-        """
-        # Pobierz nazwę pipeline'a
-        pipeline_name_node = node.params.get("name")
-        if not pipeline_name_node:
-            raise InterpreterError("Brak parametru 'name' w wywołaniu execute_pipeline", node)
-
-        pipeline_name = self._execute_node(pipeline_name_node, bot)
+    def pipeline_call(interpreter: "DSLInterpreter", bot) -> Any:
+        pipeline_name = name_of(interpreter, bot)
 
         # Sprawdź czy pipeline istnieje
-        if pipeline_name not in self.pipelines:
+        if pipeline_name not in interpreter.pipelines:
             raise InterpreterError(f"Niezdefiniowany pipeline: {pipeline_name}", node)
 
         # Wykonaj kolejne kroki pipeline'a
-        steps = self.pipelines[pipeline_name]
         result = None
+        for step in interpreter._pipeline_steps(pipeline_name):
+            result = step(interpreter, bot)
+        return result
 
-        for step in steps:
-            result = self._execute_node(step, bot)
+    return pipeline_call
 
-        return result
+
+# Kompilatory węzłów według typu węzła
+_COMPILERS: Dict[type, Callable[[Any, List[CommandSite]], Executable]] = {
+    CommandNode: _compile_command,
+    AssignmentNode: _compile_assignment,
+    VariableNode: _compile_variable,
+    LiteralNode: _compile_literal,
+    BlockNode: _compile_block,
+    ConditionalNode: _compile_conditional,
+    LoopNode: _compile_loop,
+    PipelineNode: _compile_pipeline
+}
 
 
 class EnvProxy:
@@ -8,11 +8,11 @@ lexer.py
 
 """
 Lekser do tokenizacji kodu DSL.
+Tokeny są generowane strumieniowo (iter_tokens) w jednym przejściu przez źródło.
 """
 
-import re
-from typing import List, Iterator, Tuple, Optional
-from automatyzer_desktop.dsl.grammar import Token, TokenType, KEYWORDS, COMPILED_PATTERNS
+from typing import List, Iterator
+from automatyzer_desktop.dsl.grammar import Token, TokenType, KEYWORDS, MASTER_PATTERN, TOKEN_GROUPS
 
 
 class LexerError(Exception):
@@ -37,6 +37,10 @@ class Lexer:
     """
     Lekser do tokenizacji kodu DSL.
     Zamienia kod źródłowy na listę tokenów.
+
+    Tokeny są rozpoznawane jednym wyrażeniem głównym (MASTER_PATTERN) dopasowywanym
+    od bieżącej pozycji w niezmienionym źródle, więc czas tokenizacji rośnie liniowo
+    z długością skryptu (bez kopiowania reszty źródła przy każdym tokenie).
     """
 
     def __init__(self, source_code: str):
@@ -62,57 +66,55 @@ class Lexer:
         Raises:
             LexerError: Gdy wystąpi błąd podczas tokenizacji
         """
-        self.tokens = []
-        self.pos = 0
-        self.line = 1
-        self.column = 1
-
-        while self.pos < len(self.source_code):
-            token = self._get_next_token()
-            if token is not None:
-                # Ignorujemy białe znaki i komentarze
-                if token.type not in (TokenType.WHITESPACE, TokenType.COMMENT):
-                    self.tokens.append(token)
-
-                # Aktualizacja pozycji dla nowych linii
-                if token.type == TokenType.NEWLINE:
-                    self.line += 1
-                    self.column = 1
-
-        # Dodaj token końca pliku
-        self.tokens.append(Token(TokenType.EOF, "", self.line, self.column))
-
+        self.tokens = list(self.iter_tokens())
         return self.tokens
 
-    def _get_next_token(self) -> Optional[Token]:
+    def iter_tokens(self) -> Iterator[Token]:
         """
-        Pobiera następny token z kodu źródłowego.
+        Zwraca tokeny kodu źródłowego po kolei (bez białych znaków i komentarzy),
+        zakończone tokenem końca pliku.
 
         Returns:
-            Token lub None, jeśli koniec pliku
+            Generator tokenów
 
         Raises:
-            LexerError: Gdy nie udało się rozpoznać tokenu
+            LexerError: Gdy wystąpi błąd podczas tokenizacji
         """
-        if self.pos >= len(self.source_code):
-            return None
-
-        # Sprawdź każdy wzorzec
-        for pattern, token_type in COMPILED_PATTERNS:
-            match = pattern.match(self.source_code[self.pos:])
-            if match:
-                value = match.group(0)
-                token = self._create_token(token_type, value)
-
-                # Aktualizacja pozycji
-                self.pos += len(value)
-                self.column += len(value)
+        source = self.source_code
+        end = len(source)
+        match = MASTER_PATTERN.match
+        skipped = (TokenType.WHITESPACE, TokenType.COMMENT)
 
-                return token
-
-        # Jeśli żaden wzorzec nie pasuje, to błąd
-        char = self.source_code[self.pos]
-        raise LexerError(f"Nierozpoznany znak: '{char}'", self.line, self.column)
+        self.pos = 0
+        self.line = 1
+        # Pozycja początku bieżącej linii (kolumna = pozycja - początek linii + 1)
+        line_start = 0
+
+        while self.pos < end:
+            found = match(source, self.pos)
+            if found is None:
+                self.column = self.pos - line_start + 1
+                raise LexerError(f"Nierozpoznany znak: '{source[self.pos]}'", self.line, self.column)
+
+            token_type = TOKEN_GROUPS[found.lastgroup]
+            self.column = self.pos - line_start + 1
+            self.pos = found.end()
+
+            if token_type not in skipped:
+                yield self._create_token(token_type, found.group())
+
+            # Aktualizacja pozycji dla nowych linii (także wewnątrz wieloliniowych łańcuchów)
+            if token_type == TokenType.NEWLINE:
+                self.line += 1
+                line_start = self.pos
+            elif token_type == TokenType.STRING and "\n" in found.group():
+                value = found.group()
+                self.line += value.count("\n")
+                line_start = found.start() + value.rindex("\n") + 1
+
+        self.column = self.pos - line_start + 1
+        # Dodaj token końca pliku
+        yield Token(TokenType.EOF, "", self.line, self.column)
 
     def _create_token(self, token_type: TokenType, value: str) -> Token:
         """
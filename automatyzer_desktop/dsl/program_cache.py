@@ -0,0 +1,362 @@
+# Pamięć podręczna sparsowanych programów DSL
+"""
+program_cache.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pamięć podręczna drzew składniowych (AST) kodu DSL.
+Programy są identyfikowane skrótem kodu źródłowego i przechowywane
+w pamięci (LRU), więc ponowne wykonanie tej samej komendy lub skryptu
+pomija tokenizację i parsowanie. Dla plików skryptów (.abot) AST może
+być dodatkowo zapisywany obok skryptu (plik <skrypt>.cache), ważny dopóki
+nie zmieni się czas modyfikacji i rozmiar skryptu ani kod lexera,
+gramatyki i parsera, który go utworzył.
+
+Plik pamięci podręcznej jest zapisem pickle - ufamy mu tak samo jak samemu
+skryptowi, obok którego leży.
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from automatyzer_desktop.dsl import grammar, lexer, parser
+from automatyzer_desktop.dsl.grammar import ASTNode
+from automatyzer_desktop.dsl.lexer import Lexer
+from automatyzer_desktop.dsl.parser import Parser
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Domyślna liczba programów przechowywanych w pamięci
+DEFAULT_MAX_ENTRIES = 256
+
+# Rozszerzenie pliku pamięci podręcznej zapisywanego obok skryptu
+PROGRAM_CACHE_SUFFIX = ".cache"
+
+# Wersja formatu pliku pamięci podręcznej (zmiana unieważnia zapisane pliki)
+PROGRAM_CACHE_VERSION = 1
+
+
+def _dsl_fingerprint() -> str:
+    """
+    Zwraca skrót kodu lexera, gramatyki i parsera.
+    Zmiana klas AST lub składni unieważnia zapisane pliki pamięci podręcznej,
+    także bez ręcznego podbicia PROGRAM_CACHE_VERSION.
+
+    Returns:
+        Skrót SHA-256 (szesnastkowo)
+    """
+    digest = hashlib.sha256(str(PROGRAM_CACHE_VERSION).encode("utf-8"))
+    for module in (lexer, grammar, parser):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# Skrót wersji DSL zapisywany w pliku pamięci podręcznej
+PROGRAM_CACHE_FINGERPRINT = _dsl_fingerprint()
+
+
+def source_hash(source: str) -> str:
+    """
+    Zwraca skrót kodu źródłowego używany jako klucz pamięci podręcznej.
+
+    Args:
+        source: Kod DSL
+
+    Returns:
+        Skrót SHA-256 (szesnastkowo)
+    """
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def parse_source(source: str) -> List[ASTNode]:
+    """
+    Tokenizuje i parsuje kod DSL (bez pamięci podręcznej).
+
+    Args:
+        source: Kod DSL
+
+    Returns:
+        Lista węzłów AST instrukcji najwyższego poziomu
+
+    Raises:
+        LexerError: Gdy nie udało się stokenizować kodu
+        ParserError: Gdy kod zawiera błąd składniowy
+    """
+    return Parser(Lexer(source).tokenize()).parse()
+
+
+class Program:
+    """
+    Sparsowany program DSL przechowywany w pamięci podręcznej.
+    """
+
+    __slots__ = ("statements", "source_hash", "compiled")
+
+    def __init__(self, statements: List[ASTNode], source_hash: str):
+        """
+        Inicjalizacja programu.
+
+        Args:
+            statements: Lista węzłów AST instrukcji najwyższego poziomu
+            source_hash: Skrót kodu źródłowego programu
+        """
+        self.statements = statements
+        self.source_hash = source_hash
+        # Postać skompilowana przez interpreter (przy pierwszym wykonaniu)
+        self.compiled = None
+
+
+class ProgramCache:
+    """
+    Pamięć podręczna sparsowanych programów DSL z usuwaniem LRU.
+    Programy są współdzielone między wywołaniami - interpreter tylko je odczytuje.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, disk_cache: bool = False):
+        """
+        Inicjalizacja pamięci podręcznej.
+
+        Args:
+            max_entries: Maksymalna liczba programów przechowywanych w pamięci
+            disk_cache: Czy zapisywać AST skryptów w plikach obok skryptów
+        """
+        self.max_entries = max_entries
+        self.disk_cache = disk_cache
+        self._entries: "OrderedDict[str, Program]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def _lookup(self, key: str) -> Optional[Program]:
+        """
+        Zwraca program z pamięci (i oznacza go jako ostatnio użyty).
+        """
+        with self._lock:
+            program = self._entries.get(key)
+            if program is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return program
+
+    def _store(self, key: str, program: Program) -> None:
+        """
+        Zapisuje program w pamięci, usuwając najdawniej użyte ponad limit.
+        """
+        with self._lock:
+            self._entries[key] = program
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(self.max_entries, 0):
+                self._entries.popitem(last=False)
+
+    def get(self, source: str) -> Program:
+        """
+        Zwraca program DSL, parsując kod tylko przy pierwszym użyciu.
+
+        Args:
+            source: Kod DSL
+
+        Returns:
+            Program (AST i postać skompilowana)
+
+        Raises:
+            LexerError: Gdy nie udało się stokenizować kodu
+            ParserError: Gdy kod zawiera błąd składniowy
+        """
+        key = source_hash(source)
+        program = self._lookup(key)
+        if program is not None:
+            return program
+
+        with self._lock:
+            self.misses += 1
+        program = Program(parse_source(source), key)
+        self._store(key, program)
+        return program
+
+    def get_file(self, path: str) -> Program:
+        """
+        Zwraca program DSL z pliku (z pamięci, z pliku pamięci podręcznej
+        obok skryptu lub parsując skrypt).
+
+        Args:
+            path: Ścieżka do pliku skryptu
+
+        Returns:
+            Program (AST i postać skompilowana)
+
+        Raises:
+            OSError: Gdy nie udało się odczytać skryptu
+            LexerError: Gdy nie udało się stokenizować kodu
+            ParserError: Gdy skrypt zawiera błąd składniowy
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+
+        key = source_hash(source)
+        program = self._lookup(key)
+        if program is not None:
+            return program
+
+        if self.disk_cache:
+            statements = self._load_disk(path, key)
+            if statements is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                program = Program(statements, key)
+                self._store(key, program)
+                return program
+
+        program = self.get(source)
+        if self.disk_cache:
+            self._save_disk(path, key, program.statements)
+        return program
+
+    def parse(self, source: str) -> List[ASTNode]:
+        """
+        Zwraca AST kodu DSL, parsując go tylko przy pierwszym użyciu.
+
+        Args:
+            source: Kod DSL
+
+        Returns:
+            Lista węzłów AST instrukcji najwyższego poziomu
+
+        Raises:
+            LexerError: Gdy nie udało się stokenizować kodu
+            ParserError: Gdy kod zawiera błąd składniowy
+        """
+        return self.get(source).statements
+
+    def parse_file(self, path: str) -> List[ASTNode]:
+        """
+        Zwraca AST skryptu DSL z pliku.
+
+        Args:
+            path: Ścieżka do pliku skryptu
+
+        Returns:
+            Lista węzłów AST instrukcji najwyższego poziomu
+
+        Raises:
+            OSError: Gdy nie udało się odczytać skryptu
+            LexerError: Gdy nie udało się stokenizować kodu
+            ParserError: Gdy skrypt zawiera błąd składniowy
+        """
+        return self.get_file(path).statements
+
+    @staticmethod
+    def _disk_path(path: str) -> str:
+        """Zwraca ścieżkę pliku pamięci podręcznej skryptu."""
+        return path + PROGRAM_CACHE_SUFFIX
+
+    @staticmethod
+    def _file_signature(path: str) -> Dict[str, int]:
+        """Zwraca czas modyfikacji i rozmiar skryptu (unieważniające zapisany AST)."""
+        stat = os.stat(path)
+        return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def _load_disk(self, path: str, key: str) -> Optional[List[ASTNode]]:
+        """
+        Wczytuje AST z pliku pamięci podręcznej obok skryptu.
+
+        Args:
+            path: Ścieżka do pliku skryptu
+            key: Skrót kodu źródłowego
+
+        Returns:
+            Lista węzłów AST lub None, jeśli pliku nie ma lub jest nieaktualny
+        """
+        cache_path = self._disk_path(path)
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            with open(cache_path, "rb") as f:
+                data = pickle.load(f)
+            if (data.get("version") != PROGRAM_CACHE_VERSION or data.get("dsl") != PROGRAM_CACHE_FINGERPRINT or
+                    data.get("hash") != key or data.get("signature") != self._file_signature(path)):
+                logger.debug(f"Nieaktualna pamięć podręczna skryptu: {cache_path}")
+                return None
+            return data["program"]
+        except Exception as e:
+            logger.warning(f"Nie udało się wczytać pamięci podręcznej skryptu {cache_path}: {str(e)}")
+            return None
+
+    def _save_disk(self, path: str, key: str, program: List[ASTNode]) -> None:
+        """
+        Zapisuje AST do pliku pamięci podręcznej obok skryptu.
+        Błędy zapisu (np. katalog tylko do odczytu) są jedynie logowane.
+
+        Args:
+            path: Ścieżka do pliku skryptu
+            key: Skrót kodu źródłowego
+            program: Lista węzłów AST
+        """
+        cache_path = self._disk_path(path)
+        data = {"version": PROGRAM_CACHE_VERSION, "dsl": PROGRAM_CACHE_FINGERPRINT, "hash": key,
+                "signature": self._file_signature(path), "program": program}
+        try:
+            # Zapis do pliku tymczasowego i podmiana - równoległe procesy nie czytają połowy pliku
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(cache_path)), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except Exception:
+                os.remove(tmp_path)
+                raise
+        except Exception as e:
+            logger.warning(f"Nie udało się zapisać pamięci podręcznej skryptu {cache_path}: {str(e)}")
+
+    def clear(self) -> None:
+        """
+        Usuwa wszystkie programy z pamięci (pliki obok skryptów pozostają).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Zwraca statystyki pamięci podręcznej.
+
+        Returns:
+            Słownik z liczbą trafień, chybień, trafień w plikach obok skryptów i wpisów
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_cache": self.disk_cache
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Globalna instancja pamięci podręcznej (współdzielona w procesie)
+_program_cache = ProgramCache()
+
+
+def get_program_cache() -> ProgramCache:
+    """
+    Zwraca globalną pamięć podręczną programów DSL.
+
+    Returns:
+        Instancja ProgramCache współdzielona w procesie
+    """
+    return _program_cache
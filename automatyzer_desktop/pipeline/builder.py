@@ -99,6 +99,8 @@ class PipelineBuilder:
         Args:
             action: Nazwa akcji lub instancja akcji
             **kwargs: Parametry dla akcji (jeśli podano nazwę) lub dla kroku
+                      (name, conditions, settle - czas bez zmian ekranu, na który krok czeka
+                      po akcji, settle_timeout - maksymalny czas tego oczekiwania)
 
         Returns:
             Self (dla chainingu)
@@ -111,7 +113,7 @@ class PipelineBuilder:
             # Wyodrębnij parametry dla kroku i akcji
             step_params = {
                 k: v for k, v in kwargs.items()
-                if k in ['name', 'conditions']
+                if k in ['name', 'conditions', 'settle', 'settle_timeout']
             }
 
             action_params = {
@@ -128,14 +130,18 @@ class PipelineBuilder:
             step = PipelineStep(
                 action=action_instance,
                 name=step_params.get('name'),
-                conditions=step_params.get('conditions')
+                conditions=step_params.get('conditions'),
+                settle=step_params.get('settle'),
+                settle_timeout=step_params.get('settle_timeout', 5.0)
             )
         elif isinstance(action, BaseAction):
             # Jeśli podano instancję akcji, utwórz krok
             step = PipelineStep(
                 action=action,
                 name=kwargs.get('name'),
-                conditions=kwargs.get('conditions')
+                conditions=kwargs.get('conditions'),
+                settle=kwargs.get('settle'),
+                settle_timeout=kwargs.get('settle_timeout', 5.0)
             )
         else:
             raise ValueError(f"Nieprawidłowy typ akcji: {type(action)}")
@@ -13,6 +13,7 @@ Implementacja kroku w pipeline do automatyzacji zadań.
 import logging
 from typing import Any, Dict, Optional, Callable, List, Union, Tuple
 from automatyzer_desktop.actions.base import BaseAction
+from automatyzer_desktop.utils.screen_changes import wait_for_screen_settled
 
 
 class PipelineStep:
@@ -21,7 +22,8 @@ class PipelineStep:
     Każdy krok wykonuje jedną akcję z określonymi parametrami.
     """
 
-    def __init__(self, action: BaseAction, name: str = None, conditions: List[Callable] = None):
+    def __init__(self, action: BaseAction, name: str = None, conditions: List[Callable] = None,
+                 settle: Optional[float] = None, settle_timeout: float = 5.0):
         """
         Inicjalizacja kroku pipeline.
 
@@ -29,11 +31,16 @@ class PipelineStep:
             action: Akcja do wykonania w tym kroku
             name: Nazwa kroku (opcjonalna)
             conditions: Lista warunków, które muszą być spełnione przed wykonaniem kroku
+            settle: Czas bez zmian ekranu (w sekundach), na który krok czeka po wykonaniu akcji
+                    (opcjonalnie, zamiast stałego opóźnienia)
+            settle_timeout: Maksymalny czas oczekiwania na ustabilizowanie ekranu (w sekundach)
         """
         self.logger = logging.getLogger(__name__)
         self.action = action
         self.name = name or f"Step_{id(self)}"
         self.conditions = conditions or []
+        self.settle = settle
+        self.settle_timeout = settle_timeout
         self.result = None
         self.executed = False
         self.success = False
@@ -69,6 +76,14 @@ class PipelineStep:
         try:
             self.logger.info(f"Wykonywanie kroku {self.name}")
             self.result = self.action.execute()
+
+            # Oczekiwanie, aż ekran przestanie się zmieniać po akcji
+            if self.settle is not None:
+                settled, _ = wait_for_screen_settled(settle_time=self.settle, timeout=self.settle_timeout)
+                if not settled:
+                    self.logger.warning(f"Ekran nie ustabilizował się po kroku {self.name} "
+                                        f"w ciągu {self.settle_timeout}s")
+
             self.success = True
             self.executed = True
             self.logger.info(f"Krok {self.name} wykonany pomyślnie")
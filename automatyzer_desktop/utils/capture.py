@@ -0,0 +1,218 @@
+# Backendy zrzutów ekranu
+"""
+capture.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Wymienne backendy wykonywania zrzutów ekranu.
+
+Backend "mss" korzysta z pamięci współdzielonej X11 (MIT-SHM, XShmGetImage)
+na Linuksie oraz z natywnych API na Windows i macOS. Backend "pil" używa
+PIL.ImageGrab i jest dostępny zawsze. Oba konwertują obraz do BGR do
+pierścienia wielokrotnie używanych buforów. Bufor jest ponownie zapisywany
+dopiero wtedy, gdy nikt poza backendem nie trzyma do niego referencji
+(ani zwróconej tablicy, ani jej widoków) - przechowywane klatki nigdy nie
+są nadpisywane kolejnymi zrzutami.
+"""
+
+import sys
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+import cv2
+import numpy as np
+from PIL import ImageGrab
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Dostępne backendy ("auto" wybiera najszybszy dostępny)
+CAPTURE_BACKENDS = ("auto", "mss", "pil")
+
+# Liczba buforów wyjściowych używanych na zmianę przez backend
+RING_SIZE = 2
+
+# Liczba referencji bufora, do którego odwołuje się tylko pierścień (lista i argument sys.getrefcount)
+_UNREFERENCED = 2
+
+
+class CaptureBackend(ABC):
+    """
+    Abstrakcyjna klasa bazowa backendów zrzutów ekranu.
+    """
+
+    # Nazwa backendu używana w konfiguracji (CAPTURE_BACKEND)
+    NAME = ""
+
+    def __init__(self, ring_size: int = RING_SIZE):
+        """
+        Inicjalizacja backendu.
+
+        Args:
+            ring_size: Liczba buforów wyjściowych używanych na zmianę
+        """
+        self.ring_size = max(1, ring_size)
+        self._ring: List[np.ndarray] = []
+        self._index = 0
+        self._lock = threading.Lock()
+        self.captures = 0
+        self.allocations = 0
+
+    def _output(self, height: int, width: int) -> np.ndarray:
+        """
+        Zwraca wolny bufor wyjściowy z pierścienia (bufor, do którego nikt poza pierścieniem
+        nie trzyma referencji). Nowy bufor jest alokowany przy zmianie rozmiaru ekranu lub
+        gdy wszystkie bufory są jeszcze używane - wtedy nie trafia do pierścienia.
+
+        Args:
+            height: Wysokość zrzutu
+            width: Szerokość zrzutu
+
+        Returns:
+            Bufor BGR o kształcie (height, width, 3)
+        """
+        shape = (height, width, 3)
+        free = [index for index in range(len(self._ring)) if sys.getrefcount(self._ring[index]) <= _UNREFERENCED]
+
+        # Najpierw wolny bufor o właściwym rozmiarze, zaczynając od kolejnego po ostatnio użytym
+        for offset in range(1, len(self._ring) + 1):
+            index = (self._index + offset) % len(self._ring)
+            if index in free and self._ring[index].shape == shape:
+                self._index = index
+                return self._ring[index]
+
+        buffer = np.empty(shape, dtype=np.uint8)
+        self.allocations += 1
+        if len(self._ring) < self.ring_size:
+            self._ring.append(buffer)
+            self._index = len(self._ring) - 1
+        elif free:
+            # Wolny bufor o nieaktualnym rozmiarze (zmiana rozdzielczości)
+            self._index = free[0]
+            self._ring[self._index] = buffer
+        return buffer
+
+    def __call__(self) -> np.ndarray:
+        """
+        Wykonuje zrzut całego ekranu (backend może być użyty jako FrameProvider.capture).
+
+        Returns:
+            Zrzut ekranu w formacie BGR
+        """
+        with self._lock:
+            frame = self.grab()
+            self.captures += 1
+            return frame
+
+    @abstractmethod
+    def grab(self) -> np.ndarray:
+        """
+        Wykonuje zrzut całego ekranu.
+
+        Returns:
+            Zrzut ekranu w formacie BGR (bufor z pierścienia, nienadpisywany dopóki
+            istnieją do niego referencje)
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Zwalnia zasoby backendu.
+        """
+        self._ring = []
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Zwraca statystyki backendu.
+
+        Returns:
+            Słownik z liczbą zrzutów i alokacji buforów wyjściowych
+        """
+        return {"captures": self.captures, "allocations": self.allocations}
+
+
+class PILCapture(CaptureBackend):
+    """
+    Zrzuty ekranu przez PIL.ImageGrab (dostępne na każdej platformie).
+    """
+
+    NAME = "pil"
+
+    def grab(self) -> np.ndarray:
+        screenshot = np.asarray(ImageGrab.grab())
+        height, width = screenshot.shape[:2]
+        code = cv2.COLOR_RGBA2BGR if screenshot.shape[2] == 4 else cv2.COLOR_RGB2BGR
+        return cv2.cvtColor(screenshot, code, dst=self._output(height, width))
+
+
+class MSSCapture(CaptureBackend):
+    """
+    Zrzuty ekranu przez bibliotekę mss (na Linuksie XShmGetImage z pamięcią współdzieloną).
+    """
+
+    NAME = "mss"
+
+    def __init__(self, ring_size: int = RING_SIZE):
+        """
+        Inicjalizacja backendu.
+
+        Args:
+            ring_size: Liczba buforów wyjściowych używanych na zmianę
+        """
+        if mss is None:
+            raise ImportError("Backend 'mss' wymaga biblioteki mss (pip install mss)")
+        super().__init__(ring_size)
+        # Połączenie z serwerem wyświetlania jest tworzone przy pierwszym zrzucie
+        self._sct = None
+
+    def grab(self) -> np.ndarray:
+        if self._sct is None:
+            self._sct = mss.mss()
+
+        # Monitor 0 to cały wirtualny ekran (wszystkie monitory), jak w ImageGrab.grab
+        shot = self._sct.grab(self._sct.monitors[0])
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._output(shot.height, shot.width))
+
+    def close(self) -> None:
+        if self._sct is not None:
+            self._sct.close()
+            self._sct = None
+        super().close()
+
+
+def create_capture_backend(name: str = "auto", ring_size: int = RING_SIZE) -> CaptureBackend:
+    """
+    Tworzy backend zrzutów ekranu.
+
+    Args:
+        name: Nazwa backendu (jedna z CAPTURE_BACKENDS)
+        ring_size: Liczba buforów wyjściowych używanych na zmianę
+
+    Returns:
+        Instancja backendu; gdy wybrany backend jest niedostępny, zwracany jest backend "pil"
+
+    Raises:
+        ValueError: Jeśli nazwa backendu jest nieznana
+    """
+    name = (name or "auto").lower()
+    if name not in CAPTURE_BACKENDS:
+        raise ValueError(f"Nieznany backend zrzutów ekranu: {name}")
+
+    if name in ("auto", "mss"):
+        if mss is not None:
+            return MSSCapture(ring_size)
+        if name == "mss":
+            logger.warning("Biblioteka mss nie jest zainstalowana - używam backendu 'pil'")
+
+    return PILCapture(ring_size)
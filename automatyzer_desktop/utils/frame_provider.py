@@ -0,0 +1,327 @@
+# Współdzielone zrzuty ekranu
+"""
+frame_provider.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Dostawca klatek ekranu współdzielonych przez wszystkie wyszukiwania obrazów.
+Jeden zrzut ekranu (wraz z konwersją do BGR) obsługuje wiele wyszukiwań
+wykonanych w krótkim oknie czasowym. Akcje wejścia (kliknięcia, wpisywanie
+tekstu) unieważniają klatkę, bo zmieniają zawartość ekranu.
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.capture import create_capture_backend
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Domyślne okno świeżości klatki (w sekundach)
+DEFAULT_MAX_AGE = 0.05
+
+# Tryby kolorów używane przy dopasowaniu wzorców
+COLOR_MODES = ("bgr", "gray", "edges", "masked")
+
+# Progi detektora krawędzi Canny'ego dla trybu "edges"
+EDGE_THRESHOLDS = (50, 150)
+
+# Maksymalna liczba punktów charakterystycznych ORB klatki (wzorce mają własny limit)
+FRAME_MAX_FEATURES = 5000
+
+# Rozmiar otoczenia punktu ORB (mniejszy niż domyślne 31, aby małe ikony też miały punkty)
+ORB_PATCH_SIZE = 15
+
+
+def edge_map(gray: np.ndarray) -> np.ndarray:
+    """
+    Wylicza mapę krawędzi obrazu w skali szarości (wspólna dla klatek i wzorców).
+
+    Args:
+        gray: Obraz w skali szarości
+
+    Returns:
+        Mapa krawędzi (0 lub 255)
+    """
+    return cv2.Canny(gray, *EDGE_THRESHOLDS)
+
+
+def orb_features(gray: np.ndarray, max_features: int = FRAME_MAX_FEATURES,
+                 mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Wylicza punkty charakterystyczne i deskryptory ORB (wspólne dla klatek i wzorców).
+
+    Args:
+        gray: Obraz w skali szarości
+        max_features: Maksymalna liczba punktów
+        mask: Maska obszaru, w którym szukać punktów (opcjonalnie)
+
+    Returns:
+        Krotka (położenia punktów jako tablica N x 2, deskryptory N x 32 lub None przy braku punktów)
+    """
+    # Detektor tworzony przy każdym wywołaniu - obiekty ORB nie są bezpieczne wątkowo
+    orb = cv2.ORB_create(max_features, edgeThreshold=ORB_PATCH_SIZE, patchSize=ORB_PATCH_SIZE)
+    keypoints, descriptors = orb.detectAndCompute(gray, mask)
+    points = np.array([keypoint.pt for keypoint in keypoints], dtype=np.float32).reshape(-1, 2)
+    return points, descriptors
+
+
+class Frame:
+    """
+    Pojedyncza klatka ekranu w formacie BGR z leniwie wyliczaną wersją w skali szarości.
+    """
+
+    def __init__(self, bgr: np.ndarray, timestamp: float, origin: Tuple[int, int] = (0, 0),
+                 gray: Optional[np.ndarray] = None, screen_size: Optional[Tuple[int, int]] = None):
+        """
+        Inicjalizacja klatki.
+
+        Args:
+            bgr: Obraz klatki w formacie BGR
+            timestamp: Czas wykonania zrzutu (time.monotonic)
+            origin: Położenie lewego górnego rogu klatki na ekranie (x, y)
+            gray: Gotowa wersja w skali szarości (opcjonalnie)
+            screen_size: Rozdzielczość całego ekranu (domyślnie rozmiar klatki)
+        """
+        self.bgr = bgr
+        self.timestamp = timestamp
+        self.origin = origin
+        self.screen_size = screen_size or (bgr.shape[1], bgr.shape[0])
+        self._gray = gray
+        self._edges: Optional[np.ndarray] = None
+        self._features: Optional[Tuple[np.ndarray, Optional[np.ndarray]]] = None
+        self._levels: Dict[Tuple[str, int], np.ndarray] = {}
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Klatka w skali szarości (wyliczana raz, przy pierwszym użyciu)"""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    @property
+    def edges(self) -> np.ndarray:
+        """Mapa krawędzi klatki (wyliczana raz, przy pierwszym użyciu)"""
+        if self._edges is None:
+            self._edges = edge_map(self.gray)
+        return self._edges
+
+    @property
+    def features(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Punkty charakterystyczne i deskryptory ORB klatki (wyliczane raz, przy pierwszym użyciu)"""
+        if self._features is None:
+            self._features = orb_features(self.gray)
+        return self._features
+
+    def variant(self, color_mode: str = "bgr") -> np.ndarray:
+        """
+        Zwraca klatkę w postaci odpowiedniej dla trybu kolorów.
+
+        Args:
+            color_mode: Tryb kolorów (jeden z COLOR_MODES)
+
+        Returns:
+            Klatka BGR ("bgr", "masked"), w skali szarości ("gray") lub mapa krawędzi ("edges")
+        """
+        if color_mode == "gray":
+            return self.gray
+        if color_mode == "edges":
+            return self.edges
+        return self.bgr
+
+    def level(self, level: int, color_mode: str = "bgr") -> np.ndarray:
+        """
+        Zwraca klatkę pomniejszoną level razy (każdy poziom to cv2.pyrDown, czyli x2).
+        Poziomy są liczone raz i współdzielone przez wszystkie wyszukiwania na tej klatce.
+
+        Args:
+            level: Numer poziomu piramidy (0 oznacza pełną rozdzielczość)
+            color_mode: Tryb kolorów ("bgr" lub "gray")
+
+        Returns:
+            Pomniejszona klatka
+        """
+        if level <= 0:
+            return self.variant(color_mode)
+        key = (color_mode, level)
+        if key not in self._levels:
+            self._levels[key] = cv2.pyrDown(self.level(level - 1, color_mode))
+        return self._levels[key]
+
+    @property
+    def width(self) -> int:
+        """Szerokość klatki w pikselach"""
+        return self.bgr.shape[1]
+
+    @property
+    def height(self) -> int:
+        """Wysokość klatki w pikselach"""
+        return self.bgr.shape[0]
+
+    def age(self) -> float:
+        """
+        Zwraca wiek klatki.
+
+        Returns:
+            Czas od wykonania zrzutu (w sekundach)
+        """
+        return time.monotonic() - self.timestamp
+
+    def crop(self, region: Optional[Tuple[int, int, int, int]]) -> 'Frame':
+        """
+        Wycina fragment klatki bez kopiowania danych.
+
+        Args:
+            region: Region ekranu (x, y, width, height) we współrzędnych ekranu
+
+        Returns:
+            Klatka z wyciętym fragmentem (widok na dane klatki źródłowej)
+        """
+        if region is None:
+            return self
+
+        x, y, width, height = region
+        left = max(0, x - self.origin[0])
+        top = max(0, y - self.origin[1])
+        right = min(self.width, x - self.origin[0] + width)
+        bottom = min(self.height, y - self.origin[1] + height)
+        right = max(left, right)
+        bottom = max(top, bottom)
+
+        gray = self._gray[top:bottom, left:right] if self._gray is not None else None
+        cropped = Frame(self.bgr[top:bottom, left:right], self.timestamp,
+                        (self.origin[0] + left, self.origin[1] + top), gray, self.screen_size)
+        if self._edges is not None:
+            cropped._edges = self._edges[top:bottom, left:right]
+        if self._features is not None:
+            # Punkty klatki źródłowej leżące w wycinku, przesunięte do jego układu współrzędnych
+            points, descriptors = self._features
+            inside = ((points[:, 0] >= left) & (points[:, 0] < right) &
+                      (points[:, 1] >= top) & (points[:, 1] < bottom))
+            cropped._features = (points[inside] - np.float32([left, top]),
+                                 descriptors[inside] if descriptors is not None else None)
+        return cropped
+
+
+class FrameProvider:
+    """
+    Dostawca klatek ekranu z buforowaniem w oknie świeżości.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE, capture: Callable[[], np.ndarray] = None):
+        """
+        Inicjalizacja dostawcy.
+
+        Args:
+            max_age: Maksymalny wiek klatki, która może zostać ponownie użyta (w sekundach)
+            capture: Funkcja zwracająca zrzut całego ekranu w formacie BGR
+                     (domyślnie najszybszy dostępny backend z capture.py)
+        """
+        self.max_age = max_age
+        self.capture = capture or create_capture_backend()
+        self._frame: Optional[Frame] = None
+        self._lock = threading.Lock()
+        self.grabs = 0
+        self.reuses = 0
+
+    def get_frame(self, region: Tuple[int, int, int, int] = None) -> Frame:
+        """
+        Zwraca aktualną klatkę ekranu (lub jej fragment).
+
+        Jeśli buforowana klatka jest młodsza niż max_age, jest używana ponownie;
+        w przeciwnym razie wykonywany jest nowy zrzut całego ekranu. Piksele klatki
+        nie zmieniają się po jej zwróceniu - backend zrzutów ponownie używa bufora
+        dopiero, gdy żadna klatka (ani jej wycinek) się do niego nie odwołuje.
+
+        Args:
+            region: Region ekranu (x, y, width, height) do wycięcia (opcjonalnie)
+
+        Returns:
+            Klatka ekranu
+        """
+        with self._lock:
+            frame = self._frame
+            if frame is not None and frame.age() <= self.max_age:
+                self.reuses += 1
+            else:
+                frame = Frame(self.capture(), time.monotonic())
+                self._frame = frame
+                self.grabs += 1
+
+        return frame.crop(region)
+
+    def invalidate(self) -> None:
+        """
+        Unieważnia buforowaną klatkę - kolejne wywołanie wykona nowy zrzut.
+        """
+        with self._lock:
+            self._frame = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Zwraca statystyki dostawcy.
+
+        Returns:
+            Słownik z liczbą wykonanych zrzutów i ponownych użyć klatki
+        """
+        with self._lock:
+            return {"grabs": self.grabs, "reuses": self.reuses}
+
+
+# Globalny dostawca klatek (współdzielony w procesie)
+_frame_provider = FrameProvider()
+
+
+def get_frame_provider() -> FrameProvider:
+    """
+    Zwraca globalnego dostawcę klatek.
+
+    Returns:
+        Instancja FrameProvider współdzielona w procesie
+    """
+    return _frame_provider
+
+
+def set_frame_provider(provider: FrameProvider) -> FrameProvider:
+    """
+    Podmienia globalnego dostawcę klatek (np. na źródło syntetyczne w testach).
+
+    Args:
+        provider: Nowy dostawca klatek
+
+    Returns:
+        Poprzedni dostawca klatek
+    """
+    global _frame_provider
+    previous = _frame_provider
+    _frame_provider = provider
+    return previous
+
+
+def get_frame(region: Tuple[int, int, int, int] = None) -> Frame:
+    """
+    Zwraca klatkę z globalnego dostawcy.
+
+    Args:
+        region: Region ekranu (x, y, width, height) (opcjonalnie)
+
+    Returns:
+        Klatka ekranu
+    """
+    return _frame_provider.get_frame(region)
+
+
+def invalidate_frames() -> None:
+    """
+    Unieważnia klatkę globalnego dostawcy (wywoływane po akcjach wejścia).
+    """
+    _frame_provider.invalidate()
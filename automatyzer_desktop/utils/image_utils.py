@@ -11,85 +11,978 @@ Narzędzia do pracy z obrazami dla automatyzacji.
 """
 
 import os
+import time
 import logging
 import tempfile
-from typing import Optional, Tuple, Union, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Sequence, Tuple, Union, List
 
 import cv2
 import numpy as np
 from PIL import Image, ImageGrab
 
+from automatyzer_desktop.utils.frame_provider import COLOR_MODES, Frame, get_frame, invalidate_frames
+from automatyzer_desktop.utils.location_memory import get_location_memory
+from automatyzer_desktop.utils.perceptual_hash import (
+    HASH_METHODS, ScreenStateIndex, get_screen_state_index, hash_similarity, image_hash
+)
+from automatyzer_desktop.utils.monitors import Monitor, get_monitor, split_screen
+from automatyzer_desktop.utils.screen_changes import ChangeDetector, get_change_detector, intersects
+from automatyzer_desktop.utils.screenshot_writer import SCREENSHOT_FORMATS, encode_params, get_screenshot_writer
+from automatyzer_desktop.utils.template_cache import TemplateEntry, load_template
+
 # Konfiguracja loggera
 logger = logging.getLogger(__name__)
 
+# Dostępne strategie dopasowania wzorca
+MATCH_STRATEGIES = ("exact", "pyramid", "features")
+
+# Domyślny zestaw skal wzorca (typowe skalowanie DPI i rozdzielczości sesji RDP)
+DEFAULT_SCALES = (1.0, 1.25, 1.5, 0.8, 0.67, 1.75, 2.0)
+
+# Maksymalna liczba skal sprawdzanych w jednym wyszukiwaniu
+MAX_SCALES = 8
+
+# Tryby kolorów, dla których dostępna jest strategia "pyramid" (pozostałe dopasowujemy dokładnie)
+PYRAMID_COLOR_MODES = ("bgr", "gray")
+
+# Minimalny bok wzorca na poziomie zgrubnym (mniejsze wzorce dopasowujemy dokładnie)
+PYRAMID_MIN_TEMPLATE_SIDE = 12
+
+# Próg testu Lowe'a dla strategii "features" (najlepszy deskryptor wyraźnie lepszy od drugiego)
+FEATURE_RATIO = 0.75
+
+# Minimalna liczba zgodnych z homografią par punktów dla strategii "features"
+FEATURE_MIN_INLIERS = 8
+
+# Maksymalny błąd reprojekcji punktu zgodnego z homografią (w pikselach)
+FEATURE_RANSAC_THRESHOLD = 5.0
+
+# Pomniejszenie obniża wynik dopasowania - kandydatami z przebiegu zgrubnego
+# są lokalne maksima z wynikiem >= confidence - margines
+PYRAMID_COARSE_MARGIN = 0.3
+
+# Maksymalna liczba kandydatów doprecyzowywanych w pełnej rozdzielczości
+PYRAMID_MAX_CANDIDATES = 256
+
+# Próg IoU, powyżej którego nakładające się wykrycia są scalane
+NMS_IOU_THRESHOLD = 0.3
 
-def find_image_on_screen(image_path: str, confidence: float = 0.8, region: Tuple[int, int, int, int] = None) -> \
-Optional[Tuple[int, int]]:
+# Skala pomniejszenia klatek porównywanych podczas oczekiwania na obraz
+WAIT_DIFF_SCALE = 8
+
+# Minimalna zmiana jasności (0-255) bloku pomniejszonej klatki uznawana za zmianę ekranu
+WAIT_DIFF_THRESHOLD = 10
+
+# Maksymalna liczba zmienionych obszarów dopasowywanych osobno (powyżej - jeden obszar obejmujący)
+WAIT_MAX_DIRTY_REGIONS = 8
+
+# Współdzielona pula wątków do równoległego dopasowywania (tworzona przy pierwszym użyciu)
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Maksymalna liczba zapamiętanych wyników wyszukiwań ograniczonych do zmienionych obszarów
+CHANGED_ONLY_MAX_RESULTS = 64
+
+# Ostatnie wyniki wyszukiwań ograniczonych do zmienionych obszarów (klucz wyszukiwania -> dopasowanie, LRU)
+_changed_only_results: "OrderedDict[tuple, Optional[Tuple[float, int, int]]]" = OrderedDict()
+_changed_only_lock = threading.Lock()
+
+
+def parse_region(region: Union[str, List[int], Tuple[int, int, int, int], None]) -> Optional[Tuple[int, int, int, int]]:
     """
-    Znajduje obraz na ekranie.
+    Zamienia opis regionu ekranu na krotkę (x, y, width, height).
 
     Args:
-        image_path: Ścieżka do pliku obrazu do znalezienia
+        region: Region jako krotka/lista czterech liczb, tekst "x,y,width,height" (np. z DSL)
+                lub nazwa monitora ("monitor2", "2", "primary") - wtedy obszar tego monitora
+
+    Returns:
+        Krotka (x, y, width, height) lub None, jeśli region nie został podany
+
+    Raises:
+        ValueError: Jeśli region nie składa się z czterech liczb całkowitych ani nie jest nazwą monitora
+    """
+    if region is None:
+        return None
+    if isinstance(region, str):
+        if "," not in region:
+            monitor = get_monitor(region)
+            if monitor is None:
+                raise ValueError(f"Nieznany monitor: {region}")
+            return monitor.region
+        region = [part for part in region.replace(" ", "").split(",") if part]
+    if len(region) != 4:
+        raise ValueError(f"Region musi mieć postać (x, y, width, height), otrzymano: {region}")
+    return tuple(int(value) for value in region)
+
+
+def parse_scales(scales: Union[str, Sequence[float], None]) -> Optional[Tuple[float, ...]]:
+    """
+    Zamienia opis zestawu skal na krotkę liczb.
+
+    Args:
+        scales: Skale jako lista liczb, tekst "1.0,1.25,1.5" (np. z DSL) lub "auto" (DEFAULT_SCALES)
+
+    Returns:
+        Krotka skal lub None, jeśli skale nie zostały podane
+
+    Raises:
+        ValueError: Jeśli skale nie są dodatnimi liczbami lub jest ich więcej niż MAX_SCALES
+    """
+    if scales is None:
+        return None
+    if isinstance(scales, str):
+        if scales.strip().lower() == "auto":
+            return DEFAULT_SCALES
+        scales = [part for part in scales.replace(" ", "").split(",") if part]
+
+    scales = tuple(float(scale) for scale in scales)
+    if any(scale <= 0 for scale in scales):
+        raise ValueError(f"Skale muszą być dodatnie, otrzymano: {scales}")
+    if len(scales) > MAX_SCALES:
+        raise ValueError(f"Za dużo skal: {len(scales)} (maksymalnie {MAX_SCALES})")
+    return scales
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Zwraca współdzieloną pulę wątków do równoległego dopasowywania wzorców.
+
+    Returns:
+        Pula wątków (tworzona przy pierwszym użyciu)
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4,
+                                           thread_name_prefix="image_match")
+        return _executor
+
+
+def _local_maxima(result: np.ndarray, confidence: float,
+                  window: Tuple[int, int] = (3, 3)) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Wybiera lokalne maksima mapy wyników powyżej progu pewności.
+
+    Args:
+        result: Mapa wyników z cv2.matchTemplate
         confidence: Poziom pewności dopasowania (0.0 - 1.0)
-        region: Region ekranu do przeszukania (x, y, width, height)
+        window: Rozmiar otoczenia (szerokość, wysokość), w którym punkt musi być maksimum
 
     Returns:
-        Krotka (x, y) z pozycją środka znalezionego obrazu lub None, jeśli nie znaleziono
+        Krotka tablic (wyniki, x, y) lewych górnych rogów kandydatów
     """
-    try:
-        # Sprawdź czy plik istnieje
-        if not os.path.exists(image_path):
-            logger.error(f"Plik obrazu nie istnieje: {image_path}")
-            return None
+    kernel = np.ones((window[1] | 1, window[0] | 1), dtype=np.uint8)
+    peaks = (result >= confidence) & (result == cv2.dilate(result, kernel))
+    ys, xs = np.nonzero(peaks)
+    return result[ys, xs], xs, ys
+
+
+def _non_max_suppression(scores: np.ndarray, xs: np.ndarray, ys: np.ndarray,
+                         width: int, height: int, iou_threshold: float = NMS_IOU_THRESHOLD) -> List[int]:
+    """
+    Tłumienie niemaksymalne: od najlepszego wyniku odrzuca wykrycia, których
+    prostokąt (o rozmiarze wzorca) nakłada się z już przyjętym ponad próg IoU.
+    Liczba iteracji zależy od liczby przyjętych dopasowań, nie od liczby kandydatów.
+
+    Args:
+        scores: Wyniki kandydatów
+        xs: Współrzędne x lewych górnych rogów
+        ys: Współrzędne y lewych górnych rogów
+        width: Szerokość wzorca
+        height: Wysokość wzorca
+        iou_threshold: Próg IoU, powyżej którego wykrycie jest odrzucane
+
+    Returns:
+        Indeksy przyjętych kandydatów posortowane malejąco według wyniku
+    """
+    order = np.argsort(scores, kind="stable")[::-1]
+    area = float(width * height)
+    keep = []
+
+    while order.size > 0:
+        best = order[0]
+        keep.append(int(best))
+
+        rest = order[1:]
+        overlap_x = np.clip(width - np.abs(xs[rest] - xs[best]), 0, None)
+        overlap_y = np.clip(height - np.abs(ys[rest] - ys[best]), 0, None)
+        intersection = overlap_x * overlap_y
+        iou = intersection / (2 * area - intersection)
+        order = rest[iou <= iou_threshold]
+
+    return keep
+
+
+def _check_options(strategy: str, color_mode: str) -> None:
+    """
+    Sprawdza poprawność strategii i trybu kolorów.
+
+    Args:
+        strategy: Strategia dopasowania
+        color_mode: Tryb kolorów
+
+    Raises:
+        ValueError: Jeśli strategia lub tryb kolorów są nieznane
+    """
+    if strategy not in MATCH_STRATEGIES:
+        raise ValueError(f"Nieznana strategia dopasowania: {strategy}")
+    if color_mode not in COLOR_MODES:
+        raise ValueError(f"Nieznany tryb kolorów: {color_mode}")
 
-        # Zrzut ekranu
-        screenshot = ImageGrab.grab(bbox=region)
-        screenshot_np = np.array(screenshot)
 
-        # Konwersja z RGB do BGR (cv2 używa BGR)
-        screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
+def _match_template(image: np.ndarray, entry: TemplateEntry, color_mode: str = "bgr") -> np.ndarray:
+    """
+    Dopasowuje wariant wzorca do obrazu w danym trybie kolorów.
+
+    Args:
+        image: Obraz (klatka lub jej fragment) w postaci zgodnej z trybem kolorów
+        entry: Wpis wzorca z pamięci podręcznej
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+
+    Returns:
+        Mapa wyników cv2.TM_CCOEFF_NORMED
+    """
+    if color_mode == "masked" and entry.mask is not None:
+        # Piksele przezroczyste we wzorcu nie wpływają na wynik
+        result = cv2.matchTemplate(image, entry.bgr, cv2.TM_CCOEFF_NORMED, mask=entry.mask)
+        # Obszary o zerowej wariancji dają przy masce wartości nieskończone
+        result[~np.isfinite(result)] = 0
+        return result
+    return cv2.matchTemplate(image, entry.variant(color_mode), cv2.TM_CCOEFF_NORMED)
 
-        # Wczytaj obraz wzorcowy
-        template = cv2.imread(image_path)
 
-        # Sprawdź czy obraz wzorcowy został poprawnie wczytany
-        if template is None:
-            logger.error(f"Nie udało się wczytać obrazu: {image_path}")
+def _pyramid_level(entry: TemplateEntry) -> int:
+    """
+    Wybiera najgłębszy poziom piramidy, na którym wzorzec jest jeszcze wystarczająco duży.
+
+    Args:
+        entry: Wpis wzorca z pamięci podręcznej
+
+    Returns:
+        Numer poziomu (1 = pomniejszenie x2) lub 0, jeśli żaden poziom się nie nadaje
+    """
+    level = 0
+    for index, template in enumerate(entry.pyramid):
+        if min(template.shape[:2]) < PYRAMID_MIN_TEMPLATE_SIDE:
+            break
+        level = index + 1
+    return level
+
+
+def _pyramid_search(frame: Frame, entry: TemplateEntry, confidence: float, exhaustive: bool = False,
+                    color_mode: str = "bgr") -> Optional[List[Tuple[float, int, int]]]:
+    """
+    Dopasowanie zgrubne-do-dokładnego: najpierw na pomniejszonej klatce,
+    potem w pełnej rozdzielczości tylko w otoczeniu kandydatów.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Wpis wzorca z pamięci podręcznej
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        exhaustive: Czy potrzebne są wszystkie wystąpienia (wtedy nadmiar kandydatów
+                    oznacza wynik niejednoznaczny zamiast obcięcia listy)
+        color_mode: Tryb kolorów (jeden z PYRAMID_COLOR_MODES)
+
+    Returns:
+        Lista krotek (wynik, x, y) z lewymi górnymi rogami dopasowań w układzie klatki,
+        pusta lista, gdy żaden kandydat nie został potwierdzony, lub None, gdy wynik
+        jest niejednoznaczny (za mały wzorzec, za dużo kandydatów, tryb kolorów bez
+        piramidy) i należy wykonać dokładne dopasowanie
+    """
+    if color_mode not in PYRAMID_COLOR_MODES:
+        return None
+
+    level = _pyramid_level(entry)
+    if level == 0:
+        return None
+
+    coarse_frame = frame.level(level, color_mode)
+    coarse_template = entry.level(level, color_mode)
+    if (coarse_frame.shape[0] < coarse_template.shape[0] or
+            coarse_frame.shape[1] < coarse_template.shape[1]):
+        return None
+
+    coarse = cv2.matchTemplate(coarse_frame, coarse_template, cv2.TM_CCOEFF_NORMED)
+    threshold = confidence - PYRAMID_COARSE_MARGIN
+    if cv2.minMaxLoc(coarse)[1] < threshold:
+        return []
+
+    # Lokalne maksima powyżej progu kandydatów
+    scores, xs, ys = _local_maxima(coarse, threshold)
+    truncated = len(xs) > PYRAMID_MAX_CANDIDATES
+    if truncated:
+        if exhaustive:
             return None
+        best = np.argsort(scores)[::-1][:PYRAMID_MAX_CANDIDATES]
+        ys, xs = ys[best], xs[best]
+
+    # Doprecyzowanie w pełnej rozdzielczości w oknach wokół kandydatów
+    scale = 2 ** level
+    padding = 2 * scale
+    template_height, template_width = entry.bgr.shape[:2]
+    image = frame.variant(color_mode)
+    matches = []
+    for coarse_x, coarse_y in zip(xs.tolist(), ys.tolist()):
+        left = max(0, coarse_x * scale - padding)
+        top = max(0, coarse_y * scale - padding)
+        right = min(frame.width, coarse_x * scale + template_width + padding)
+        bottom = min(frame.height, coarse_y * scale + template_height + padding)
+        if right - left < template_width or bottom - top < template_height:
+            continue
+
+        window = image[top:bottom, left:right]
+        result = _match_template(window, entry, color_mode)
+        _, score, _, loc = cv2.minMaxLoc(result)
+        if score >= confidence:
+            matches.append((score, left + loc[0], top + loc[1]))
+
+    # Jeśli sprawdzono wszystkich kandydatów, brak potwierdzenia oznacza brak dopasowania
+    if not matches and truncated:
+        return None
+    return matches
+
+
+def _feature_match(frame: Frame, entry: TemplateEntry, confidence: float) -> Optional[Tuple[float, int, int]]:
+    """
+    Dopasowuje wzorzec przez punkty charakterystyczne ORB i homografię.
+    Odporne na obrót, skalę i częściowe zasłonięcie celu; deskryptory wzorca
+    i klatki są wyliczane raz i współdzielone przez kolejne wyszukiwania.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Wpis wzorca z pamięci podręcznej
+        confidence: Minimalny udział par zgodnych z homografią wśród par po teście Lowe'a
+
+    Returns:
+        Krotka (pewność, x, y) z pozycją środka wzorca przeniesionego homografią
+        we współrzędnych ekranu lub None, jeśli nie znaleziono dopasowania
+    """
+    template_points, template_descriptors = entry.features
+    frame_points, frame_descriptors = frame.features
+    if template_descriptors is None or frame_descriptors is None or len(frame_points) < 2:
+        logger.debug(f"Brak punktów charakterystycznych dla wzorca '{entry.path}'")
+        return None
+
+    # Test Lowe'a odrzuca pary niejednoznaczne (np. powtarzalne elementy interfejsu)
+    matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+    good = [pair[0] for pair in matcher.knnMatch(template_descriptors, frame_descriptors, k=2)
+            if len(pair) == 2 and pair[0].distance < FEATURE_RATIO * pair[1].distance]
+    if len(good) < FEATURE_MIN_INLIERS:
+        logger.debug(f"Za mało par punktów dla wzorca '{entry.path}' ({len(good)})")
+        return None
+
+    source = template_points[[match.queryIdx for match in good]].reshape(-1, 1, 2)
+    target = frame_points[[match.trainIdx for match in good]].reshape(-1, 1, 2)
+    homography, inliers = cv2.findHomography(source, target, cv2.RANSAC, FEATURE_RANSAC_THRESHOLD)
+    if homography is None:
+        return None
+
+    inlier_count = int(inliers.sum())
+    score = inlier_count / len(good)
+    if inlier_count < FEATURE_MIN_INLIERS or score < confidence:
+        logger.debug(f"Nie znaleziono obrazu '{entry.path}' z wymaganą pewnością "
+                     f"(zgodne pary: {inlier_count}/{len(good)}, wymagane={confidence:.2f})")
+        return None
+
+    # Zdegenerowana homografia (np. odbicie lub zapadnięcie wzorca) nie opisuje widocznego celu
+    corners = np.float32([[0, 0], [entry.width, 0], [entry.width, entry.height],
+                          [0, entry.height]]).reshape(-1, 1, 2)
+    outline = cv2.perspectiveTransform(corners, homography)
+    if not cv2.isContourConvex(outline.astype(np.int32)) or cv2.contourArea(outline) < 1.0:
+        return None
+
+    center = cv2.perspectiveTransform(np.float32([[[entry.width / 2, entry.height / 2]]]), homography)[0, 0]
+    x = int(round(center[0])) + frame.origin[0]
+    y = int(round(center[1])) + frame.origin[1]
+    return float(score), x, y
+
+
+def _best_match(frame: Frame, entry: TemplateEntry, confidence: float, strategy: str = "exact",
+                color_mode: str = "bgr") -> Optional[Tuple[float, int, int]]:
+    """
+    Znajduje najlepsze dopasowanie wzorca w klatce.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Wpis wzorca z pamięci podręcznej
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+
+    Returns:
+        Krotka (pewność, x, y) z pozycją środka dopasowania we współrzędnych ekranu
+        lub None, jeśli nie znaleziono dopasowania z wymaganą pewnością
+    """
+    _check_options(strategy, color_mode)
+
+    if strategy == "features":
+        # Wzorzec może być na ekranie powiększony lub obrócony - rozmiar klatki nie ogranicza
+        return _feature_match(frame, entry, confidence)
 
-        # Pobierz wymiary szablonu
-        template_height, template_width = template.shape[:2]
+    # Pobierz wymiary szablonu
+    template_height, template_width = entry.bgr.shape[:2]
+    if frame.width < template_width or frame.height < template_height:
+        return None
+
+    matches = None
+    if strategy == "pyramid":
+        matches = _pyramid_search(frame, entry, confidence, color_mode=color_mode)
+        if matches == []:
+            logger.debug(f"Nie znaleziono obrazu '{entry.path}' (strategia pyramid)")
+            return None
 
+    if matches:
+        # Najlepsze dopasowanie spośród doprecyzowanych kandydatów
+        max_val, x, y = max(matches)
+        max_loc = (x, y)
+    else:
         # Wykonaj dopasowanie szablonu
-        result = cv2.matchTemplate(screenshot_bgr, template, cv2.TM_CCOEFF_NORMED)
+        result = _match_template(frame.variant(color_mode), entry, color_mode)
 
         # Znajdź położenie najlepszego dopasowania
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
 
-        # Sprawdź czy poziom pewności jest wystarczający
-        if max_val >= confidence:
-            # Oblicz środek znalezionego obrazu
-            x = max_loc[0] + template_width // 2
-            y = max_loc[1] + template_height // 2
+    # Sprawdź czy poziom pewności jest wystarczający
+    if max_val < confidence:
+        logger.debug(
+            f"Nie znaleziono obrazu '{entry.path}' z wymaganą pewnością (max_val={max_val:.2f}, wymagane={confidence:.2f})")
+        return None
+
+    # Oblicz środek znalezionego obrazu we współrzędnych ekranu
+    x = max_loc[0] + template_width // 2 + frame.origin[0]
+    y = max_loc[1] + template_height // 2 + frame.origin[1]
+    return float(max_val), x, y
+
+
+def _remember_match(frame: Frame, entry: TemplateEntry, match: Tuple[float, int, int]) -> None:
+    """
+    Zapisuje położenie dopasowania w pamięci położeń.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Dopasowany wpis wzorca (w skali, przy której go znaleziono)
+        match: Krotka (pewność, x, y) z pozycją środka dopasowania
+    """
+    _, x, y = match
+    get_location_memory().remember(entry.path, frame.screen_size,
+                                   (x - entry.width // 2, y - entry.height // 2, entry.width, entry.height))
+
+
+def _locate_entry(frame: Frame, entry: TemplateEntry, confidence: float, strategy: str,
+                  use_location_memory: bool, color_mode: str) -> Optional[Tuple[float, int, int]]:
+    """
+    Znajduje wzorzec w jednej skali, zaczynając od obszaru wokół jego ostatniego położenia.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Wpis wzorca z pamięci podręcznej
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        use_location_memory: Czy korzystać z pamięci ostatniego położenia wzorca
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+
+    Returns:
+        Krotka (pewność, x, y) z pozycją środka dopasowania we współrzędnych ekranu
+        lub None, jeśli nie znaleziono dopasowania z wymaganą pewnością
+    """
+    memory = get_location_memory()
+    match = None
+
+    # Obszar wokół ostatniego położenia ma rozmiar wzorca, więc nie obejmie celu obróconego lub powiększonego
+    if use_location_memory and strategy != "features":
+        hint = memory.recall(entry.path, frame.screen_size)
+        if hint is not None:
+            # Obszar wokół ostatniego położenia, przycięty do przeszukiwanego regionu
+            roi = frame.crop(hint)
+            if roi.width >= entry.width and roi.height >= entry.height:
+                match = _best_match(roi, entry, confidence, "exact", color_mode)
+                memory.record(match is not None)
+
+    if match is None:
+        # Chybienie w zapamiętanym obszarze - przeszukaj cały region
+        match = _best_match(frame, entry, confidence, strategy, color_mode)
+
+    if match is not None:
+        _remember_match(frame, entry, match)
+    return match
+
+
+def _locate_scaled(frame: Frame, entry: TemplateEntry, confidence: float, strategy: str,
+                   use_location_memory: bool, color_mode: str, scales: Sequence[float],
+                   parallel: bool) -> Optional[Tuple[float, int, int]]:
+    """
+    Znajduje wzorzec w kilku skalach. Skala, która ostatnio wygrała na ekranie
+    o tej rozdzielczości, jest sprawdzana jako pierwsza; pozostałe skale
+    są sprawdzane dopiero przy jej chybieniu.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Wpis wzorca w skali 1.0
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        use_location_memory: Czy korzystać z pamięci ostatniego położenia wzorca
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+        scales: Skale wzorca do sprawdzenia
+        parallel: Czy sprawdzać skale równolegle w puli wątków
 
-            # Jeśli podano region, dodaj jego początek do współrzędnych
-            if region:
-                x += region[0]
-                y += region[1]
+    Returns:
+        Krotka (pewność, x, y) z pozycją środka najlepszego dopasowania we współrzędnych
+        ekranu lub None, jeśli w żadnej skali nie znaleziono dopasowania
+    """
+    candidates = []
+    for scale in scales:
+        scale = round(float(scale), 3)
+        if scale not in candidates:
+            candidates.append(scale)
+
+    memory = get_location_memory()
+    preferred = memory.preferred_scale(frame.screen_size)
+    if preferred in candidates:
+        candidates.remove(preferred)
+        scaled = load_template(entry.path, preferred)
+        if scaled is not None:
+            match = _locate_entry(frame, scaled, confidence, strategy, use_location_memory, color_mode)
+            if match is not None:
+                return match
+
+    entries = [scaled for scaled in (load_template(entry.path, scale) for scale in candidates)
+               if scaled is not None and scaled.width <= frame.width and scaled.height <= frame.height]
+    if not entries:
+        return None
+
+    # Przygotuj warianty klatki przed uruchomieniem wątków, aby nie liczyć ich wielokrotnie
+    frame.variant(color_mode)
+    if strategy == "pyramid" and color_mode in PYRAMID_COLOR_MODES:
+        frame.level(max(_pyramid_level(scaled) for scaled in entries), color_mode)
+
+    def match_scale(scaled: TemplateEntry) -> Optional[Tuple[float, int, int]]:
+        return _best_match(frame, scaled, confidence, strategy, color_mode)
+
+    if parallel and len(entries) > 1:
+        matched = list(_get_executor().map(match_scale, entries))
+    else:
+        matched = list(map(match_scale, entries))
+
+    best = None
+    for scaled, match in zip(entries, matched):
+        if match is not None and (best is None or match[0] > best[1][0]):
+            best = (scaled, match)
+    if best is None:
+        return None
 
-            logger.info(f"Znaleziono obraz '{image_path}' na pozycji ({x}, {y}) z pewnością {max_val:.2f}")
-            return (x, y)
+    scaled, match = best
+    logger.debug(f"Wzorzec '{entry.path}' dopasowany w skali {scaled.scale}")
+    memory.remember_scale(frame.screen_size, scaled.scale)
+    _remember_match(frame, scaled, match)
+    return match
+
+
+def _locate(frame: Frame, entry: TemplateEntry, confidence: float, strategy: str = "exact",
+            use_location_memory: bool = True, color_mode: str = "bgr", scales: Sequence[float] = None,
+            parallel: bool = True) -> Optional[Tuple[float, int, int]]:
+    """
+    Znajduje wzorzec w klatce, zaczynając od obszaru wokół jego ostatniego położenia.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Wpis wzorca z pamięci podręcznej
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        use_location_memory: Czy korzystać z pamięci ostatniego położenia wzorca
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+        scales: Skale wzorca do sprawdzenia (None - tylko skala oryginalna)
+        parallel: Czy sprawdzać skale równolegle w puli wątków
+
+    Returns:
+        Krotka (pewność, x, y) z pozycją środka dopasowania we współrzędnych ekranu
+        lub None, jeśli nie znaleziono dopasowania z wymaganą pewnością
+    """
+    _check_options(strategy, color_mode)
+
+    # Punkty ORB są wykrywane w piramidzie skal, więc strategia "features" nie przeskalowuje wzorca
+    if scales and strategy != "features":
+        if len(scales) > MAX_SCALES:
+            raise ValueError(f"Za dużo skal do sprawdzenia: {len(scales)} (maksymalnie {MAX_SCALES})")
+        return _locate_scaled(frame, entry, confidence, strategy, use_location_memory, color_mode,
+                              scales, parallel)
+
+    return _locate_entry(frame, entry, confidence, strategy, use_location_memory, color_mode)
+
+
+def _monitor_areas(frame: Frame, color_mode: str, strategy: str) -> List[Frame]:
+    """
+    Dzieli klatkę całego ekranu na obszary monitorów.
+
+    Args:
+        frame: Klatka ekranu
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+
+    Returns:
+        Fragmenty klatki odpowiadające monitorom lub pusta lista, gdy klatka nie obejmuje
+        całego pulpitu albo jest tylko jeden monitor
+    """
+    if frame.origin != (0, 0) or (frame.width, frame.height) != tuple(frame.screen_size):
+        return []
+    monitors: List[Monitor] = split_screen(frame.screen_size)
+    if not monitors:
+        return []
+
+    # Warianty klatki liczone raz - fragmenty monitorów są widokami na nie
+    frame.variant(color_mode)
+    if strategy == "features":
+        frame.features
+    areas = [frame.crop(monitor.region) for monitor in monitors]
+    return [area for area in areas if area.width > 0 and area.height > 0]
+
+
+def _locate_monitors(areas: List[Frame], entry: TemplateEntry, confidence: float, strategy: str,
+                     use_location_memory: bool, color_mode: str,
+                     scales: Sequence[float] = None) -> Optional[Tuple[float, int, int]]:
+    """
+    Znajduje wzorzec, dopasowując go równolegle w obszarach poszczególnych monitorów
+    (cv2.matchTemplate zwalnia GIL) zamiast w jednej klatce całego pulpitu.
+
+    Args:
+        areas: Fragmenty klatki odpowiadające monitorom
+        entry: Wpis wzorca z pamięci podręcznej
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        use_location_memory: Czy korzystać z pamięci ostatniego położenia wzorca
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+        scales: Skale wzorca do sprawdzenia (None - tylko skala oryginalna)
+
+    Returns:
+        Krotka (pewność, x, y) najlepszego dopasowania we współrzędnych ekranu
+        lub None, jeśli na żadnym monitorze nie znaleziono dopasowania
+    """
+    def match(area: Frame) -> Optional[Tuple[float, int, int]]:
+        # Skale sprawdzane sekwencyjnie - monitory są już dopasowywane w puli
+        return _locate(area, entry, confidence, strategy, use_location_memory, color_mode, scales, parallel=False)
+
+    matched = [found for found in _get_executor().map(match, areas) if found is not None]
+    return max(matched, default=None)
+
+
+def _dirty_areas(frame: Frame, rects: List[Tuple[int, int, int, int]], entry: TemplateEntry,
+                 scale: float = 1.0) -> List[Frame]:
+    """
+    Wyznacza fragmenty klatki, w których mógł pojawić się wzorzec po zmianie ekranu.
+
+    Args:
+        frame: Bieżąca klatka ekranu
+        rects: Zmienione prostokąty (x, y, width, height) we współrzędnych ekranu
+        entry: Wpis wzorca z pamięci podręcznej
+        scale: Największa sprawdzana skala wzorca
+
+    Returns:
+        Lista fragmentów klatki powiększonych o rozmiar wzorca (pomijane są fragmenty
+        mniejsze od wzorca); pusta lista oznacza brak zmian
+    """
+    template_width = int(round(entry.width * scale))
+    template_height = int(round(entry.height * scale))
+    areas = []
+    for x, y, width, height in rects:
+        # Wzorzec może tylko częściowo nachodzić na zmieniony obszar
+        area = frame.crop((x - template_width, y - template_height,
+                           width + 2 * template_width, height + 2 * template_height))
+        if area.width >= entry.width and area.height >= entry.height:
+            areas.append(area)
+    return areas
+
+
+def _locate_changed(frame: Frame, entry: TemplateEntry, confidence: float, strategy: str,
+                    use_location_memory: bool, color_mode: str,
+                    scales: Sequence[float] = None) -> Optional[Tuple[float, int, int]]:
+    """
+    Znajduje wzorzec, przeszukując tylko obszary zmienione od poprzedniego wyszukiwania.
+
+    Przy pierwszym wyszukiwaniu (lub po zmianie regionu) przeszukiwana jest cała klatka.
+    Jeśli wzorzec był poprzednio znaleziony, a jego obszar się nie zmienił, zwracane
+    jest poprzednie dopasowanie bez ponownego dopasowywania.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Wpis wzorca z pamięci podręcznej
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        use_location_memory: Czy korzystać z pamięci ostatniego położenia wzorca
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+        scales: Skale wzorca do sprawdzenia (None - tylko skala oryginalna)
+
+    Returns:
+        Krotka (pewność, x, y) z pozycją środka dopasowania we współrzędnych ekranu
+        lub None, jeśli nie znaleziono dopasowania z wymaganą pewnością
+    """
+    _check_options(strategy, color_mode)
+
+    key = (entry.path, frame.origin, (frame.width, frame.height), confidence, strategy, color_mode,
+           tuple(scales or ()))
+    changed = get_change_detector().changes(frame, key=key)
+    with _changed_only_lock:
+        known = key in _changed_only_results
+        previous = _changed_only_results.get(key)
+        if known:
+            _changed_only_results.move_to_end(key)
+
+    if changed is None or not known:
+        match = _locate(frame, entry, confidence, strategy, use_location_memory, color_mode, scales)
+    else:
+        scale = max(scales) if scales else 1.0
+        width, height = int(round(entry.width * scale)), int(round(entry.height * scale))
+        previous_box = (previous[1] - width // 2, previous[2] - height // 2, width, height) if previous else None
+
+        if previous_box is not None and not any(intersects(rect, previous_box) for rect in changed):
+            # Obszar poprzedniego dopasowania się nie zmienił - wzorzec nadal tam jest
+            match = previous
+        else:
+            match = None
+            for area in _dirty_areas(frame, changed, entry, scale):
+                match = _locate(area, entry, confidence, strategy, use_location_memory, color_mode, scales)
+                if match is not None:
+                    break
+
+    with _changed_only_lock:
+        _changed_only_results[key] = match
+        _changed_only_results.move_to_end(key)
+        while len(_changed_only_results) > CHANGED_ONLY_MAX_RESULTS:
+            _changed_only_results.popitem(last=False)
+    return match
+
+
+def reset_changed_only() -> None:
+    """
+    Zapomina wyniki i klatki odniesienia wyszukiwań ograniczonych do zmienionych obszarów
+    (np. po przełączeniu aplikacji) - kolejne wyszukiwania przeszukają całe klatki.
+    """
+    with _changed_only_lock:
+        _changed_only_results.clear()
+    get_change_detector().forget(all_keys=True)
+
+
+def find_image_on_screen(image_path: str, confidence: float = 0.8, region: Tuple[int, int, int, int] = None,
+                         strategy: str = "exact", use_location_memory: bool = True,
+                         color_mode: str = "bgr", scales: Sequence[float] = None,
+                         changed_only: bool = False, per_monitor: bool = False) -> Optional[Tuple[int, int]]:
+    """
+    Znajduje obraz na ekranie.
+
+    Args:
+        image_path: Ścieżka do pliku obrazu do znalezienia
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        region: Region ekranu do przeszukania (x, y, width, height)
+        strategy: Strategia dopasowania: "exact" (pełna rozdzielczość), "pyramid"
+                  (najpierw pomniejszona klatka, z powrotem do "exact" przy niejednoznacznym wyniku)
+                  lub "features" (punkty ORB i homografia - cel obrócony, przeskalowany lub
+                  częściowo zasłonięty; pewność to udział par punktów zgodnych z homografią)
+        use_location_memory: Czy najpierw przeszukać obszar wokół ostatniego położenia obrazu
+                             (pełny region jest przeszukiwany tylko przy chybieniu)
+        color_mode: Tryb kolorów: "bgr" (pełny kolor), "gray" (skala szarości, ok. 3x mniej
+                    obliczeń), "edges" (mapy krawędzi, odporne na zmiany motywu) lub "masked"
+                    (kolor z pominięciem przezroczystych pikseli wzorca PNG)
+        scales: Skale wzorca do sprawdzenia (np. DEFAULT_SCALES dla sesji ze skalowaniem DPI);
+                zwycięska skala jest zapamiętywana dla rozdzielczości ekranu i sprawdzana
+                jako pierwsza przy kolejnych wyszukiwaniach
+        changed_only: Czy przeszukiwać tylko obszary zmienione od poprzedniego wyszukiwania
+                      tego obrazu (niezmieniony obszar poprzedniego dopasowania nie jest
+                      dopasowywany ponownie; pierwsze wyszukiwanie obejmuje cały region)
+        per_monitor: Czy przy wyszukiwaniu na całym pulpicie z kilkoma monitorami dopasowywać
+                     wzorzec równolegle w obszarze każdego monitora (wzorzec leżący na granicy
+                     dwóch monitorów nie zostanie wtedy znaleziony); przy znanym ostatnim
+                     położeniu wzorca przeszukiwany jest najpierw obszar wokół niego, a pulpit
+                     jest dzielony na monitory dopiero bez takiej wskazówki
+
+    Returns:
+        Krotka (x, y) z pozycją środka znalezionego obrazu lub None, jeśli nie znaleziono
+    """
+    try:
+        # Pobierz wzorzec z pamięci podręcznej (wczytuje plik tylko przy pierwszym użyciu)
+        entry = load_template(image_path)
+        if entry is None:
+            return None
+
+        # Klatka ekranu (współdzielona z innymi wyszukiwaniami w oknie świeżości)
+        frame = get_frame(region)
+
+        # Podział na monitory tylko bez wskazówki położenia - inaczej wszystkie monitory poza
+        # tym ze wskazówką byłyby przeszukiwane w całości przy każdym wyszukiwaniu
+        hinted = use_location_memory and get_location_memory().recall(entry.path, frame.screen_size) is not None
+        areas = _monitor_areas(frame, color_mode, strategy) if per_monitor and not changed_only and not hinted else []
+        if changed_only:
+            match = _locate_changed(frame, entry, confidence, strategy, use_location_memory, color_mode, scales)
+        elif areas:
+            match = _locate_monitors(areas, entry, confidence, strategy, use_location_memory, color_mode, scales)
         else:
-            logger.debug(
-                f"Nie znaleziono obrazu '{image_path}' z wymaganą pewnością (max_val={max_val:.2f}, wymagane={confidence:.2f})")
+            match = _locate(frame, entry, confidence, strategy, use_location_memory, color_mode, scales)
+        if match is None:
             return None
+
+        max_val, x, y = match
+        logger.info(f"Znaleziono obraz '{image_path}' na pozycji ({x}, {y}) z pewnością {max_val:.2f}")
+        return (x, y)
     except Exception as e:
         logger.error(f"Błąd podczas wyszukiwania obrazu na ekranie: {str(e)}")
         return None
 
 
-def find_all_on_screen(image_path: str, confidence: float = 0.8, region: Tuple[int, int, int, int] = None) -> List[
-    Tuple[int, int]]:
+def find_all_templates(image_paths: List[str], confidence: float = 0.8, region: Tuple[int, int, int, int] = None,
+                       strategy: str = "exact", parallel: bool = False, use_location_memory: bool = True,
+                       color_mode: str = "bgr",
+                       scales: Sequence[float] = None) -> Dict[str, Optional[Tuple[int, int, float]]]:
+    """
+    Wyszukuje wiele wzorców na jednej klatce ekranu.
+
+    Args:
+        image_paths: Lista ścieżek do plików obrazów
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        region: Region ekranu do przeszukania (x, y, width, height)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        parallel: Czy dopasowywać wzorce równolegle w puli wątków
+                  (cv2.matchTemplate zwalnia GIL)
+        use_location_memory: Czy najpierw przeszukać obszar wokół ostatniego położenia każdego wzorca
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+        scales: Skale wzorców do sprawdzenia (None - tylko skala oryginalna)
+
+    Returns:
+        Słownik ścieżka -> (x, y, pewność) dla znalezionych wzorców lub None dla nieznalezionych,
+        w kolejności podanych ścieżek
+    """
+    results: Dict[str, Optional[Tuple[int, int, float]]] = {path: None for path in image_paths}
+    try:
+        _check_options(strategy, color_mode)
+
+        # Jedna klatka dla wszystkich wzorców
+        frame = get_frame(region)
+        entries = {path: load_template(path) for path in results}
+
+        # Przygotuj poziomy piramidy lub punkty ORB klatki przed uruchomieniem wątków,
+        # aby nie liczyć ich wielokrotnie
+        if strategy == "pyramid" and color_mode in PYRAMID_COLOR_MODES:
+            frame.level(max((_pyramid_level(entry) for entry in entries.values() if entry), default=0), color_mode)
+        elif strategy == "features":
+            frame.features
+
+        def match(path: str) -> Optional[Tuple[int, int, float]]:
+            entry = entries[path]
+            if entry is None:
+                return None
+            # Skale sprawdzane równolegle tylko wtedy, gdy wzorce nie są już dopasowywane w puli
+            best = _locate(frame, entry, confidence, strategy, use_location_memory, color_mode, scales,
+                           parallel=not parallel)
+            if best is None:
+                return None
+            return best[1], best[2], best[0]
+
+        if parallel and len(results) > 1:
+            matched = _get_executor().map(match, list(results))
+        else:
+            matched = map(match, list(results))
+
+        for path, found in zip(list(results), matched):
+            results[path] = found
+
+        logger.info(f"Znaleziono {sum(found is not None for found in results.values())} z {len(results)} wzorców")
+        return results
+    except Exception as e:
+        logger.error(f"Błąd podczas wyszukiwania wzorców na ekranie: {str(e)}")
+        return results
+
+
+def find_any_on_screen(image_paths: List[str], confidence: float = 0.8, region: Tuple[int, int, int, int] = None,
+                       strategy: str = "exact", parallel: bool = False, use_location_memory: bool = True,
+                       color_mode: str = "bgr",
+                       scales: Sequence[float] = None) -> Optional[Tuple[str, Tuple[int, int], float]]:
+    """
+    Sprawdza, który z alternatywnych wzorców (np. różne motywy, języki, stany najechania)
+    jest widoczny na ekranie.
+
+    Args:
+        image_paths: Lista ścieżek do plików obrazów
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        region: Region ekranu do przeszukania (x, y, width, height)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        parallel: Czy dopasowywać wzorce równolegle w puli wątków
+        use_location_memory: Czy najpierw przeszukać obszar wokół ostatniego położenia każdego wzorca
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+        scales: Skale wzorców do sprawdzenia (None - tylko skala oryginalna)
+
+    Returns:
+        Krotka (ścieżka, (x, y), pewność) dla najlepiej dopasowanego wzorca lub None,
+        jeśli żaden nie został znaleziony
+    """
+    results = find_all_templates(image_paths, confidence, region, strategy, parallel, use_location_memory, color_mode,
+                                 scales)
+
+    best = None
+    for path, found in results.items():
+        if found is not None and (best is None or found[2] > best[2]):
+            best = (path, (found[0], found[1]), found[2])
+
+    if best:
+        logger.info(f"Najlepiej dopasowany wzorzec: '{best[0]}' na pozycji {best[1]} z pewnością {best[2]:.2f}")
+    return best
+
+
+def _all_matches(frame: Frame, entry: TemplateEntry, confidence: float, strategy: str,
+                 color_mode: str) -> List[Tuple[float, int, int]]:
+    """
+    Znajduje wszystkie wystąpienia wzorca w klatce.
+
+    Args:
+        frame: Klatka ekranu
+        entry: Wpis wzorca z pamięci podręcznej
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+
+    Returns:
+        Lista krotek (pewność, x, y) z pozycjami środków we współrzędnych ekranu,
+        posortowana malejąco według pewności
+    """
+    if strategy == "features":
+        # Homografia opisuje jedno wystąpienie wzorca
+        match = _feature_match(frame, entry, confidence)
+        return [match] if match is not None else []
+
+    # Pobierz wymiary szablonu
+    template_height, template_width = entry.bgr.shape[:2]
+    if frame.width < template_width or frame.height < template_height:
+        return []
+
+    matches = None
+    if strategy == "pyramid":
+        matches = _pyramid_search(frame, entry, confidence, exhaustive=True, color_mode=color_mode)
+
+    if matches is not None:
+        # Dopasowania doprecyzowane w otoczeniu kandydatów zgrubnych
+        scores = np.array([score for score, _, _ in matches], dtype=np.float32)
+        xs = np.array([x for _, x, _ in matches], dtype=np.int64)
+        ys = np.array([y for _, _, y in matches], dtype=np.int64)
+    else:
+        # Wykonaj dopasowanie szablonu
+        result = _match_template(frame.variant(color_mode), entry, color_mode)
+
+        # Lokalne maksima powyżej progu pewności. Otoczenie o połowie rozmiaru wzorca
+        # odrzuca tylko punkty, które i tak nakładałyby się z lepszym ponad próg IoU
+        scores, xs, ys = _local_maxima(result, confidence, (template_width // 2, template_height // 2))
+
+    # Usuń nakładające się wykrycia (zostają najlepsze)
+    keep = _non_max_suppression(scores, xs, ys, template_width, template_height)
+
+    # Oblicz środki znalezionych obrazów we współrzędnych ekranu
+    return [(float(scores[index]),
+             int(xs[index]) + template_width // 2 + frame.origin[0],
+             int(ys[index]) + template_height // 2 + frame.origin[1]) for index in keep]
+
+
+def find_all_on_screen(image_path: str, confidence: float = 0.8, region: Tuple[int, int, int, int] = None,
+                       strategy: str = "exact", return_scores: bool = False,
+                       color_mode: str = "bgr",
+                       per_monitor: bool = False) -> List[Union[Tuple[int, int], Tuple[int, int, float]]]:
     """
     Znajduje wszystkie wystąpienia obrazu na ekranie.
 
@@ -97,90 +990,174 @@ def find_all_on_screen(image_path: str, confidence: float = 0.8, region: Tuple[i
         image_path: Ścieżka do pliku obrazu do znalezienia
         confidence: Poziom pewności dopasowania (0.0 - 1.0)
         region: Region ekranu do przeszukania (x, y, width, height)
+        strategy: Strategia dopasowania: "exact" (pełna rozdzielczość) lub "pyramid"
+                  (najpierw pomniejszona klatka, z powrotem do "exact" przy niejednoznacznym wyniku)
+        return_scores: Czy zwrócić także poziom pewności każdego dopasowania
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+        per_monitor: Czy przy wyszukiwaniu na całym pulpicie z kilkoma monitorami dopasowywać
+                     wzorzec równolegle w obszarze każdego monitora i scalić wyniki (wystąpienia
+                     leżące na granicy dwóch monitorów nie zostaną wtedy znalezione)
 
     Returns:
-        Lista krotek (x, y) z pozycjami środków znalezionych obrazów
+        Lista krotek (x, y) z pozycjami środków znalezionych obrazów (lub (x, y, pewność),
+        jeśli return_scores=True), posortowana malejąco według pewności
     """
     try:
-        # Sprawdź czy plik istnieje
-        if not os.path.exists(image_path):
-            logger.error(f"Plik obrazu nie istnieje: {image_path}")
+        # Pobierz wzorzec z pamięci podręcznej (wczytuje plik tylko przy pierwszym użyciu)
+        entry = load_template(image_path)
+        if entry is None:
             return []
 
-        # Zrzut ekranu
-        screenshot = ImageGrab.grab(bbox=region)
-        screenshot_np = np.array(screenshot)
-
-        # Konwersja z RGB do BGR (cv2 używa BGR)
-        screenshot_bgr = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2BGR)
+        # Klatka ekranu (współdzielona z innymi wyszukiwaniami w oknie świeżości)
+        frame = get_frame(region)
 
-        # Wczytaj obraz wzorcowy
-        template = cv2.imread(image_path)
+        _check_options(strategy, color_mode)
 
-        # Sprawdź czy obraz wzorcowy został poprawnie wczytany
-        if template is None:
-            logger.error(f"Nie udało się wczytać obrazu: {image_path}")
-            return []
+        areas = _monitor_areas(frame, color_mode, strategy) if per_monitor else []
+        if areas:
+            # Wyniki monitorów są już we współrzędnych ekranu - wystarczy je scalić
+            per_area = _get_executor().map(
+                lambda area: _all_matches(area, entry, confidence, strategy, color_mode), areas)
+            matches = sorted((match for found in per_area for match in found), reverse=True)
+        else:
+            matches = _all_matches(frame, entry, confidence, strategy, color_mode)
 
-        # Pobierz wymiary szablonu
-        template_height, template_width = template.shape[:2]
+        if return_scores:
+            positions = [(x, y, score) for score, x, y in matches]
+        else:
+            positions = [(x, y) for _, x, y in matches]
 
-        # Wykonaj dopasowanie szablonu
-        result = cv2.matchTemplate(screenshot_bgr, template, cv2.TM_CCOEFF_NORMED)
-
-        # Znajdź wszystkie dopasowania powyżej progu pewności
-        locations = np.where(result >= confidence)
-        positions = []
-
-        # Konwersja do użytecznych współrzędnych
-        for pt in zip(*locations[::-1]):
-            # Oblicz środek znalezionego obrazu
-            x = pt[0] + template_width // 2
-            y = pt[1] + template_height // 2
-
-            # Jeśli podano region, dodaj jego początek do współrzędnych
-            if region:
-                x += region[0]
-                y += region[1]
-
-            positions.append((x, y))
-
-        # Usuń duplikaty (gdy wykrycie jest bardzo blisko innego)
-        filtered_positions = []
-        for pos in positions:
-            # Sprawdź czy podobna pozycja już istnieje
-            if not any(abs(pos[0] - p[0]) < 10 and abs(pos[1] - p[1]) < 10 for p in filtered_positions):
-                filtered_positions.append(pos)
-
-        logger.info(f"Znaleziono {len(filtered_positions)} wystąpień obrazu '{image_path}'")
-        return filtered_positions
+        logger.info(f"Znaleziono {len(positions)} wystąpień obrazu '{image_path}'")
+        return positions
     except Exception as e:
         logger.error(f"Błąd podczas wyszukiwania obrazów na ekranie: {str(e)}")
         return []
 
 
-def take_screenshot(output_path: Optional[str] = None, region: Tuple[int, int, int, int] = None) -> Optional[str]:
+def wait_for_image(image_path: str, timeout: float = 10.0, confidence: float = 0.8,
+                   region: Tuple[int, int, int, int] = None, strategy: str = "exact",
+                   interval: float = 0.1, max_interval: float = 1.0,
+                   backoff: float = 1.5,
+                   color_mode: str = "bgr") -> Tuple[Optional[Tuple[int, int]], Dict[str, Any]]:
+    """
+    Czeka na pojawienie się obrazu na ekranie.
+
+    Pierwsza klatka jest przeszukiwana w całości. Kolejne klatki są porównywane
+    z poprzednią w pomniejszeniu, a dopasowanie wzorca jest uruchamiane tylko
+    w zmienionych obszarach. Gdy ekran się nie zmienia, odstęp między zrzutami
+    rośnie (backoff) aż do max_interval.
+
+    Args:
+        image_path: Ścieżka do pliku obrazu do znalezienia
+        timeout: Maksymalny czas oczekiwania (w sekundach)
+        confidence: Poziom pewności dopasowania (0.0 - 1.0)
+        region: Region ekranu do obserwowania (x, y, width, height)
+        strategy: Strategia dopasowania (jedna z MATCH_STRATEGIES)
+        interval: Początkowy odstęp między zrzutami ekranu (w sekundach)
+        max_interval: Maksymalny odstęp między zrzutami ekranu (w sekundach)
+        backoff: Mnożnik odstępu po klatce bez zmian
+        color_mode: Tryb kolorów (jeden z COLOR_MODES)
+
+    Returns:
+        Krotka (pozycja, statystyki): pozycja (x, y) środka obrazu lub None po upływie
+        czasu oczekiwania oraz słownik z liczbą zrzutów ("frames"), prób dopasowania
+        ("matches"), klatek bez zmian ("unchanged") i czasem do znalezienia ("time_to_match")
+    """
+    stats: Dict[str, Any] = {"frames": 0, "matches": 0, "unchanged": 0, "time_to_match": None}
+    start = time.monotonic()
+    try:
+        entry = load_template(image_path)
+        if entry is None:
+            return None, stats
+
+        delay = interval
+        detector = ChangeDetector(WAIT_DIFF_SCALE, WAIT_DIFF_THRESHOLD, WAIT_MAX_DIRTY_REGIONS)
+        while True:
+            frame = get_frame(region)
+            stats["frames"] += 1
+            changed = detector.changes(frame)
+            first = changed is None
+
+            # Pierwsza klatka - pełne wyszukiwanie, kolejne - tylko zmienione obszary
+            areas = [frame] if first else _dirty_areas(frame, changed, entry)
+
+            match = None
+            for area in areas:
+                stats["matches"] += 1
+                match = _locate(area, entry, confidence, strategy, first, color_mode)
+                if match is not None:
+                    break
+
+            if match is not None:
+                stats["time_to_match"] = time.monotonic() - start
+                logger.info(f"Obraz '{image_path}' pojawił się po {stats['time_to_match']:.2f}s "
+                            f"(zrzuty: {stats['frames']}, dopasowania: {stats['matches']})")
+                return (match[1], match[2]), stats
+
+            if areas:
+                delay = interval
+            else:
+                stats["unchanged"] += 1
+                delay = min(delay * backoff, max_interval)
+
+            remaining = timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+
+            # Wymuś nowy zrzut zamiast klatki współdzielonej
+            invalidate_frames()
+
+        logger.info(f"Nie doczekano się obrazu '{image_path}' w ciągu {timeout}s "
+                    f"(zrzuty: {stats['frames']}, dopasowania: {stats['matches']})")
+        return None, stats
+    except Exception as e:
+        logger.error(f"Błąd podczas oczekiwania na obraz: {str(e)}")
+        return None, stats
+
+
+def take_screenshot(output_path: Optional[str] = None, region: Tuple[int, int, int, int] = None,
+                    image_format: Optional[str] = None, background: bool = False) -> Optional[str]:
     """
     Wykonuje zrzut ekranu i zapisuje go do pliku.
 
     Args:
         output_path: Ścieżka do pliku wyjściowego (opcjonalnie)
         region: Region ekranu do zrzutu (x, y, width, height)
+        image_format: Format zapisu: "png", "webp" lub "jpg" (domyślnie z rozszerzenia ścieżki
+                      lub ustawienie puli zapisu)
+        background: Czy kodować i zapisywać plik w tle (ścieżka jest zwracana od razu,
+                    a plik pojawia się po get_screenshot_writer().flush())
 
     Returns:
         Ścieżka do zapisanego pliku lub None w przypadku błędu
     """
     try:
-        # Wykonaj zrzut ekranu
-        screenshot = ImageGrab.grab(bbox=region)
+        # Pobierz klatkę ekranu
+        frame = get_frame(region)
+
+        writer = get_screenshot_writer()
+        if background:
+            output_path = writer.submit(frame.bgr, output_path, image_format)
+            logger.info(f"Zlecono zapis zrzutu ekranu do pliku: {output_path}")
+            return output_path
 
         # Jeśli nie podano ścieżki, utwórz plik tymczasowy
         if output_path is None:
-            fd, output_path = tempfile.mkstemp(suffix='.png')
+            fd, output_path = tempfile.mkstemp(suffix=f".{image_format or writer.image_format}")
             os.close(fd)
 
+        if image_format is None:
+            extension = os.path.splitext(output_path)[1].lower().lstrip(".")
+            image_format = "jpg" if extension == "jpeg" else extension
+        params = []
+        if image_format in SCREENSHOT_FORMATS:
+            params = encode_params(image_format, writer.compression, writer.quality)
+
         # Zapisz zrzut ekranu
-        screenshot.save(output_path)
+        if not cv2.imwrite(output_path, frame.bgr, params):
+            logger.error(f"Nie udało się zapisać zrzutu ekranu: {output_path}")
+            return None
         logger.info(f"Zapisano zrzut ekranu do pliku: {output_path}")
 
         return output_path
@@ -189,40 +1166,76 @@ def take_screenshot(output_path: Optional[str] = None, region: Tuple[int, int, i
         return None
 
 
-def compare_images(image1_path: str, image2_path: str) -> float:
+def compare_images(image1_path: str, image2_path: str, method: str = "correlation") -> float:
     """
     Porównuje dwa obrazy i zwraca poziom podobieństwa.
 
     Args:
         image1_path: Ścieżka do pierwszego obrazu
         image2_path: Ścieżka do drugiego obrazu
+        method: Metoda porównania: "correlation" (współczynnik korelacji w pełnej rozdzielczości)
+                lub skrót percepcyjny ("ahash", "dhash", "phash" - podobieństwo 64-bitowych skrótów,
+                niezależne od rozdzielczości i wielokrotnie szybsze)
 
     Returns:
         Poziom podobieństwa (0.0 - 1.0) gdzie 1.0 oznacza identyczne obrazy
     """
     try:
-        # Wczytaj obrazy
-        img1 = cv2.imread(image1_path)
-        img2 = cv2.imread(image2_path)
+        if method != "correlation" and method not in HASH_METHODS:
+            raise ValueError(f"Nieznana metoda porównania: {method}")
+
+        # Wczytaj obrazy (przez pamięć podręczną, która przechowuje też wersje w skali szarości)
+        entry1 = load_template(image1_path)
+        entry2 = load_template(image2_path)
 
         # Sprawdź czy obrazy zostały poprawnie wczytane
-        if img1 is None or img2 is None:
+        if entry1 is None or entry2 is None:
             logger.error(f"Nie udało się wczytać obrazów: {image1_path}, {image2_path}")
             return 0.0
 
-        # Dopasuj rozmiary obrazów
-        if img1.shape != img2.shape:
-            img2 = cv2.resize(img2, (img1.shape[1], img1.shape[0]))
+        gray1 = entry1.gray
+        gray2 = entry2.gray
 
-        # Konwersja na skalę szarości
-        gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
+        if method in HASH_METHODS:
+            similarity = hash_similarity(image_hash(gray1, method), image_hash(gray2, method))
+        else:
+            # Dopasuj rozmiary obrazów
+            if gray1.shape != gray2.shape:
+                gray2 = cv2.resize(gray2, (gray1.shape[1], gray1.shape[0]))
 
-        # Oblicz współczynnik korelacji
-        similarity = cv2.matchTemplate(gray1, gray2, cv2.TM_CCOEFF_NORMED)[0][0]
+            # Oblicz współczynnik korelacji
+            similarity = cv2.matchTemplate(gray1, gray2, cv2.TM_CCOEFF_NORMED)[0][0]
 
         logger.info(f"Podobieństwo obrazów: {similarity:.2f}")
         return float(similarity)
     except Exception as e:
         logger.error(f"Błąd podczas porównywania obrazów: {str(e)}")
-        return 0.0
\ No newline at end of file
+        return 0.0
+
+
+def classify_screen(region: Tuple[int, int, int, int] = None, index: Optional[ScreenStateIndex] = None,
+                    max_distance: Optional[int] = None) -> Optional[Tuple[str, int]]:
+    """
+    Rozpoznaje, który ze znanych stanów ekranu (strona, okno dialogowe) jest widoczny.
+
+    Args:
+        region: Region ekranu do rozpoznania (x, y, width, height); stany opisane własnym
+                regionem są porównywane z tym regionem w obrębie klatki
+        index: Indeks stanów ekranu (opcjonalnie, domyślnie indeks globalny)
+        max_distance: Maksymalna odległość Hamminga (z 64 bitów) dla rozpoznania
+                      (opcjonalnie, domyślnie ustawienie indeksu)
+
+    Returns:
+        Krotka (nazwa stanu, odległość Hamminga) lub None, jeśli żaden stan nie pasuje
+    """
+    try:
+        index = index if index is not None else get_screen_state_index()
+        state = index.classify(get_frame(region), max_distance)
+        if state is None:
+            logger.info("Nie rozpoznano stanu ekranu")
+        else:
+            logger.info(f"Rozpoznano stan ekranu '{state[0]}' (odległość {state[1]})")
+        return state
+    except Exception as e:
+        logger.error(f"Błąd podczas rozpoznawania stanu ekranu: {str(e)}")
+        return None
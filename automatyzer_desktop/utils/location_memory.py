@@ -0,0 +1,157 @@
+# Pamięć położenia znalezionych wzorców
+"""
+location_memory.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pamięć ostatniego położenia znalezionych wzorców.
+Dla stabilnych interfejsów wzorzec zwykle pojawia się w tym samym miejscu,
+więc kolejne wyszukiwanie zaczyna się od niewielkiego obszaru wokół
+ostatniego położenia, a pełny ekran jest przeszukiwany dopiero przy chybieniu.
+Pamięć przechowuje też skalę wzorców (np. skalowanie DPI sesji RDP), przy
+której ostatnio udało się dopasować wzorzec na danym ekranie.
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+# Margines dodawany wokół zapamiętanego położenia (w pikselach)
+DEFAULT_PADDING = 32
+
+
+class LocationMemory:
+    """
+    Zapamiętuje prostokąt ostatniego dopasowania dla każdego wzorca
+    i rozdzielczości ekranu.
+    """
+
+    def __init__(self, padding: int = DEFAULT_PADDING):
+        """
+        Inicjalizacja pamięci położeń.
+
+        Args:
+            padding: Margines dodawany wokół zapamiętanego prostokąta (w pikselach)
+        """
+        self.padding = padding
+        self._locations: Dict[Tuple[str, Tuple[int, int]], Tuple[int, int, int, int]] = {}
+        self._scales: Dict[Tuple[int, int], float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(image_path: str, screen_size: Tuple[int, int]) -> Tuple[str, Tuple[int, int]]:
+        return os.path.abspath(image_path), tuple(screen_size)
+
+    def remember(self, image_path: str, screen_size: Tuple[int, int], bbox: Tuple[int, int, int, int]) -> None:
+        """
+        Zapisuje położenie znalezionego wzorca.
+
+        Args:
+            image_path: Ścieżka do pliku wzorca
+            screen_size: Rozdzielczość ekranu (szerokość, wysokość)
+            bbox: Prostokąt dopasowania (x, y, width, height) we współrzędnych ekranu
+        """
+        with self._lock:
+            self._locations[self._key(image_path, screen_size)] = bbox
+
+    def recall(self, image_path: str, screen_size: Tuple[int, int]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Zwraca obszar do przeszukania w pierwszej kolejności.
+
+        Args:
+            image_path: Ścieżka do pliku wzorca
+            screen_size: Rozdzielczość ekranu (szerokość, wysokość)
+
+        Returns:
+            Region (x, y, width, height) powiększony o margines lub None, jeśli wzorzec
+            nie był jeszcze znaleziony przy tej rozdzielczości
+        """
+        with self._lock:
+            bbox = self._locations.get(self._key(image_path, screen_size))
+        if bbox is None:
+            return None
+
+        x, y, width, height = bbox
+        return (x - self.padding, y - self.padding, width + 2 * self.padding, height + 2 * self.padding)
+
+    def remember_scale(self, screen_size: Tuple[int, int], scale: float) -> None:
+        """
+        Zapisuje skalę, przy której wzorzec został znaleziony na ekranie o danej rozdzielczości.
+
+        Args:
+            screen_size: Rozdzielczość ekranu (szerokość, wysokość)
+            scale: Skala zwycięskiego wzorca
+        """
+        with self._lock:
+            self._scales[tuple(screen_size)] = scale
+
+    def preferred_scale(self, screen_size: Tuple[int, int]) -> Optional[float]:
+        """
+        Zwraca ostatnio zwycięską skalę dla ekranu o danej rozdzielczości.
+
+        Args:
+            screen_size: Rozdzielczość ekranu (szerokość, wysokość)
+
+        Returns:
+            Skala lub None, jeśli nie została jeszcze ustalona
+        """
+        with self._lock:
+            return self._scales.get(tuple(screen_size))
+
+    def record(self, hit: bool) -> None:
+        """
+        Zlicza trafienia i chybienia wyszukiwania w zapamiętanym obszarze.
+
+        Args:
+            hit: Czy wzorzec został znaleziony w zapamiętanym obszarze
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def forget(self, image_path: str = None) -> None:
+        """
+        Usuwa zapamiętane położenia wzorca (lub wszystkie położenia i skale, jeśli nie podano ścieżki).
+
+        Args:
+            image_path: Ścieżka do pliku wzorca (opcjonalnie)
+        """
+        with self._lock:
+            if image_path is None:
+                self._locations.clear()
+                self._scales.clear()
+                return
+            path = os.path.abspath(image_path)
+            for key in [key for key in self._locations if key[0] == path]:
+                del self._locations[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Zwraca statystyki pamięci położeń.
+
+        Returns:
+            Słownik z liczbą zapamiętanych położeń, trafień i chybień
+        """
+        with self._lock:
+            return {"entries": len(self._locations), "hits": self.hits, "misses": self.misses}
+
+
+# Globalna pamięć położeń (współdzielona w procesie)
+_location_memory = LocationMemory()
+
+
+def get_location_memory() -> LocationMemory:
+    """
+    Zwraca globalną pamięć położeń wzorców.
+
+    Returns:
+        Instancja LocationMemory współdzielona w procesie
+    """
+    return _location_memory
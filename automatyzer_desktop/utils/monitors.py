@@ -0,0 +1,183 @@
+# Monitory
+"""
+monitors.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Wykrywanie monitorów tworzących wirtualny pulpit.
+Zrzut całego ekranu obejmuje wszystkie monitory, więc wyszukiwanie obrazu
+może być podzielone na niezależne dopasowania w obszarach poszczególnych
+monitorów (wykonywane równolegle) lub ograniczone do wybranego monitora.
+Położenia monitorów są wyrażone we współrzędnych klatki całego ekranu
+(lewy górny róg wirtualnego pulpitu to (0, 0)).
+"""
+
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Prefiks nazw monitorów (monitor1, monitor2, ...)
+MONITOR_PREFIX = "monitor"
+
+# Nazwa monitora głównego
+PRIMARY_MONITOR = "primary"
+
+
+class Monitor:
+    """
+    Pojedynczy monitor wirtualnego pulpitu.
+    """
+
+    __slots__ = ("name", "x", "y", "width", "height", "primary")
+
+    def __init__(self, name: str, x: int, y: int, width: int, height: int, primary: bool = False):
+        """
+        Inicjalizacja monitora.
+
+        Args:
+            name: Nazwa monitora (np. "monitor1")
+            x: Położenie lewej krawędzi we współrzędnych klatki całego ekranu
+            y: Położenie górnej krawędzi we współrzędnych klatki całego ekranu
+            width: Szerokość monitora w pikselach
+            height: Wysokość monitora w pikselach
+            primary: Czy to monitor główny
+        """
+        self.name = name
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.primary = primary
+
+    @property
+    def region(self) -> Tuple[int, int, int, int]:
+        """Obszar monitora (x, y, width, height)"""
+        return self.x, self.y, self.width, self.height
+
+    def __repr__(self) -> str:
+        return f"Monitor({self.name!r}, {self.region}{', primary' if self.primary else ''})"
+
+
+def _detect_monitors() -> List[Monitor]:
+    """
+    Wykrywa monitory przez bibliotekę mss.
+
+    Returns:
+        Lista monitorów (pusta, gdy mss jest niedostępne lub wykrywanie się nie powiodło)
+    """
+    if mss is None:
+        return []
+
+    with mss.mss() as sct:
+        # Monitor 0 to cały wirtualny pulpit - jego róg wyznacza początek współrzędnych klatki
+        desktop = sct.monitors[0]
+        monitors = []
+        for index, info in enumerate(sct.monitors[1:], 1):
+            monitors.append(Monitor(f"{MONITOR_PREFIX}{index}", info["left"] - desktop["left"],
+                                    info["top"] - desktop["top"], info["width"], info["height"],
+                                    # Monitor główny zawiera początek układu współrzędnych systemu
+                                    primary=info["left"] == 0 and info["top"] == 0))
+        return monitors
+
+
+# Wykryte monitory (None - jeszcze nie wykrywano)
+_monitors: Optional[List[Monitor]] = None
+_monitors_lock = threading.Lock()
+
+
+def get_monitors(refresh: bool = False) -> List[Monitor]:
+    """
+    Zwraca monitory wirtualnego pulpitu (wykrywane raz i zapamiętywane).
+
+    Args:
+        refresh: Czy wykryć monitory ponownie (np. po podłączeniu monitora)
+
+    Returns:
+        Lista monitorów; pusta, gdy nie udało się ich wykryć
+    """
+    global _monitors
+    with _monitors_lock:
+        if _monitors is None or refresh:
+            try:
+                _monitors = _detect_monitors()
+            except Exception as e:
+                logger.warning(f"Nie udało się wykryć monitorów: {str(e)}")
+                _monitors = []
+            logger.debug(f"Wykryte monitory: {_monitors}")
+        return list(_monitors)
+
+
+def set_monitors(monitors: Optional[List[Monitor]]) -> Optional[List[Monitor]]:
+    """
+    Ustawia układ monitorów (np. dla syntetycznego ekranu w testach lub konfiguracji ręcznej).
+
+    Args:
+        monitors: Lista monitorów lub None, aby wykryć je ponownie przy kolejnym użyciu
+
+    Returns:
+        Poprzedni układ monitorów
+    """
+    global _monitors
+    with _monitors_lock:
+        previous = _monitors
+        _monitors = list(monitors) if monitors is not None else None
+        return previous
+
+
+def get_monitor(name: str) -> Optional[Monitor]:
+    """
+    Zwraca monitor o podanej nazwie.
+
+    Args:
+        name: Nazwa monitora ("monitor2"), jego numer ("2") lub "primary"
+
+    Returns:
+        Monitor lub None, jeśli nie ma monitora o tej nazwie
+    """
+    name = name.strip().lower()
+    if name.isdigit():
+        name = f"{MONITOR_PREFIX}{name}"
+
+    monitors = get_monitors()
+    for monitor in monitors:
+        if monitor.name == name or (name == PRIMARY_MONITOR and monitor.primary):
+            return monitor
+    if name == PRIMARY_MONITOR and monitors:
+        return monitors[0]
+    return None
+
+
+def split_screen(screen_size: Tuple[int, int]) -> List[Monitor]:
+    """
+    Zwraca monitory, na które można podzielić klatkę całego ekranu.
+
+    Args:
+        screen_size: Rozmiar klatki całego ekranu (width, height)
+
+    Returns:
+        Monitory leżące w klatce, jeśli jest ich więcej niż jeden, a ich obwiednia
+        pokrywa się z klatką; w przeciwnym razie pusta lista (bez podziału)
+    """
+    monitors = get_monitors()
+    if len(monitors) < 2:
+        return []
+
+    right = max(monitor.x + monitor.width for monitor in monitors)
+    bottom = max(monitor.y + monitor.height for monitor in monitors)
+    left = min(monitor.x for monitor in monitors)
+    top = min(monitor.y for monitor in monitors)
+    if (left, top, right, bottom) != (0, 0) + tuple(screen_size):
+        # Klatka pochodzi z innego źródła niż wykryty pulpit (np. ekran syntetyczny)
+        return []
+    return monitors
@@ -3,3 +3,631 @@
 ocr.py
 """
 
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Rozpoznawanie tekstu (OCR) na fragmentach ekranu.
+Silnik tesseract jest uruchamiany raz i utrzymywany w pamięci (tesserocr),
+a przy jego braku wywoływany przez pytesseract z łączeniem wielu regionów
+w jeden obraz (jeden proces na partię zamiast jednego na region). Obrazy są
+przekazywane jako tablice NumPy, bez zapisu na dysk, a wyniki są
+zapamiętywane według skrótu zawartości regionu.
+"""
+
+import bisect
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import get_frame
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Obsługiwane silniki OCR
+OCR_ENGINES = ("auto", "tesserocr", "pytesseract")
+
+# Domyślny język rozpoznawania (kody tesseract, np. "pol+eng")
+DEFAULT_LANG = "eng"
+
+# Domyślny tryb segmentacji strony tesseract (3 - automatyczny)
+DEFAULT_PSM = 3
+
+# Domyślna liczba zapamiętanych wyników
+DEFAULT_CACHE_ENTRIES = 256
+
+# Odstęp między regionami łączonymi w jeden obraz (w pikselach)
+BATCH_GAP = 24
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """
+    Konwertuje obraz do skali szarości (tesseract i tak binaryzuje obraz).
+
+    Args:
+        image: Obraz w skali szarości, BGR lub BGRA
+
+    Returns:
+        Obraz w skali szarości (uint8)
+    """
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def _stack(images: Sequence[np.ndarray], gap: int = BATCH_GAP) -> Tuple[np.ndarray, List[int]]:
+    """
+    Układa obrazy jeden pod drugim na białym tle.
+
+    Args:
+        images: Obrazy w skali szarości
+        gap: Odstęp między obrazami (w pikselach)
+
+    Returns:
+        Krotka (obraz zbiorczy, lista współrzędnych y początku każdego obrazu)
+    """
+    width = max(image.shape[1] for image in images) + 2 * gap
+    height = sum(image.shape[0] for image in images) + gap * (len(images) + 1)
+    canvas = np.full((height, width), 255, dtype=np.uint8)
+
+    offsets = []
+    y = gap
+    for image in images:
+        canvas[y:y + image.shape[0], gap:gap + image.shape[1]] = image
+        offsets.append(y)
+        y += image.shape[0] + gap
+    return canvas, offsets
+
+
+class Word:
+    """
+    Rozpoznane słowo z prostokątem otaczającym.
+    """
+
+    __slots__ = ("text", "x", "y", "width", "height", "confidence")
+
+    def __init__(self, text: str, x: int, y: int, width: int, height: int, confidence: float = 0.0):
+        """
+        Inicjalizacja słowa.
+
+        Args:
+            text: Tekst słowa
+            x: Współrzędna X lewego górnego rogu
+            y: Współrzędna Y lewego górnego rogu
+            width: Szerokość prostokąta
+            height: Wysokość prostokąta
+            confidence: Pewność rozpoznania (0-100)
+        """
+        self.text = text
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.confidence = confidence
+
+    @property
+    def box(self) -> Tuple[int, int, int, int]:
+        """
+        Prostokąt otaczający (x, y, width, height).
+        """
+        return self.x, self.y, self.width, self.height
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        """
+        Środek prostokąta otaczającego (x, y).
+        """
+        return self.x + self.width // 2, self.y + self.height // 2
+
+    def moved(self, dx: int, dy: int) -> 'Word':
+        """
+        Zwraca kopię słowa przesuniętą o (dx, dy).
+
+        Args:
+            dx: Przesunięcie w poziomie
+            dy: Przesunięcie w pionie
+
+        Returns:
+            Przesunięte słowo
+        """
+        return Word(self.text, self.x + dx, self.y + dy, self.width, self.height, self.confidence)
+
+    def __repr__(self) -> str:
+        return f"Word({self.text!r}, box={self.box}, confidence={self.confidence:.0f})"
+
+
+class OCREngine(ABC):
+    """
+    Bazowa klasa silnika OCR.
+    """
+
+    # Nazwa silnika (do logów i statystyk)
+    NAME = ""
+
+    def __init__(self, lang: str = DEFAULT_LANG, psm: int = DEFAULT_PSM):
+        """
+        Inicjalizacja silnika.
+
+        Args:
+            lang: Język rozpoznawania (kody tesseract, np. "pol+eng")
+            psm: Tryb segmentacji strony tesseract
+        """
+        self.lang = lang
+        self.psm = psm
+
+    @abstractmethod
+    def recognize(self, image: np.ndarray) -> str:
+        """
+        Rozpoznaje tekst na obrazie.
+
+        Args:
+            image: Obraz w skali szarości
+
+        Returns:
+            Rozpoznany tekst
+        """
+
+    def recognize_batch(self, images: Sequence[np.ndarray]) -> List[str]:
+        """
+        Rozpoznaje tekst na wielu obrazach.
+
+        Args:
+            images: Obrazy w skali szarości
+
+        Returns:
+            Lista rozpoznanych tekstów (w kolejności obrazów)
+        """
+        return [self.recognize(image) for image in images]
+
+    @abstractmethod
+    def recognize_words(self, image: np.ndarray) -> List[Word]:
+        """
+        Rozpoznaje słowa na obrazie wraz z ich położeniem.
+
+        Args:
+            image: Obraz w skali szarości
+
+        Returns:
+            Lista słów (współrzędne względem obrazu)
+        """
+
+    def recognize_words_batch(self, images: Sequence[np.ndarray]) -> List[List[Word]]:
+        """
+        Rozpoznaje słowa na wielu obrazach.
+
+        Args:
+            images: Obrazy w skali szarości
+
+        Returns:
+            Lista list słów (w kolejności obrazów, współrzędne względem każdego obrazu)
+        """
+        return [self.recognize_words(image) for image in images]
+
+    def close(self) -> None:
+        """
+        Zwalnia zasoby silnika.
+        """
+
+
+class TesserocrEngine(OCREngine):
+    """
+    Silnik OCR korzystający z API tesseract (tesserocr) utrzymywanego w pamięci.
+    Modele językowe są wczytywane raz, a obrazy przekazywane bez kopiowania na dysk.
+    """
+
+    NAME = "tesserocr"
+
+    def __init__(self, lang: str = DEFAULT_LANG, psm: int = DEFAULT_PSM):
+        super().__init__(lang, psm)
+        if tesserocr is None:
+            raise RuntimeError("Biblioteka tesserocr nie jest zainstalowana")
+        self._api = tesserocr.PyTessBaseAPI(lang=lang, psm=psm)
+        # API tesseract nie jest bezpieczne wątkowo
+        self._lock = threading.Lock()
+
+    def _set_image(self, image: np.ndarray) -> None:
+        """
+        Przekazuje obraz do API (wywoływane pod blokadą).
+        """
+        gray = np.ascontiguousarray(image)
+        self._api.SetImageBytes(gray.tobytes(), gray.shape[1], gray.shape[0], 1, gray.shape[1])
+
+    def recognize(self, image: np.ndarray) -> str:
+        with self._lock:
+            self._set_image(image)
+            return self._api.GetUTF8Text().strip()
+
+    def recognize_words(self, image: np.ndarray) -> List[Word]:
+        level = tesserocr.RIL.WORD
+        words = []
+        with self._lock:
+            self._set_image(image)
+            self._api.Recognize()
+            for item in tesserocr.iterate_level(self._api.GetIterator(), level):
+                text = (item.GetUTF8Text(level) or "").strip()
+                box = item.BoundingBox(level)
+                if text and box:
+                    left, top, right, bottom = box
+                    words.append(Word(text, left, top, right - left, bottom - top, item.Confidence(level)))
+        return words
+
+    def close(self) -> None:
+        with self._lock:
+            self._api.End()
+
+
+class PytesseractEngine(OCREngine):
+    """
+    Silnik OCR uruchamiający program tesseract przez pytesseract.
+    Każde wywołanie uruchamia nowy proces, dlatego partie regionów są
+    łączone w jeden obraz i rozpoznawane jednym wywołaniem. Tekst jest
+    zawsze składany z danych o słowach (image_to_data), więc pojedynczy
+    region i ten sam region w partii dają identyczny wynik.
+    """
+
+    NAME = "pytesseract"
+
+    def __init__(self, lang: str = DEFAULT_LANG, psm: int = DEFAULT_PSM):
+        super().__init__(lang, psm)
+        if pytesseract is None:
+            raise RuntimeError("Biblioteka pytesseract nie jest zainstalowana")
+
+    def _data(self, image: np.ndarray) -> Dict[str, list]:
+        """
+        Uruchamia tesseract i zwraca dane o słowach (image_to_data).
+        """
+        return pytesseract.image_to_data(image, lang=self.lang, config=f"--psm {self.psm}",
+                                         output_type=pytesseract.Output.DICT)
+
+    @staticmethod
+    def _split(data: Dict[str, list], offsets: List[int]) -> List[Optional[int]]:
+        """
+        Przypisuje słowa z obrazu zbiorczego do regionów według położenia środka.
+
+        Returns:
+            Indeks regionu dla każdego wpisu danych (None dla wpisów bez tekstu)
+        """
+        regions: List[Optional[int]] = []
+        for index, word in enumerate(data["text"]):
+            if not word.strip():
+                regions.append(None)
+                continue
+            center = data["top"][index] + data["height"][index] / 2
+            regions.append(max(0, bisect.bisect_right(offsets, center) - 1))
+        return regions
+
+    @staticmethod
+    def _word(data: Dict[str, list], index: int, dx: int = 0, dy: int = 0) -> Word:
+        """
+        Tworzy słowo z wpisu danych, przesunięte o (dx, dy).
+        """
+        return Word(data["text"][index].strip(), data["left"][index] + dx, data["top"][index] + dy,
+                    data["width"][index], data["height"][index], float(data["conf"][index]))
+
+    @staticmethod
+    def _text(data: Dict[str, list], regions: List[Optional[int]], count: int) -> List[str]:
+        """
+        Składa tekst regionów ze słów: słowa jednej linii rozdzielone spacją, linie znakiem nowej linii.
+
+        Args:
+            data: Dane o słowach (image_to_data)
+            regions: Indeks regionu dla każdego wpisu danych (None dla wpisów bez tekstu)
+            count: Liczba regionów
+
+        Returns:
+            Lista tekstów (w kolejności regionów)
+        """
+        lines: List[Dict[Hashable, List[str]]] = [{} for _ in range(count)]
+        for index, region in enumerate(regions):
+            if region is None:
+                continue
+            line = (data["block_num"][index], data["par_num"][index], data["line_num"][index])
+            lines[region].setdefault(line, []).append(data["text"][index].strip())
+
+        return ["\n".join(" ".join(words) for words in region_lines.values()) for region_lines in lines]
+
+    def recognize(self, image: np.ndarray) -> str:
+        data = self._data(image)
+        return self._text(data, [0 if word.strip() else None for word in data["text"]], 1)[0]
+
+    def recognize_batch(self, images: Sequence[np.ndarray]) -> List[str]:
+        if len(images) < 2:
+            return [self.recognize(image) for image in images]
+
+        canvas, offsets = _stack(images)
+        data = self._data(canvas)
+        return self._text(data, self._split(data, offsets), len(images))
+
+    def recognize_words(self, image: np.ndarray) -> List[Word]:
+        data = self._data(image)
+        return [self._word(data, index) for index, word in enumerate(data["text"]) if word.strip()]
+
+    def recognize_words_batch(self, images: Sequence[np.ndarray]) -> List[List[Word]]:
+        if len(images) < 2:
+            return [self.recognize_words(image) for image in images]
+
+        canvas, offsets = _stack(images)
+        data = self._data(canvas)
+
+        words: List[List[Word]] = [[] for _ in images]
+        for index, region in enumerate(self._split(data, offsets)):
+            if region is not None:
+                words[region].append(self._word(data, index, -BATCH_GAP, -offsets[region]))
+        return words
+
+
+def create_ocr_engine(name: str = "auto", lang: str = DEFAULT_LANG, psm: int = DEFAULT_PSM) -> OCREngine:
+    """
+    Tworzy silnik OCR.
+
+    Args:
+        name: Nazwa silnika (jeden z OCR_ENGINES); "auto" wybiera tesserocr, a przy jego
+              braku pytesseract
+        lang: Język rozpoznawania (kody tesseract, np. "pol+eng")
+        psm: Tryb segmentacji strony tesseract
+
+    Returns:
+        Instancja silnika OCR
+
+    Raises:
+        ValueError: Jeśli nazwa silnika jest nieznana
+        RuntimeError: Jeśli żadna biblioteka OCR nie jest zainstalowana
+    """
+    if name not in OCR_ENGINES:
+        raise ValueError(f"Nieznany silnik OCR: {name} (dostępne: {', '.join(OCR_ENGINES)})")
+
+    if name in ("auto", "tesserocr") and tesserocr is not None:
+        return TesserocrEngine(lang, psm)
+    if name == "tesserocr":
+        logger.warning("Biblioteka tesserocr nie jest zainstalowana - używam pytesseract")
+    return PytesseractEngine(lang, psm)
+
+
+def set_tesseract_cmd(path: str) -> None:
+    """
+    Ustawia ścieżkę do programu tesseract używanego przez pytesseract.
+
+    Args:
+        path: Ścieżka do programu tesseract
+    """
+    if pytesseract is not None:
+        pytesseract.pytesseract.tesseract_cmd = path
+
+
+class OCRService:
+    """
+    Rozpoznawanie tekstu z pamięcią wyników według zawartości regionu.
+    Silnik jest tworzony przy pierwszym rozpoznawaniu i utrzymywany do zamknięcia usługi.
+    """
+
+    def __init__(self, engine: Optional[OCREngine] = None, engine_name: str = "auto",
+                 lang: str = DEFAULT_LANG, psm: int = DEFAULT_PSM,
+                 max_entries: int = DEFAULT_CACHE_ENTRIES):
+        """
+        Inicjalizacja usługi.
+
+        Args:
+            engine: Silnik OCR (opcjonalnie, domyślnie tworzony przez create_ocr_engine)
+            engine_name: Nazwa silnika tworzonego przy pierwszym użyciu (jeden z OCR_ENGINES)
+            lang: Język rozpoznawania (kody tesseract, np. "pol+eng")
+            psm: Tryb segmentacji strony tesseract
+            max_entries: Maksymalna liczba zapamiętanych wyników
+        """
+        self._engine = engine
+        self.engine_name = engine_name
+        self.lang = lang
+        self.psm = psm
+        self.max_entries = max_entries
+        self._results: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.engine_calls = 0
+
+    @property
+    def engine(self) -> OCREngine:
+        """
+        Silnik OCR (tworzony przy pierwszym użyciu).
+        """
+        with self._lock:
+            if self._engine is None:
+                self._engine = create_ocr_engine(self.engine_name, self.lang, self.psm)
+                logger.debug(f"Uruchomiono silnik OCR: {self._engine.NAME}")
+            return self._engine
+
+    @staticmethod
+    def _key(gray: np.ndarray, kind: str) -> Hashable:
+        """
+        Zwraca klucz wyniku: rodzaj wyniku, rozmiar i skrót zawartości obrazu.
+        """
+        return kind, gray.shape, hashlib.blake2b(np.ascontiguousarray(gray).data, digest_size=16).digest()
+
+    def _recognize_cached(self, images: Sequence[np.ndarray], kind: str,
+                          recognize: Callable[[OCREngine, List[np.ndarray]], list]) -> list:
+        """
+        Zwraca wyniki z pamięci, a brakujące rozpoznaje jednym wywołaniem silnika.
+
+        Args:
+            images: Obrazy w skali szarości, BGR lub BGRA
+            kind: Rodzaj wyniku (część klucza pamięci)
+            recognize: Funkcja rozpoznająca partię obrazów danym silnikiem
+
+        Returns:
+            Lista wyników (w kolejności obrazów)
+        """
+        grays = [_to_gray(image) for image in images]
+        keys = [self._key(gray, kind) for gray in grays]
+
+        results: List[Any] = []
+        missing: Dict[Hashable, np.ndarray] = {}
+        with self._lock:
+            for key, gray in zip(keys, grays):
+                result = self._results.get(key)
+                if result is not None:
+                    self._results.move_to_end(key)
+                    self.hits += 1
+                elif key not in missing:
+                    self.misses += 1
+                    missing[key] = gray
+                results.append(result)
+
+        if missing:
+            recognized = dict(zip(missing.keys(), recognize(self.engine, list(missing.values()))))
+            with self._lock:
+                self.engine_calls += 1
+                for key, result in recognized.items():
+                    self._results[key] = result
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+            results = [recognized[key] if result is None else result for key, result in zip(keys, results)]
+
+        return results
+
+    def read_many(self, images: Sequence[np.ndarray]) -> List[str]:
+        """
+        Rozpoznaje tekst na wielu obrazach (brakujące wyniki jednym wywołaniem silnika).
+
+        Args:
+            images: Obrazy w skali szarości, BGR lub BGRA
+
+        Returns:
+            Lista rozpoznanych tekstów (w kolejności obrazów)
+        """
+        return self._recognize_cached(images, "text", lambda engine, grays: engine.recognize_batch(grays))
+
+    def read_words_many(self, images: Sequence[np.ndarray]) -> List[List[Word]]:
+        """
+        Rozpoznaje słowa z położeniem na wielu obrazach (brakujące wyniki jednym wywołaniem silnika).
+
+        Args:
+            images: Obrazy w skali szarości, BGR lub BGRA
+
+        Returns:
+            Lista list słów (w kolejności obrazów, współrzędne względem każdego obrazu)
+        """
+        return self._recognize_cached(images, "words", lambda engine, grays: engine.recognize_words_batch(grays))
+
+    def read(self, image: np.ndarray) -> str:
+        """
+        Rozpoznaje tekst na obrazie.
+
+        Args:
+            image: Obraz w skali szarości, BGR lub BGRA
+
+        Returns:
+            Rozpoznany tekst
+        """
+        return self.read_many([image])[0]
+
+    def read_regions(self, regions: Sequence[Optional[Tuple[int, int, int, int]]]) -> List[str]:
+        """
+        Rozpoznaje tekst w regionach ekranu (jeden zrzut i jedna partia dla wszystkich regionów).
+
+        Args:
+            regions: Regiony ekranu (x, y, width, height); None oznacza cały ekran
+
+        Returns:
+            Lista rozpoznanych tekstów (w kolejności regionów)
+        """
+        frame = get_frame()
+        return self.read_many([frame.crop(region).gray for region in regions])
+
+    def clear(self) -> None:
+        """
+        Usuwa zapamiętane wyniki.
+        """
+        with self._lock:
+            self._results.clear()
+
+    def close(self) -> None:
+        """
+        Zamyka silnik OCR (kolejne rozpoznawanie uruchomi go ponownie).
+        """
+        with self._lock:
+            engine, self._engine = self._engine, None
+        if engine is not None:
+            engine.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Zwraca statystyki usługi.
+
+        Returns:
+            Słownik z liczbą zapamiętanych wyników, trafień, chybień i wywołań silnika
+        """
+        with self._lock:
+            return {
+                "entries": len(self._results),
+                "hits": self.hits,
+                "misses": self.misses,
+                "engine_calls": self.engine_calls
+            }
+
+
+# Globalna usługa OCR (współdzielona w procesie)
+_ocr_service = OCRService()
+
+
+def get_ocr_service() -> OCRService:
+    """
+    Zwraca globalną usługę OCR.
+
+    Returns:
+        Instancja OCRService współdzielona w procesie
+    """
+    return _ocr_service
+
+
+def read_text(region: Tuple[int, int, int, int] = None) -> Optional[str]:
+    """
+    Odczytuje tekst z regionu ekranu.
+
+    Args:
+        region: Region ekranu (x, y, width, height); None oznacza cały ekran
+
+    Returns:
+        Rozpoznany tekst lub None w przypadku błędu
+    """
+    try:
+        text = get_ocr_service().read_regions([region])[0]
+        logger.info(f"Odczytano tekst z obszaru {region}: {text!r}")
+        return text
+    except Exception as e:
+        logger.error(f"Błąd podczas odczytu tekstu z ekranu: {str(e)}")
+        return None
+
+
+def read_texts(regions: Sequence[Optional[Tuple[int, int, int, int]]]) -> Optional[List[str]]:
+    """
+    Odczytuje tekst z wielu regionów ekranu jednym wywołaniem silnika OCR.
+
+    Args:
+        regions: Regiony ekranu (x, y, width, height)
+
+    Returns:
+        Lista rozpoznanych tekstów (w kolejności regionów) lub None w przypadku błędu
+    """
+    try:
+        return get_ocr_service().read_regions(regions)
+    except Exception as e:
+        logger.error(f"Błąd podczas odczytu tekstu z ekranu: {str(e)}")
+        return None
@@ -0,0 +1,354 @@
+# Skróty percepcyjne obrazów
+"""
+perceptual_hash.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Skróty percepcyjne (aHash, dHash, pHash) i indeks znanych stanów ekranu.
+Skrót to 64 bity opisujące zgrubny wygląd obrazu, więc rozpoznanie, który
+ekran (strona, okno dialogowe) jest widoczny, sprowadza się do policzenia
+odległości Hamminga do skrótów zrzutów referencyjnych zamiast dopasowywania
+kolejnych dużych wzorców.
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import Frame
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Obsługiwane metody skrótu
+HASH_METHODS = ("ahash", "dhash", "phash")
+
+# Bok siatki skrótu (8 x 8 = 64 bity)
+HASH_SIZE = 8
+
+# Domyślna maksymalna odległość Hamminga, przy której stan uznajemy za rozpoznany (z 64 bitów)
+DEFAULT_MAX_DISTANCE = 10
+
+# Gęstość siatki pośredniej przy pomniejszaniu dużych obrazów (względem siatki skrótu)
+SHRINK_OVERSAMPLING = 8
+
+# Rozszerzenia plików zrzutów referencyjnych
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+
+
+def _shrink(gray: np.ndarray, width: int, height: int) -> np.ndarray:
+    """
+    Pomniejsza obraz do siatki skrótu, uśredniając bloki.
+
+    Duże obrazy (np. cały ekran) są najpierw szybko próbkowane do siatki
+    SHRINK_OVERSAMPLING razy gęstszej, bo uśrednianie pełnej klatki wprost
+    do kilku pikseli trwa milisekundy.
+
+    Args:
+        gray: Obraz w skali szarości
+        width: Szerokość siatki
+        height: Wysokość siatki
+
+    Returns:
+        Pomniejszony obraz
+    """
+    oversampled = (width * SHRINK_OVERSAMPLING, height * SHRINK_OVERSAMPLING)
+    if gray.shape[1] > oversampled[0] and gray.shape[0] > oversampled[1]:
+        gray = cv2.resize(gray, oversampled, interpolation=cv2.INTER_LINEAR)
+    return cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+
+
+def _bits(gray: np.ndarray, method: str, hash_size: int) -> np.ndarray:
+    """
+    Wyznacza bity skrótu obrazu.
+
+    Args:
+        gray: Obraz w skali szarości
+        method: Metoda skrótu (jedna z HASH_METHODS)
+        hash_size: Bok siatki skrótu
+
+    Returns:
+        Tablica wartości logicznych (hash_size x hash_size)
+
+    Raises:
+        ValueError: Jeśli metoda jest nieznana
+    """
+    if method == "ahash":
+        # Jasność bloków w porównaniu ze średnią
+        small = _shrink(gray, hash_size, hash_size)
+        return small > small.mean()
+    if method == "dhash":
+        # Kierunek zmiany jasności między sąsiednimi blokami
+        small = _shrink(gray, hash_size + 1, hash_size)
+        return small[:, 1:] > small[:, :-1]
+    if method == "phash":
+        # Niskie częstotliwości DCT w porównaniu z medianą (bez składowej stałej)
+        side = hash_size * 4
+        small = _shrink(gray, side, side).astype(np.float32)
+        low = cv2.dct(small)[:hash_size, :hash_size]
+        return low > np.median(low.flatten()[1:])
+    raise ValueError(f"Nieznana metoda skrótu: {method} (dostępne: {', '.join(HASH_METHODS)})")
+
+
+def image_hash(gray: np.ndarray, method: str = "dhash", hash_size: int = HASH_SIZE) -> int:
+    """
+    Oblicza skrót percepcyjny obrazu.
+
+    Args:
+        gray: Obraz w skali szarości
+        method: Metoda skrótu: "ahash" (średnia jasność), "dhash" (gradienty, domyślna)
+                lub "phash" (DCT, najbardziej odporny na kompresję i drobne zmiany)
+        hash_size: Bok siatki skrótu (skrót ma hash_size^2 bitów)
+
+    Returns:
+        Skrót jako liczba całkowita
+
+    Raises:
+        ValueError: Jeśli metoda jest nieznana
+    """
+    return int.from_bytes(np.packbits(_bits(gray, method, hash_size)).tobytes(), "big")
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Zwraca odległość Hamminga między skrótami (liczbę różniących się bitów).
+
+    Args:
+        first: Pierwszy skrót
+        second: Drugi skrót
+
+    Returns:
+        Liczba różniących się bitów
+    """
+    return bin(first ^ second).count("1")
+
+
+def hash_similarity(first: int, second: int, hash_size: int = HASH_SIZE) -> float:
+    """
+    Zwraca podobieństwo skrótów.
+
+    Args:
+        first: Pierwszy skrót
+        second: Drugi skrót
+        hash_size: Bok siatki skrótu
+
+    Returns:
+        Podobieństwo (0.0 - 1.0) gdzie 1.0 oznacza identyczne skróty
+    """
+    return 1.0 - hamming_distance(first, second) / float(hash_size * hash_size)
+
+
+class ScreenStateIndex:
+    """
+    Indeks znanych stanów ekranu (nazwa -> skrót zrzutu referencyjnego).
+    Stan może opisywać cały ekran lub wybrany region (np. nagłówek okna).
+    """
+
+    def __init__(self, method: str = "dhash", max_distance: int = DEFAULT_MAX_DISTANCE,
+                 hash_size: int = HASH_SIZE):
+        """
+        Inicjalizacja indeksu.
+
+        Args:
+            method: Metoda skrótu (jedna z HASH_METHODS)
+            max_distance: Maksymalna odległość Hamminga, przy której stan uznajemy za rozpoznany
+            hash_size: Bok siatki skrótu
+
+        Raises:
+            ValueError: Jeśli metoda jest nieznana
+        """
+        if method not in HASH_METHODS:
+            raise ValueError(f"Nieznana metoda skrótu: {method} (dostępne: {', '.join(HASH_METHODS)})")
+        self.method = method
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self._names: List[str] = []
+        self._regions: List[Optional[Tuple[int, int, int, int]]] = []
+        # Skróty jako wiersze bajtów (porównywane wektorowo)
+        self._hashes = np.zeros((0, (hash_size * hash_size + 7) // 8), dtype=np.uint8)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _packed(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Zwraca skrót obrazu jako wiersz bajtów.
+        """
+        return np.packbits(_bits(gray, self.method, self.hash_size))
+
+    def add(self, name: str, image: np.ndarray, region: Tuple[int, int, int, int] = None) -> None:
+        """
+        Dodaje stan do indeksu.
+
+        Args:
+            name: Nazwa stanu
+            image: Zrzut referencyjny całego ekranu (BGR lub w skali szarości)
+            region: Region ekranu (x, y, width, height) opisujący stan (opcjonalnie, domyślnie cały ekran)
+        """
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if region is not None:
+            x, y, width, height = region
+            gray = gray[y:y + height, x:x + width]
+
+        packed = self._packed(gray)
+        with self._lock:
+            self._names.append(name)
+            self._regions.append(region)
+            self._hashes = np.vstack([self._hashes, packed])
+
+    def load_directory(self, directory: str,
+                       regions: Optional[Dict[str, Tuple[int, int, int, int]]] = None) -> int:
+        """
+        Dodaje stany ze zrzutów referencyjnych w katalogu (nazwa stanu = nazwa pliku bez rozszerzenia).
+
+        Args:
+            directory: Katalog ze zrzutami referencyjnymi
+            regions: Regiony opisujące wybrane stany (nazwa stanu -> (x, y, width, height))
+
+        Returns:
+            Liczba dodanych stanów
+        """
+        regions = regions or {}
+        added = 0
+        for file_name in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(file_name)
+            if extension.lower() not in IMAGE_EXTENSIONS:
+                continue
+
+            image = cv2.imread(os.path.join(directory, file_name), cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                logger.warning(f"Nie udało się wczytać zrzutu referencyjnego: {file_name}")
+                continue
+
+            self.add(name, image, regions.get(name))
+            added += 1
+
+        logger.info(f"Wczytano {added} stanów ekranu z katalogu {directory}")
+        return added
+
+    def rank(self, frame: Frame) -> List[Tuple[str, int]]:
+        """
+        Zwraca stany uporządkowane według odległości od klatki.
+
+        Args:
+            frame: Klatka ekranu
+
+        Returns:
+            Lista krotek (nazwa stanu, odległość Hamminga), od najbliższego
+        """
+        with self._lock:
+            names, regions, hashes = list(self._names), list(self._regions), self._hashes
+
+        if not names:
+            return []
+
+        # Każdy region klatki jest skracany tylko raz
+        frame_hashes: Dict[Optional[Tuple[int, int, int, int]], np.ndarray] = {}
+        rows = []
+        for region in regions:
+            if region not in frame_hashes:
+                frame_hashes[region] = self._packed(frame.crop(region).gray)
+            rows.append(frame_hashes[region])
+
+        distances = np.unpackbits(np.bitwise_xor(hashes, np.array(rows)), axis=1).sum(axis=1)
+        order = np.argsort(distances, kind="stable")
+        return [(names[index], int(distances[index])) for index in order]
+
+    def classify(self, frame: Frame, max_distance: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """
+        Rozpoznaje stan ekranu.
+
+        Args:
+            frame: Klatka ekranu
+            max_distance: Maksymalna odległość Hamminga (opcjonalnie, domyślnie ustawienie indeksu)
+
+        Returns:
+            Krotka (nazwa stanu, odległość Hamminga) najbliższego stanu lub None, jeśli
+            żaden stan nie jest bliżej niż max_distance
+        """
+        max_distance = self.max_distance if max_distance is None else max_distance
+        ranking = self.rank(frame)
+        if not ranking or ranking[0][1] > max_distance:
+            return None
+        return ranking[0]
+
+    def clear(self) -> None:
+        """
+        Usuwa wszystkie stany z indeksu.
+        """
+        with self._lock:
+            self._names = []
+            self._regions = []
+            self._hashes = self._hashes[:0]
+
+
+# Globalny indeks stanów ekranu (współdzielony w procesie)
+_screen_state_index = ScreenStateIndex()
+
+# Indeksy wczytane z katalogów ((ścieżka, metoda) -> (sygnatura zawartości katalogu, indeks))
+_directory_indexes: Dict[Tuple[str, str], Tuple[Tuple, ScreenStateIndex]] = {}
+_directory_lock = threading.Lock()
+
+
+def get_screen_state_index() -> ScreenStateIndex:
+    """
+    Zwraca globalny indeks stanów ekranu.
+
+    Returns:
+        Instancja ScreenStateIndex współdzielona w procesie
+    """
+    return _screen_state_index
+
+
+def _directory_signature(directory: str) -> Tuple:
+    """
+    Zwraca sygnaturę zawartości katalogu zrzutów referencyjnych.
+    Obejmuje czas modyfikacji katalogu oraz nazwę, czas modyfikacji i rozmiar
+    każdego zrzutu - nadpisanie pliku w miejscu nie zmienia czasu katalogu.
+
+    Args:
+        directory: Katalog ze zrzutami referencyjnymi
+
+    Returns:
+        Krotka porównywalna między wywołaniami
+    """
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                stat = entry.stat()
+                files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return os.stat(directory).st_mtime_ns, tuple(sorted(files))
+
+
+def load_screen_states(directory: str, method: str = "dhash") -> ScreenStateIndex:
+    """
+    Zwraca indeks stanów ekranu wczytany z katalogu zrzutów referencyjnych.
+    Indeks jest budowany raz i odświeżany po zmianie zawartości katalogu.
+
+    Args:
+        directory: Katalog ze zrzutami referencyjnymi (nazwa stanu = nazwa pliku)
+        method: Metoda skrótu (jedna z HASH_METHODS)
+
+    Returns:
+        Indeks stanów ekranu
+    """
+    key = (os.path.abspath(directory), method)
+    signature = _directory_signature(directory)
+    with _directory_lock:
+        cached = _directory_indexes.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        index = ScreenStateIndex(method)
+        index.load_directory(directory)
+        _directory_indexes[key] = (signature, index)
+        return index
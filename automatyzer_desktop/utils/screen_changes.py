@@ -0,0 +1,266 @@
+# Wykrywanie zmian na ekranie
+"""
+screen_changes.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Wykrywanie zmian na ekranie i śledzenie zmienionych prostokątów.
+Detektor przechowuje pomniejszoną klatkę odniesienia (średnie bloków
+block_size x block_size), porównuje z nią kolejne klatki i zwraca
+prostokąty ekranu, w których coś się zmieniło. Pozwala to ograniczyć
+dopasowywanie wzorców do zmienionych obszarów oraz czekać, aż ekran
+przestanie się zmieniać, zamiast usypiać wątek na stały czas.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import Frame, get_frame, invalidate_frames
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Domyślny rozmiar bloku porównywanego jako całość (w pikselach)
+DEFAULT_BLOCK_SIZE = 8
+
+# Minimalna zmiana średniej jasności bloku (0-255) uznawana za zmianę ekranu
+DEFAULT_THRESHOLD = 10
+
+# Maksymalna liczba zgłaszanych prostokątów (przy większej - jeden prostokąt obejmujący)
+MAX_DIRTY_RECTS = 8
+
+# Domyślna liczba przechowywanych klatek odniesienia (najdawniej użyte są usuwane)
+DEFAULT_MAX_KEYS = 64
+
+
+def block_means(frame: Frame, block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+    """
+    Zwraca średnią jasność bloków klatki.
+
+    Args:
+        frame: Klatka ekranu
+        block_size: Rozmiar bloku (w pikselach)
+
+    Returns:
+        Tablica średnich jasności bloków (wysokość/block_size x szerokość/block_size)
+    """
+    width = max(1, frame.width // block_size)
+    height = max(1, frame.height // block_size)
+    return cv2.resize(frame.gray, (width, height), interpolation=cv2.INTER_AREA)
+
+
+def dirty_rectangles(previous: np.ndarray, current: np.ndarray, block_size: int = DEFAULT_BLOCK_SIZE,
+                     threshold: int = DEFAULT_THRESHOLD, origin: Tuple[int, int] = (0, 0),
+                     max_rects: int = MAX_DIRTY_RECTS) -> List[Tuple[int, int, int, int]]:
+    """
+    Porównuje blokowo dwie pomniejszone klatki i zwraca zmienione prostokąty.
+
+    Args:
+        previous: Średnie bloków klatki odniesienia
+        current: Średnie bloków bieżącej klatki
+        block_size: Rozmiar bloku (w pikselach)
+        threshold: Minimalna zmiana średniej jasności bloku
+        origin: Położenie klatek na ekranie (x, y)
+        max_rects: Maksymalna liczba zwracanych prostokątów
+
+    Returns:
+        Lista prostokątów (x, y, width, height) we współrzędnych ekranu; pusta, gdy nic się nie zmieniło
+    """
+    changed = np.abs(previous.astype(np.int16) - current.astype(np.int16)) > threshold
+    if not changed.any():
+        return []
+
+    # Sąsiadujące zmienione bloki łączone w prostokąty
+    _, _, boxes, _ = cv2.connectedComponentsWithStats(changed.astype(np.uint8), connectivity=8)
+    boxes = boxes[1:, :4] * block_size
+    if len(boxes) > max_rects:
+        left, top = boxes[:, 0].min(), boxes[:, 1].min()
+        right, bottom = (boxes[:, 0] + boxes[:, 2]).max(), (boxes[:, 1] + boxes[:, 3]).max()
+        boxes = np.array([[left, top, right - left, bottom - top]])
+
+    return [(origin[0] + x, origin[1] + y, width, height) for x, y, width, height in boxes.tolist()]
+
+
+def intersects(first: Tuple[int, int, int, int], second: Tuple[int, int, int, int]) -> bool:
+    """
+    Sprawdza, czy dwa prostokąty (x, y, width, height) mają część wspólną.
+
+    Args:
+        first: Pierwszy prostokąt
+        second: Drugi prostokąt
+
+    Returns:
+        True jeśli prostokąty się przecinają
+    """
+    return (first[0] < second[0] + second[2] and second[0] < first[0] + first[2] and
+            first[1] < second[1] + second[3] and second[1] < first[1] + first[3])
+
+
+class ChangeDetector:
+    """
+    Śledzi zmiany ekranu względem klatek odniesienia.
+    Każdy klucz (np. ścieżka wzorca) ma własną klatkę odniesienia, więc
+    niezależni odbiorcy widzą zmiany od swojego ostatniego sprawdzenia.
+    Liczba klatek odniesienia jest ograniczona (LRU) - odbiorca, którego
+    klatka została usunięta, dostaje przy następnym sprawdzeniu None.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE, threshold: int = DEFAULT_THRESHOLD,
+                 max_rects: int = MAX_DIRTY_RECTS, max_keys: int = DEFAULT_MAX_KEYS):
+        """
+        Inicjalizacja detektora.
+
+        Args:
+            block_size: Rozmiar bloku porównywanego jako całość (w pikselach)
+            threshold: Minimalna zmiana średniej jasności bloku (0-255)
+            max_rects: Maksymalna liczba zgłaszanych prostokątów
+            max_keys: Maksymalna liczba przechowywanych klatek odniesienia
+        """
+        self.block_size = block_size
+        self.threshold = threshold
+        self.max_rects = max_rects
+        self.max_keys = max_keys
+        self._references: "OrderedDict[Hashable, Tuple[np.ndarray, Tuple[int, int], Tuple[int, int]]]" = \
+            OrderedDict()
+        self._lock = threading.Lock()
+
+    def _store(self, key: Hashable, reference: Tuple[np.ndarray, Tuple[int, int], Tuple[int, int]]) -> None:
+        """
+        Zapisuje klatkę odniesienia, usuwając najdawniej użyte ponad limit (wywoływane pod blokadą).
+        """
+        self._references[key] = reference
+        self._references.move_to_end(key)
+        while len(self._references) > max(self.max_keys, 1):
+            self._references.popitem(last=False)
+
+    def reset(self, frame: Frame, key: Hashable = None) -> None:
+        """
+        Ustawia klatkę odniesienia.
+
+        Args:
+            frame: Klatka ekranu
+            key: Klucz odbiorcy (opcjonalnie)
+        """
+        reference = (block_means(frame, self.block_size), frame.origin, (frame.width, frame.height))
+        with self._lock:
+            self._store(key, reference)
+
+    def changes(self, frame: Frame, key: Hashable = None,
+                update: bool = True) -> Optional[List[Tuple[int, int, int, int]]]:
+        """
+        Zwraca prostokąty zmienione od klatki odniesienia.
+
+        Args:
+            frame: Bieżąca klatka ekranu
+            key: Klucz odbiorcy (opcjonalnie)
+            update: Czy bieżąca klatka ma zostać nową klatką odniesienia
+
+        Returns:
+            Lista prostokątów (x, y, width, height) we współrzędnych ekranu (pusta, gdy nic się
+            nie zmieniło) lub None, gdy brak klatki odniesienia (zmiany są nieznane)
+        """
+        current = block_means(frame, self.block_size)
+        with self._lock:
+            reference = self._references.get(key)
+            if update:
+                self._store(key, (current, frame.origin, (frame.width, frame.height)))
+            elif reference is not None:
+                self._references.move_to_end(key)
+
+        if reference is None:
+            return None
+
+        previous, origin, size = reference
+        if origin != frame.origin or size != (frame.width, frame.height):
+            # Inny obszar ekranu niż poprzednio - traktujemy całą klatkę jako zmienioną
+            return [(frame.origin[0], frame.origin[1], frame.width, frame.height)]
+
+        return dirty_rectangles(previous, current, self.block_size, self.threshold, frame.origin, self.max_rects)
+
+    def forget(self, key: Hashable = None, all_keys: bool = False) -> None:
+        """
+        Usuwa klatkę odniesienia.
+
+        Args:
+            key: Klucz odbiorcy (opcjonalnie)
+            all_keys: Czy usunąć klatki odniesienia wszystkich odbiorców
+        """
+        with self._lock:
+            if all_keys:
+                self._references.clear()
+            else:
+                self._references.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._references)
+
+
+# Globalny detektor zmian (współdzielony w procesie)
+_change_detector = ChangeDetector()
+
+
+def get_change_detector() -> ChangeDetector:
+    """
+    Zwraca globalny detektor zmian ekranu.
+
+    Returns:
+        Instancja ChangeDetector współdzielona w procesie
+    """
+    return _change_detector
+
+
+def wait_for_screen_settled(settle_time: float = 0.3, timeout: float = 5.0,
+                            region: Tuple[int, int, int, int] = None,
+                            interval: float = 0.05, reaction_time: float = 0.0) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Czeka, aż ekran przestanie się zmieniać.
+
+    Po akcji interfejs zwykle reaguje z opóźnieniem - dopóki nie zaobserwowano żadnej
+    zmiany, oczekiwanie trwa co najmniej reaction_time. Po pierwszej zmianie kończy się,
+    gdy ekran nie zmienia się przez settle_time.
+
+    Args:
+        settle_time: Czas bez zmian, po którym ekran uznajemy za ustabilizowany (w sekundach)
+        timeout: Maksymalny czas oczekiwania (w sekundach)
+        region: Region ekranu do obserwowania (x, y, width, height)
+        interval: Odstęp między zrzutami ekranu (w sekundach)
+        reaction_time: Minimalny czas oczekiwania na pierwszą zmianę ekranu (w sekundach)
+
+    Returns:
+        Krotka (ustabilizowany, statystyki): True jeśli ekran nie zmieniał się przez settle_time
+        przed upływem timeout oraz słownik z liczbą zrzutów ("frames"), klatek ze zmianami
+        ("changed") i czasem oczekiwania ("elapsed")
+    """
+    detector = ChangeDetector()
+    stats: Dict[str, Any] = {"frames": 0, "changed": 0, "elapsed": 0.0}
+    start = time.monotonic()
+    last_change = start
+
+    while True:
+        # Wymuś nowy zrzut zamiast klatki współdzielonej
+        invalidate_frames()
+        frame = get_frame(region)
+        stats["frames"] += 1
+
+        now = time.monotonic()
+        if detector.changes(frame):
+            stats["changed"] += 1
+            last_change = now
+
+        stats["elapsed"] = now - start
+        if now - last_change >= settle_time and (stats["changed"] or now - start >= reaction_time):
+            return True, stats
+        if now - start >= timeout:
+            logger.info(f"Ekran nie ustabilizował się w ciągu {timeout}s (zrzuty: {stats['frames']})")
+            return False, stats
+
+        time.sleep(min(interval, max(0.0, timeout - (now - start))))
@@ -0,0 +1,247 @@
+# Zapis zrzutów ekranu w tle
+"""
+screenshot_writer.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pula wątków kodujących i zapisujących zrzuty ekranu w tle.
+Kompresja PNG dużej klatki (np. 4K) trwa ponad 100 ms, więc zrzuty
+diagnostyczne są kolejkowane, a wątek automatyzacji od razu dostaje
+ścieżkę docelową i może wykonywać kolejne akcje.
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Obsługiwane formaty zapisu
+SCREENSHOT_FORMATS = ("png", "webp", "jpg")
+
+# Domyślny poziom kompresji PNG (0-9; niskie poziomy są wielokrotnie szybsze)
+DEFAULT_COMPRESSION = 1
+
+# Domyślna jakość WebP/JPEG (0-100; dla WebP powyżej 100 oznacza zapis bezstratny)
+DEFAULT_QUALITY = 90
+
+# Domyślna liczba wątków kodujących
+DEFAULT_WORKERS = 2
+
+# Domyślny rozmiar kolejki (pełna kolejka wstrzymuje zlecającego zamiast zużywać pamięć)
+DEFAULT_MAX_QUEUE = 8
+
+
+def encode_params(image_format: str, compression: int = DEFAULT_COMPRESSION,
+                  quality: int = DEFAULT_QUALITY) -> List[int]:
+    """
+    Zwraca parametry cv2.imwrite dla formatu zapisu.
+
+    Args:
+        image_format: Format zapisu (jeden z SCREENSHOT_FORMATS)
+        compression: Poziom kompresji PNG (0-9)
+        quality: Jakość WebP/JPEG (0-100)
+
+    Returns:
+        Lista parametrów dla cv2.imwrite
+
+    Raises:
+        ValueError: Jeśli format jest nieznany
+    """
+    if image_format == "png":
+        return [cv2.IMWRITE_PNG_COMPRESSION, int(compression)]
+    if image_format == "webp":
+        return [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+    if image_format == "jpg":
+        return [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+    raise ValueError(f"Nieznany format zrzutu ekranu: {image_format}")
+
+
+class ScreenshotWriter:
+    """
+    Pula wątków zapisujących zrzuty ekranu z ograniczoną kolejką.
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE,
+                 image_format: str = "png", compression: int = DEFAULT_COMPRESSION,
+                 quality: int = DEFAULT_QUALITY):
+        """
+        Inicjalizacja puli.
+
+        Args:
+            workers: Liczba wątków kodujących
+            max_queue: Maksymalna liczba zrzutów oczekujących na zapis
+            image_format: Domyślny format zapisu (jeden z SCREENSHOT_FORMATS)
+            compression: Domyślny poziom kompresji PNG (0-9)
+            quality: Domyślna jakość WebP/JPEG (0-100)
+        """
+        self.workers = max(1, workers)
+        self.image_format = image_format
+        self.compression = compression
+        self.quality = quality
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, str, List[int]]]]" = queue.Queue(max_queue)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.written = 0
+        self.failed = 0
+        self.encode_seconds = 0.0
+
+    def _start(self) -> None:
+        """
+        Uruchamia wątki kodujące (przy pierwszym zleceniu).
+        """
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"screenshot_writer_{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self) -> None:
+        """
+        Pętla wątku kodującego.
+        """
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                image, output_path, params = job
+                start = time.perf_counter()
+                ok = cv2.imwrite(output_path, image, params)
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.encode_seconds += elapsed
+                    if ok:
+                        self.written += 1
+                    else:
+                        self.failed += 1
+                if ok:
+                    logger.debug(f"Zapisano zrzut ekranu do pliku: {output_path} ({elapsed * 1000:.0f} ms)")
+                else:
+                    logger.error(f"Nie udało się zapisać zrzutu ekranu: {output_path}")
+            except Exception as e:
+                with self._lock:
+                    self.failed += 1
+                logger.error(f"Błąd podczas zapisu zrzutu ekranu: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, image: np.ndarray, output_path: Optional[str] = None, image_format: Optional[str] = None,
+               compression: Optional[int] = None, quality: Optional[int] = None) -> str:
+        """
+        Zleca zapis zrzutu ekranu i od razu zwraca ścieżkę docelową.
+
+        Obraz jest kopiowany, więc wywołujący może dalej używać (i nadpisywać) swojej tablicy.
+        Gdy kolejka jest pełna, wywołanie czeka na zwolnienie miejsca.
+
+        Args:
+            image: Obraz w formacie BGR
+            output_path: Ścieżka do pliku wyjściowego (opcjonalnie, domyślnie plik tymczasowy)
+            image_format: Format zapisu (domyślnie z rozszerzenia ścieżki lub ustawienie puli)
+            compression: Poziom kompresji PNG (0-9)
+            quality: Jakość WebP/JPEG (0-100)
+
+        Returns:
+            Ścieżka, pod którą zostanie zapisany zrzut
+
+        Raises:
+            ValueError: Jeśli format jest nieznany
+        """
+        if image_format is None and output_path is not None:
+            extension = os.path.splitext(output_path)[1].lower().lstrip(".")
+            extension = "jpg" if extension == "jpeg" else extension
+            if extension in SCREENSHOT_FORMATS:
+                image_format = extension
+        image_format = image_format or self.image_format
+
+        params = encode_params(image_format,
+                               self.compression if compression is None else compression,
+                               self.quality if quality is None else quality)
+
+        # Jeśli nie podano ścieżki, utwórz plik tymczasowy
+        if output_path is None:
+            fd, output_path = tempfile.mkstemp(suffix=f".{image_format}")
+            os.close(fd)
+
+        self._start()
+        self._queue.put((image.copy(), output_path, params))
+        return output_path
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Czeka na zapisanie wszystkich zleconych zrzutów.
+
+        Args:
+            timeout: Maksymalny czas oczekiwania w sekundach (None - bez limitu)
+
+        Returns:
+            True jeśli wszystkie zrzuty zostały zapisane, False po upływie czasu
+        """
+        if timeout is None:
+            self._queue.join()
+            return True
+
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self) -> None:
+        """
+        Zapisuje oczekujące zrzuty i zatrzymuje wątki kodujące.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Zwraca statystyki puli.
+
+        Returns:
+            Słownik z liczbą zapisanych i nieudanych zrzutów, długością kolejki
+            i łącznym czasem kodowania (w sekundach)
+        """
+        with self._lock:
+            return {
+                "written": self.written,
+                "failed": self.failed,
+                "pending": self._queue.unfinished_tasks,
+                "encode_seconds": self.encode_seconds
+            }
+
+
+# Globalna pula zapisu zrzutów (współdzielona w procesie)
+_screenshot_writer = ScreenshotWriter()
+
+# Zrzuty zlecone tuż przed zakończeniem programu też trafiają na dysk
+atexit.register(_screenshot_writer.close)
+
+
+def get_screenshot_writer() -> ScreenshotWriter:
+    """
+    Zwraca globalną pulę zapisu zrzutów ekranu.
+
+    Returns:
+        Instancja ScreenshotWriter współdzielona w procesie
+    """
+    return _screenshot_writer
@@ -0,0 +1,160 @@
+# Synchronizacja po akcjach
+"""
+settle.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Synchronizacja po wykonaniu akcji.
+W trybie "static" akcja czeka stały czas (parametr delay). W trybie
+"adaptive" czeka, aż ekran (lub obserwowany region) zareaguje na akcję
+i przestanie się zmieniać, ale nie dłużej niż max_delay - niezależnie od
+stałego opóźnienia akcji. Jeśli ekran się nie zmienia, oczekiwanie trwa
+co najmniej reaction_time - interfejs mógł jeszcze nie zacząć reagować.
+Dla każdej akcji zbierane są statystyki czasu zaoszczędzonego względem
+stałego opóźnienia.
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Tuple
+
+from automatyzer_desktop.utils.screen_changes import wait_for_screen_settled
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Obsługiwane tryby synchronizacji
+SYNC_MODES = ("static", "adaptive")
+
+# Domyślny czas bez zmian ekranu, po którym akcję uznajemy za zakończoną (w sekundach)
+DEFAULT_SETTLE_TIME = 0.2
+
+# Domyślny minimalny czas oczekiwania na reakcję interfejsu, gdy ekran się nie zmienia (w sekundach)
+DEFAULT_REACTION_TIME = 0.5
+
+# Domyślny odstęp między zrzutami ekranu podczas oczekiwania (w sekundach)
+DEFAULT_SETTLE_INTERVAL = 0.05
+
+# Domyślny maksymalny czas oczekiwania w trybie adaptive (w sekundach)
+DEFAULT_MAX_DELAY = 2.0
+
+
+class SettleSynchronizer:
+    """
+    Oczekiwanie po akcjach (stałe lub do ustabilizowania ekranu) ze statystykami.
+    """
+
+    def __init__(self, mode: str = "static", settle_time: float = DEFAULT_SETTLE_TIME,
+                 max_delay: float = DEFAULT_MAX_DELAY, interval: float = DEFAULT_SETTLE_INTERVAL,
+                 reaction_time: float = DEFAULT_REACTION_TIME):
+        """
+        Inicjalizacja synchronizacji.
+
+        Args:
+            mode: Tryb synchronizacji (jeden z SYNC_MODES)
+            settle_time: Czas bez zmian ekranu po jego reakcji, po którym akcję uznajemy
+                         za zakończoną (w sekundach)
+            max_delay: Maksymalny czas oczekiwania w trybie adaptive (w sekundach)
+            interval: Odstęp między zrzutami ekranu podczas oczekiwania (w sekundach)
+            reaction_time: Minimalny czas oczekiwania, gdy ekran się nie zmienia (w sekundach)
+
+        Raises:
+            ValueError: Jeśli tryb jest nieznany
+        """
+        self.mode = mode
+        self.settle_time = settle_time
+        self.max_delay = max_delay
+        self.interval = interval
+        self.reaction_time = reaction_time
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def mode(self) -> str:
+        """
+        Tryb synchronizacji.
+        """
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: str) -> None:
+        if mode not in SYNC_MODES:
+            raise ValueError(f"Nieznany tryb synchronizacji: {mode} (dostępne: {', '.join(SYNC_MODES)})")
+        self._mode = mode
+
+    def wait(self, action_name: str, delay: float, region: Tuple[int, int, int, int] = None) -> float:
+        """
+        Czeka po wykonaniu akcji.
+
+        Args:
+            action_name: Nazwa akcji (klucz statystyk)
+            delay: Stałe opóźnienie akcji (w sekundach); 0 wyłącza oczekiwanie w obu trybach.
+                   W trybie adaptive służy tylko do obliczenia zaoszczędzonego czasu
+            region: Region ekranu obserwowany w trybie adaptive (x, y, width, height)
+
+        Returns:
+            Czas oczekiwania (w sekundach)
+        """
+        if delay <= 0:
+            return 0.0
+
+        start = time.monotonic()
+        settled = True
+        if self.mode == "adaptive":
+            settled, _ = wait_for_screen_settled(settle_time=min(self.settle_time, self.max_delay),
+                                                 timeout=self.max_delay, region=region, interval=self.interval,
+                                                 reaction_time=min(self.reaction_time, self.max_delay))
+        else:
+            time.sleep(delay)
+        waited = time.monotonic() - start
+
+        with self._lock:
+            stats = self._stats.setdefault(action_name, {
+                "calls": 0, "static_seconds": 0.0, "waited_seconds": 0.0, "saved_seconds": 0.0, "timeouts": 0
+            })
+            stats["calls"] += 1
+            stats["static_seconds"] += delay
+            stats["waited_seconds"] += waited
+            stats["saved_seconds"] += delay - waited
+            if not settled:
+                stats["timeouts"] += 1
+
+        logger.debug(f"Oczekiwanie po akcji {action_name}: {waited:.3f}s (stałe opóźnienie {delay:.3f}s)")
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Zwraca statystyki oczekiwania dla każdej akcji.
+
+        Returns:
+            Słownik nazwa akcji -> liczba wywołań ("calls"), suma stałych opóźnień
+            ("static_seconds"), faktyczny czas oczekiwania ("waited_seconds"), czas
+            zaoszczędzony ("saved_seconds") i liczba przekroczeń max_delay ("timeouts")
+        """
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        """
+        Zeruje statystyki oczekiwania.
+        """
+        with self._lock:
+            self._stats.clear()
+
+
+# Globalna synchronizacja akcji (współdzielona w procesie)
+_settle_synchronizer = SettleSynchronizer()
+
+
+def get_settle_synchronizer() -> SettleSynchronizer:
+    """
+    Zwraca globalną synchronizację akcji.
+
+    Returns:
+        Instancja SettleSynchronizer współdzielona w procesie
+    """
+    return _settle_synchronizer
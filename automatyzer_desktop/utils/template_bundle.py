@@ -0,0 +1,281 @@
+# Paczki wzorców obrazów
+"""
+template_bundle.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Paczka wzorców: jeden plik binarny z surowymi tablicami uint8 wszystkich
+wzorców z katalogu (BGR, skala szarości, mapa krawędzi, maska i poziomy
+piramidy) oraz indeksem (nazwa, kształt, położenie w pliku). Paczka jest
+odwzorowywana w pamięci przez np.memmap, więc wzorce nie są dekodowane
+przy starcie, a procesy robocze współdzielą dane przez pamięć podręczną
+stron systemu.
+
+Budowanie (krok wdrożenia):
+    automatyzer_desktop bundle katalog_wzorcow
+"""
+
+import os
+import json
+import struct
+import logging
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.template_cache import (
+    DEFAULT_PYRAMID_LEVELS, TemplateEntry, _split_alpha, get_template_cache
+)
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Nagłówek pliku: sygnatura, wersja formatu, długość indeksu JSON
+BUNDLE_MAGIC = b"ABTB"
+BUNDLE_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+
+# Wyrównanie początku każdej tablicy w pliku (w bajtach)
+BUNDLE_ALIGNMENT = 64
+
+# Domyślna nazwa pliku paczki (w katalogu wzorców)
+DEFAULT_BUNDLE_NAME = "templates.bundle"
+
+# Rozszerzenia plików wzorców
+TEMPLATE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+
+# Opis tablicy w indeksie: (przesunięcie w pliku, kształt)
+ArraySpec = Tuple[int, List[int]]
+
+
+def _template_arrays(entry: TemplateEntry) -> Dict[str, Any]:
+    """
+    Zwraca tablice wpisu zapisywane w paczce.
+
+    Args:
+        entry: Wpis wzorca
+
+    Returns:
+        Słownik nazwa wariantu -> tablica lub lista tablic (poziomy piramidy)
+    """
+    arrays: Dict[str, Any] = {
+        "bgr": entry.bgr,
+        "gray": entry.gray,
+        "edges": entry.edges,
+        "pyramid": entry.pyramid,
+        "gray_pyramid": entry.gray_pyramid
+    }
+    if entry.mask is not None:
+        arrays["mask"] = entry.mask
+    return arrays
+
+
+def build_template_bundle(directory: str, output_path: Optional[str] = None,
+                          pyramid_levels: int = DEFAULT_PYRAMID_LEVELS) -> str:
+    """
+    Pakuje wszystkie wzorce z katalogu (wraz z podkatalogami) do jednej paczki.
+
+    Args:
+        directory: Katalog z plikami wzorców
+        output_path: Ścieżka pliku paczki (domyślnie DEFAULT_BUNDLE_NAME w katalogu wzorców)
+        pyramid_levels: Liczba pomniejszonych poziomów piramidy
+
+    Returns:
+        Ścieżka do zapisanej paczki
+
+    Raises:
+        ValueError: Jeśli katalog nie istnieje
+    """
+    if not os.path.isdir(directory):
+        raise ValueError(f"Katalog wzorców nie istnieje: {directory}")
+
+    output_path = output_path or os.path.join(directory, DEFAULT_BUNDLE_NAME)
+    templates: Dict[str, Dict[str, Any]] = {}
+    blobs: List[Tuple[int, np.ndarray]] = []
+    offset = 0
+
+    def add(array: np.ndarray) -> ArraySpec:
+        nonlocal offset
+        offset += -offset % BUNDLE_ALIGNMENT
+        spec = (offset, list(array.shape))
+        blobs.append((offset, np.ascontiguousarray(array)))
+        offset += array.nbytes
+        return spec
+
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file_name in sorted(files):
+            if os.path.splitext(file_name)[1].lower() not in TEMPLATE_EXTENSIONS:
+                continue
+
+            path = os.path.join(root, file_name)
+            image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            if image is None:
+                logger.warning(f"Pominięto plik, którego nie udało się wczytać: {path}")
+                continue
+
+            bgr, mask = _split_alpha(image)
+            entry = TemplateEntry(path, os.stat(path).st_mtime, bgr, pyramid_levels, mask)
+            arrays = {}
+            for name, value in _template_arrays(entry).items():
+                arrays[name] = [add(level) for level in value] if isinstance(value, list) else add(value)
+
+            name = os.path.relpath(path, directory).replace(os.sep, "/")
+            templates[name] = {"mtime": entry.mtime, "arrays": arrays}
+
+    index = json.dumps({"version": BUNDLE_VERSION, "pyramid_levels": pyramid_levels,
+                        "templates": templates}).encode("utf-8")
+    data_start = _HEADER.size + len(index)
+    data_start += -data_start % BUNDLE_ALIGNMENT
+
+    # Zapis do pliku tymczasowego i podmiana - procesy korzystające ze starej paczki
+    # zachowują jej odwzorowanie w pamięci
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(index)))
+            f.write(index)
+            for array_offset, array in blobs:
+                f.seek(data_start + array_offset)
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+        os.replace(tmp_path, output_path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+    logger.info(f"Zapisano paczkę {len(templates)} wzorców ({data_start + offset} B): {output_path}")
+    return output_path
+
+
+class TemplateBundle:
+    """
+    Paczka wzorców odwzorowana w pamięci.
+    Wpisy są tworzone przy pierwszym użyciu jako widoki na dane pliku (bez kopiowania).
+    """
+
+    def __init__(self, path: str, root: Optional[str] = None):
+        """
+        Inicjalizacja paczki.
+
+        Args:
+            path: Ścieżka do pliku paczki
+            root: Katalog, względem którego nazwy wzorców odpowiadają ścieżkom plików
+                  (domyślnie katalog pliku paczki)
+
+        Raises:
+            ValueError: Jeśli plik nie jest paczką wzorców w obsługiwanej wersji
+        """
+        self.path = os.path.abspath(path)
+        self.root = os.path.abspath(root) if root else os.path.dirname(self.path)
+
+        with open(self.path, "rb") as f:
+            magic, version, index_size = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+                raise ValueError(f"Nieobsługiwany plik paczki wzorców: {path}")
+            index = json.loads(f.read(index_size).decode("utf-8"))
+
+        self._data_start = _HEADER.size + index_size
+        self._data_start += -self._data_start % BUNDLE_ALIGNMENT
+        self._index: Dict[str, Dict[str, Any]] = index["templates"]
+        # Zwykły widok ndarray - wycinki podklasy np.memmap są wolniejsze, a dane te same
+        self._data = np.memmap(self.path, dtype=np.uint8, mode="r").view(np.ndarray)
+        self._entries: Dict[str, TemplateEntry] = {}
+        self._lock = threading.Lock()
+
+    def _array(self, spec: ArraySpec) -> np.ndarray:
+        """
+        Zwraca tablicę z paczki jako widok na odwzorowany plik.
+        """
+        offset, shape = spec
+        start = self._data_start + offset
+        return self._data[start:start + int(np.prod(shape))].reshape(shape)
+
+    def get(self, name: str) -> Optional[TemplateEntry]:
+        """
+        Zwraca wzorzec o podanej nazwie.
+
+        Args:
+            name: Nazwa wzorca (ścieżka względna z separatorem "/")
+
+        Returns:
+            Wpis wzorca lub None, jeśli paczka go nie zawiera
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                return entry
+
+            info = self._index.get(name)
+            if info is None:
+                return None
+
+            arrays = info["arrays"]
+            entry = TemplateEntry.from_variants(
+                os.path.join(self.root, *name.split("/")), info["mtime"],
+                self._array(arrays["bgr"]), self._array(arrays["gray"]), self._array(arrays["edges"]),
+                [self._array(spec) for spec in arrays["pyramid"]],
+                [self._array(spec) for spec in arrays["gray_pyramid"]],
+                self._array(arrays["mask"]) if "mask" in arrays else None
+            )
+            self._entries[name] = entry
+            return entry
+
+    def lookup(self, path: str) -> Optional[TemplateEntry]:
+        """
+        Zwraca wzorzec odpowiadający ścieżce pliku.
+
+        Args:
+            path: Ścieżka do pliku wzorca
+
+        Returns:
+            Wpis wzorca lub None, jeśli ścieżka leży poza katalogiem paczki albo paczka jej nie zawiera
+        """
+        name = os.path.relpath(os.path.abspath(path), self.root)
+        if name.startswith(os.pardir):
+            return None
+        return self.get(name.replace(os.sep, "/"))
+
+    def names(self) -> List[str]:
+        """
+        Zwraca nazwy wzorców w paczce.
+
+        Returns:
+            Lista nazw (ścieżki względne z separatorem "/")
+        """
+        return list(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+
+def load_template_bundle(path: str, root: Optional[str] = None) -> Optional[TemplateBundle]:
+    """
+    Otwiera paczkę wzorców i dołącza ją do globalnej pamięci podręcznej wzorców,
+    dzięki czemu wyszukiwania obrazów korzystają z niej bez zmian w wywołaniach.
+
+    Args:
+        path: Ścieżka do pliku paczki
+        root: Katalog, względem którego nazwy wzorców odpowiadają ścieżkom plików
+              (domyślnie katalog pliku paczki)
+
+    Returns:
+        Paczka wzorców lub None w przypadku błędu
+    """
+    try:
+        bundle = TemplateBundle(path, root)
+        get_template_cache().add_bundle(bundle)
+        logger.info(f"Dołączono paczkę {len(bundle)} wzorców: {path}")
+        return bundle
+    except Exception as e:
+        logger.error(f"Błąd podczas wczytywania paczki wzorców: {str(e)}")
+        return None
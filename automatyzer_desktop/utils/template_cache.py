@@ -0,0 +1,463 @@
+# Pamięć podręczna wzorców obrazów
+"""
+template_cache.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Procesowa pamięć podręczna zdekodowanych wzorców obrazów.
+Przechowuje obraz BGR, jego warianty (skala szarości, mapa krawędzi,
+maska z kanału alfa) oraz pomniejszone poziomy piramidy, dzięki czemu
+kolejne wyszukiwania tego samego wzorca nie odczytują i nie dekodują
+pliku ponownie.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import edge_map, orb_features
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Domyślny budżet pamięci podręcznej (w bajtach)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Domyślna liczba pomniejszonych poziomów piramidy
+DEFAULT_PYRAMID_LEVELS = 2
+
+# Minimalny rozmiar boku wzorca na poziomie piramidy (mniejszych poziomów nie tworzymy)
+MIN_PYRAMID_SIDE = 8
+
+# Minimalny rozmiar boku przeskalowanego wzorca
+MIN_SCALED_SIDE = 4
+
+# Maksymalna liczba punktów charakterystycznych ORB wzorca
+TEMPLATE_MAX_FEATURES = 500
+
+
+def _split_alpha(image: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Rozdziela wczytany obraz na część BGR i maskę z kanału alfa.
+
+    Args:
+        image: Obraz wczytany z cv2.IMREAD_UNCHANGED
+
+    Returns:
+        Krotka (obraz BGR, maska) - maska jest None, gdy obraz nie ma przezroczystych pikseli
+    """
+    if image.dtype != np.uint8:
+        # Obrazy 16-bitowe sprowadzamy do 8 bitów, jak cv2.imread w trybie domyślnym
+        image = (image / 257).astype(np.uint8)
+
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR), None
+
+    if image.shape[2] == 4:
+        alpha = image[:, :, 3]
+        mask = alpha.copy() if alpha.min() < 255 else None
+        return np.ascontiguousarray(image[:, :, :3]), mask
+
+    return image, None
+
+
+class TemplateEntry:
+    """
+    Zdekodowany wzorzec wraz z przygotowanymi wariantami.
+    """
+
+    def __init__(self, path: str, mtime: float, bgr: np.ndarray, pyramid_levels: int = DEFAULT_PYRAMID_LEVELS,
+                 mask: Optional[np.ndarray] = None, scale: float = 1.0):
+        """
+        Inicjalizacja wpisu.
+
+        Args:
+            path: Ścieżka do pliku wzorca
+            mtime: Czas modyfikacji pliku w momencie wczytania
+            bgr: Obraz wzorca w formacie BGR
+            pyramid_levels: Liczba pomniejszonych poziomów piramidy
+            mask: Maska dopasowania z kanału alfa (None dla wzorców bez przezroczystości)
+            scale: Skala wzorca względem pliku na dysku
+        """
+        self.path = path
+        self.mtime = mtime
+        self.bgr = bgr
+        self.mask = mask
+        self.scale = scale
+        self.gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        self.edges = edge_map(self.gray)
+        self._features: Optional[Tuple[np.ndarray, Optional[np.ndarray]]] = None
+
+        # Poziomy piramidy: pyramid[0] to pomniejszenie x2, pyramid[1] x4 itd.
+        self.pyramid: List[np.ndarray] = []
+        self.gray_pyramid: List[np.ndarray] = []
+        level = bgr
+        for _ in range(pyramid_levels):
+            if min(level.shape[:2]) < 2 * MIN_PYRAMID_SIDE:
+                break
+            level = cv2.pyrDown(level)
+            self.pyramid.append(level)
+            self.gray_pyramid.append(cv2.cvtColor(level, cv2.COLOR_BGR2GRAY))
+
+    @classmethod
+    def from_variants(cls, path: str, mtime: float, bgr: np.ndarray, gray: np.ndarray, edges: np.ndarray,
+                      pyramid: List[np.ndarray], gray_pyramid: List[np.ndarray],
+                      mask: Optional[np.ndarray] = None, scale: float = 1.0) -> 'TemplateEntry':
+        """
+        Tworzy wpis z gotowych wariantów (np. odwzorowanych w pamięci z paczki wzorców)
+        bez ponownego liczenia skali szarości, krawędzi i piramidy.
+
+        Args:
+            path: Ścieżka do pliku wzorca
+            mtime: Czas modyfikacji pliku w momencie przygotowania wariantów
+            bgr: Obraz wzorca w formacie BGR
+            gray: Wzorzec w skali szarości
+            edges: Mapa krawędzi wzorca
+            pyramid: Pomniejszone poziomy piramidy BGR
+            gray_pyramid: Pomniejszone poziomy piramidy w skali szarości
+            mask: Maska dopasowania z kanału alfa (opcjonalnie)
+            scale: Skala wzorca względem pliku na dysku
+
+        Returns:
+            Wpis wzorca
+        """
+        entry = cls.__new__(cls)
+        entry.path = path
+        entry.mtime = mtime
+        entry.bgr = bgr
+        entry.mask = mask
+        entry.scale = scale
+        entry.gray = gray
+        entry.edges = edges
+        entry._features = None
+        entry.pyramid = list(pyramid)
+        entry.gray_pyramid = list(gray_pyramid)
+        return entry
+
+    def variant(self, color_mode: str = "bgr") -> np.ndarray:
+        """
+        Zwraca wzorzec w postaci odpowiedniej dla trybu kolorów.
+
+        Args:
+            color_mode: Tryb kolorów ("bgr", "gray", "edges" lub "masked")
+
+        Returns:
+            Wzorzec BGR ("bgr", "masked"), w skali szarości ("gray") lub mapa krawędzi ("edges")
+        """
+        if color_mode == "gray":
+            return self.gray
+        if color_mode == "edges":
+            return self.edges
+        return self.bgr
+
+    def level(self, level: int, color_mode: str = "bgr") -> np.ndarray:
+        """
+        Zwraca poziom piramidy wzorca.
+
+        Args:
+            level: Numer poziomu (1 = pomniejszenie x2)
+            color_mode: Tryb kolorów ("bgr" lub "gray")
+
+        Returns:
+            Pomniejszony wzorzec
+        """
+        if color_mode == "gray":
+            return self.gray_pyramid[level - 1]
+        return self.pyramid[level - 1]
+
+    @property
+    def features(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Punkty charakterystyczne i deskryptory ORB wzorca (wyliczane raz, przy pierwszym
+        dopasowaniu strategią "features"; piksele przezroczyste są pomijane).
+        """
+        if self._features is None:
+            self._features = orb_features(self.gray, TEMPLATE_MAX_FEATURES, self.mask)
+        return self._features
+
+    @property
+    def height(self) -> int:
+        """Wysokość wzorca w pikselach"""
+        return self.bgr.shape[0]
+
+    @property
+    def width(self) -> int:
+        """Szerokość wzorca w pikselach"""
+        return self.bgr.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Łączny rozmiar wszystkich przechowywanych tablic"""
+        arrays = [self.bgr, self.gray, self.edges] + self.pyramid + self.gray_pyramid
+        if self.mask is not None:
+            arrays.append(self.mask)
+        return sum(array.nbytes for array in arrays)
+
+
+def _scaled_entry(base: TemplateEntry, scale: float, pyramid_levels: int) -> Optional[TemplateEntry]:
+    """
+    Tworzy przeskalowany wariant wzorca.
+
+    Args:
+        base: Wzorzec w skali 1.0
+        scale: Skala docelowa
+        pyramid_levels: Liczba pomniejszonych poziomów piramidy
+
+    Returns:
+        Przeskalowany wpis lub None, jeśli wzorzec byłby za mały
+    """
+    width = int(round(base.width * scale))
+    height = int(round(base.height * scale))
+    if min(width, height) < MIN_SCALED_SIDE:
+        return None
+
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+    bgr = cv2.resize(base.bgr, (width, height), interpolation=interpolation)
+    mask = None
+    if base.mask is not None:
+        mask = cv2.resize(base.mask, (width, height), interpolation=cv2.INTER_NEAREST)
+    return TemplateEntry(base.path, base.mtime, bgr, pyramid_levels, mask, scale)
+
+
+class TemplateCache:
+    """
+    Pamięć podręczna wzorców z usuwaniem LRU według budżetu bajtów.
+    Wpisy są identyfikowane ścieżką i czasem modyfikacji pliku, więc
+    podmiana pliku na dysku unieważnia wcześniej wczytany wzorzec.
+    Wzorce z dołączonych paczek (TemplateBundle) są zwracane bez dekodowania
+    i nie zajmują budżetu (ich dane leżą w pamięci podręcznej stron systemu).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, pyramid_levels: int = DEFAULT_PYRAMID_LEVELS):
+        """
+        Inicjalizacja pamięci podręcznej.
+
+        Args:
+            max_bytes: Maksymalny łączny rozmiar przechowywanych wzorców (w bajtach)
+            pyramid_levels: Liczba pomniejszonych poziomów piramidy dla każdego wzorca
+        """
+        self.max_bytes = max_bytes
+        self.pyramid_levels = pyramid_levels
+        # Klucze: ścieżka bezwzględna (skala 1.0) lub krotka (ścieżka, skala)
+        self._entries: "OrderedDict[Union[str, Tuple[str, float]], TemplateEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._bundles: List["TemplateBundle"] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bundle_hits = 0
+
+    def add_bundle(self, bundle: "TemplateBundle") -> None:
+        """
+        Dołącza paczkę wzorców sprawdzaną przed dekodowaniem plików.
+        Paczka z tego samego pliku zastępuje wcześniej dołączoną (na jej miejscu).
+
+        Args:
+            bundle: Paczka wzorców (TemplateBundle)
+        """
+        path = os.path.abspath(bundle.path)
+        with self._lock:
+            for index, attached in enumerate(self._bundles):
+                if os.path.abspath(attached.path) == path:
+                    self._bundles[index] = bundle
+                    return
+            self._bundles.append(bundle)
+
+    def clear_bundles(self) -> None:
+        """
+        Odłącza wszystkie paczki wzorców.
+        """
+        with self._lock:
+            self._bundles = []
+
+    def _bundled(self, path: str) -> Optional[TemplateEntry]:
+        """
+        Zwraca wzorzec z pierwszej dołączonej paczki, która go zawiera.
+
+        Args:
+            path: Ścieżka bezwzględna do pliku wzorca
+
+        Returns:
+            Wpis wzorca lub None, jeśli żadna paczka go nie zawiera
+        """
+        with self._lock:
+            bundles = list(self._bundles)
+        for bundle in bundles:
+            entry = bundle.lookup(path)
+            if entry is not None:
+                return entry
+        return None
+
+    def get(self, image_path: str, scale: float = 1.0) -> Optional[TemplateEntry]:
+        """
+        Zwraca wzorzec z pamięci podręcznej lub wczytuje go z dysku.
+
+        Args:
+            image_path: Ścieżka do pliku obrazu
+            scale: Skala wzorca (np. 1.25 dla sesji ze skalowaniem DPI 125%)
+
+        Returns:
+            Wpis wzorca lub None, jeśli pliku nie ma lub nie da się go wczytać
+        """
+        path = os.path.abspath(image_path)
+        bundled = self._bundled(path) if self._bundles else None
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            if bundled is None:
+                logger.error(f"Plik obrazu nie istnieje: {image_path}")
+                return None
+            # Wdrożenie może zawierać tylko paczkę, bez plików wzorców
+            mtime = bundled.mtime
+
+        if bundled is not None and mtime > bundled.mtime:
+            # Plik zmieniono po zbudowaniu paczki - wczytujemy go z dysku
+            bundled = None
+
+        scale = round(float(scale), 3)
+        if scale == 1.0 and bundled is not None:
+            with self._lock:
+                self.bundle_hits += 1
+            return bundled
+
+        key = path if scale == 1.0 else (path, scale)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.mtime == mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        if scale != 1.0:
+            # Wariant przeskalowany powstaje z wzorca w skali 1.0
+            base = self.get(image_path)
+            if base is None:
+                return None
+            entry = _scaled_entry(base, scale, self.pyramid_levels)
+            if entry is None:
+                logger.debug(f"Wzorzec '{image_path}' jest za mały dla skali {scale}")
+                return None
+            self._store(key, entry)
+            return entry
+
+        # Dekodowanie poza blokadą, aby nie wstrzymywać innych wątków
+        image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if image is None:
+            logger.error(f"Nie udało się wczytać obrazu: {image_path}")
+            return None
+
+        bgr, mask = _split_alpha(image)
+        entry = TemplateEntry(path, mtime, bgr, self.pyramid_levels, mask)
+        self._store(path, entry)
+        return entry
+
+    def _store(self, key: Union[str, Tuple[str, float]], entry: TemplateEntry) -> None:
+        """
+        Zapisuje wpis i usuwa najdawniej używane wpisy ponad budżet.
+
+        Args:
+            key: Klucz wpisu (ścieżka bezwzględna lub krotka (ścieżka, skala))
+            entry: Wpis do zapisania
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+
+            # Usuwanie LRU - zawsze zostawiamy przynajmniej właśnie dodany wpis
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+                logger.debug(f"Usunięto wzorzec z pamięci podręcznej: {evicted.path}")
+
+    def invalidate(self, image_path: str) -> None:
+        """
+        Usuwa pojedynczy wzorzec (wraz z wariantami przeskalowanymi) z pamięci podręcznej.
+
+        Args:
+            image_path: Ścieżka do pliku obrazu
+        """
+        path = os.path.abspath(image_path)
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.path == path]:
+                self._bytes -= self._entries.pop(key).nbytes
+
+    def clear(self) -> None:
+        """
+        Czyści pamięć podręczną i zeruje liczniki.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.bundle_hits = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Zwraca statystyki pamięci podręcznej.
+
+        Returns:
+            Słownik z liczbą trafień, chybień, usunięć, wpisów, zajętych bajtów
+            oraz dołączonych paczek i trafień w paczkach
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "bundles": len(self._bundles),
+                "bundle_hits": self.bundle_hits
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, image_path: str) -> bool:
+        return os.path.abspath(image_path) in self._entries
+
+
+# Globalna instancja pamięci podręcznej (współdzielona w procesie)
+_template_cache = TemplateCache()
+
+
+def get_template_cache() -> TemplateCache:
+    """
+    Zwraca globalną pamięć podręczną wzorców.
+
+    Returns:
+        Instancja TemplateCache współdzielona w procesie
+    """
+    return _template_cache
+
+
+def load_template(image_path: str, scale: float = 1.0) -> Optional[TemplateEntry]:
+    """
+    Wczytuje wzorzec przez globalną pamięć podręczną.
+
+    Args:
+        image_path: Ścieżka do pliku obrazu
+        scale: Skala wzorca
+
+    Returns:
+        Wpis wzorca lub None, jeśli nie udało się go wczytać
+    """
+    return _template_cache.get(image_path, scale)
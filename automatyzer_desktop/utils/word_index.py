@@ -0,0 +1,303 @@
+# Indeks słów na ekranie
+"""
+word_index.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Indeks słów widocznych na ekranie (słowo -> prostokąt otaczający).
+Pierwsza aktualizacja rozpoznaje cały ekran, kolejne tylko obszary zmienione
+od poprzedniej klatki (wykrywane przez ChangeDetector). Wyszukiwanie tekstu
+korzysta z indeksu, więc powtarzane zapytania o ten sam ekran nie uruchamiają
+OCR ponownie.
+"""
+
+import logging
+import string
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from automatyzer_desktop.utils.frame_provider import Frame, get_frame
+from automatyzer_desktop.utils.ocr import OCRService, Word, get_ocr_service
+from automatyzer_desktop.utils.screen_changes import ChangeDetector, intersects
+
+# Konfiguracja loggera
+logger = logging.getLogger(__name__)
+
+# Powiększenie zmienionego obszaru przed rozpoznawaniem (w pikselach), aby objąć całe słowa
+DEFAULT_MARGIN = 24
+
+# Udział zmienionej powierzchni ekranu, powyżej którego rozpoznawany jest cały ekran
+FULL_REFRESH_RATIO = 0.5
+
+# Znaki pomijane na początku i końcu słów przy porównywaniu (np. "Dalej:" lub "Next >")
+_PUNCTUATION = string.punctuation + "…«»„”"
+
+
+def _union(first: Tuple[int, int, int, int], second: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """
+    Zwraca najmniejszy prostokąt obejmujący oba prostokąty (x, y, width, height).
+    """
+    left = min(first[0], second[0])
+    top = min(first[1], second[1])
+    right = max(first[0] + first[2], second[0] + second[2])
+    bottom = max(first[1] + first[3], second[1] + second[3])
+    return left, top, right - left, bottom - top
+
+
+def _merge_rects(rects: Sequence[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+    """
+    Scala przecinające się prostokąty (aby żaden obszar nie był rozpoznawany dwukrotnie).
+    """
+    merged = list(rects)
+    changed = True
+    while changed:
+        changed = False
+        result: List[Tuple[int, int, int, int]] = []
+        for rect in merged:
+            for index, other in enumerate(result):
+                if intersects(rect, other):
+                    result[index] = _union(rect, other)
+                    changed = True
+                    break
+            else:
+                result.append(rect)
+        merged = result
+    return merged
+
+
+def _normalize(text: str, case_sensitive: bool) -> str:
+    """
+    Normalizuje słowo do porównań (bez interpunkcji na brzegach, opcjonalnie małe litery).
+    """
+    text = text.strip(_PUNCTUATION)
+    return text if case_sensitive else text.lower()
+
+
+def _follows(previous: Word, word: Word) -> bool:
+    """
+    Sprawdza, czy słowo następuje bezpośrednio po poprzednim w tej samej linii.
+    """
+    height = max(previous.height, word.height)
+    same_line = abs(previous.center[1] - word.center[1]) <= height / 2
+    gap = word.x - (previous.x + previous.width)
+    return same_line and -height / 2 <= gap <= 2 * height
+
+
+class WordIndex:
+    """
+    Indeks słów bieżącego ekranu aktualizowany przyrostowo.
+    """
+
+    def __init__(self, service: Optional[OCRService] = None, margin: int = DEFAULT_MARGIN,
+                 full_refresh_ratio: float = FULL_REFRESH_RATIO):
+        """
+        Inicjalizacja indeksu.
+
+        Args:
+            service: Usługa OCR (opcjonalnie, domyślnie globalna usługa OCR)
+            margin: Powiększenie zmienionego obszaru przed rozpoznawaniem (w pikselach)
+            full_refresh_ratio: Udział zmienionej powierzchni ekranu, powyżej którego
+                                rozpoznawany jest cały ekran
+        """
+        self._service = service
+        self.margin = margin
+        self.full_refresh_ratio = full_refresh_ratio
+        self._detector = ChangeDetector()
+        self._words: List[Word] = []
+        self._lock = threading.Lock()
+        self.full_updates = 0
+        self.partial_updates = 0
+        self.unchanged = 0
+
+    @property
+    def service(self) -> OCRService:
+        """
+        Usługa OCR używana do rozpoznawania.
+        """
+        return self._service if self._service is not None else get_ocr_service()
+
+    def update(self, frame: Optional[Frame] = None) -> None:
+        """
+        Aktualizuje indeks do bieżącej klatki, rozpoznając tylko zmienione obszary.
+
+        Args:
+            frame: Klatka ekranu (opcjonalnie, domyślnie bieżąca klatka całego ekranu)
+        """
+        frame = frame if frame is not None else get_frame()
+        with self._lock:
+            changed = self._detector.changes(frame)
+            if changed == []:
+                self.unchanged += 1
+                return
+
+            changed_area = sum(width * height for _, _, width, height in changed or [])
+            if changed is None or changed_area > self.full_refresh_ratio * frame.width * frame.height:
+                words = self.service.read_words_many([frame.gray])[0]
+                self._words = [word.moved(*frame.origin) for word in words]
+                self.full_updates += 1
+                logger.debug(f"Indeks słów zbudowany od nowa: {len(self._words)} słów")
+                return
+
+            areas = []
+            for x, y, width, height in changed:
+                area = (x - self.margin, y - self.margin, width + 2 * self.margin, height + 2 * self.margin)
+                # Słowa przecięte przez zmieniony obszar są rozpoznawane w całości
+                for word in self._words:
+                    if intersects(word.box, area):
+                        area = _union(area, word.box)
+                areas.append(area)
+
+            crops = [frame.crop(area) for area in _merge_rects(areas)]
+            crops = [crop for crop in crops if crop.width > 0 and crop.height > 0]
+            boxes = [(crop.origin[0], crop.origin[1], crop.width, crop.height) for crop in crops]
+
+            # Słowa ze zmienionych obszarów zastępowane wynikami ponownego rozpoznawania
+            words = [word for word in self._words
+                     if not any(intersects((word.center[0], word.center[1], 1, 1), box) for box in boxes)]
+            for crop, crop_words in zip(crops, self.service.read_words_many([crop.gray for crop in crops])):
+                words.extend(word.moved(*crop.origin) for word in crop_words)
+
+            self._words = words
+            self.partial_updates += 1
+            logger.debug(f"Indeks słów zaktualizowany w {len(crops)} obszarach: {len(self._words)} słów")
+
+    def find(self, text: str, exact: bool = False, case_sensitive: bool = False,
+             region: Tuple[int, int, int, int] = None) -> List[Tuple[int, int, int, int]]:
+        """
+        Wyszukuje tekst (słowo lub frazę) w indeksie.
+
+        Args:
+            text: Szukany tekst; słowa frazy muszą następować po sobie w jednej linii
+            exact: Czy słowa muszą być równe (domyślnie wystarczy, że zawierają szukany tekst)
+            case_sensitive: Czy rozróżniać wielkość liter
+            region: Region ekranu (x, y, width, height), do którego ograniczyć wyniki
+
+        Returns:
+            Lista prostokątów (x, y, width, height) znalezionego tekstu, od góry do dołu
+            i od lewej do prawej
+        """
+        tokens = [token for token in (_normalize(part, case_sensitive) for part in text.split()) if token]
+        if not tokens:
+            return []
+
+        with self._lock:
+            words = list(self._words)
+        values = [_normalize(word.text, case_sensitive) for word in words]
+
+        def matches(token: str, value: str) -> bool:
+            return value == token if exact else token in value
+
+        boxes = []
+        for index, word in enumerate(words):
+            if not matches(tokens[0], values[index]):
+                continue
+
+            box, last = word.box, word
+            for token in tokens[1:]:
+                following = next((candidate for candidate, value in zip(words, values)
+                                  if matches(token, value) and _follows(last, candidate)), None)
+                if following is None:
+                    break
+                box, last = _union(box, following.box), following
+            else:
+                if region is None or intersects(box, region):
+                    boxes.append(box)
+
+        return sorted(boxes, key=lambda box: (box[1], box[0]))
+
+    def words(self) -> List[Word]:
+        """
+        Zwraca słowa z indeksu.
+
+        Returns:
+            Lista słów (współrzędne ekranu)
+        """
+        with self._lock:
+            return list(self._words)
+
+    def reset(self) -> None:
+        """
+        Czyści indeks (kolejna aktualizacja rozpozna cały ekran).
+        """
+        with self._lock:
+            self._words = []
+            self._detector.forget()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Zwraca statystyki indeksu.
+
+        Returns:
+            Słownik z liczbą słów, pełnych i częściowych aktualizacji oraz klatek bez zmian
+        """
+        with self._lock:
+            return {
+                "words": len(self._words),
+                "full_updates": self.full_updates,
+                "partial_updates": self.partial_updates,
+                "unchanged": self.unchanged
+            }
+
+
+# Globalny indeks słów (współdzielony w procesie)
+_word_index = WordIndex()
+
+
+def get_word_index() -> WordIndex:
+    """
+    Zwraca globalny indeks słów ekranu.
+
+    Returns:
+        Instancja WordIndex współdzielona w procesie
+    """
+    return _word_index
+
+
+def find_all_text_on_screen(text: str, region: Tuple[int, int, int, int] = None, exact: bool = False,
+                            case_sensitive: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    Znajduje wszystkie wystąpienia tekstu na ekranie.
+
+    Args:
+        text: Szukany tekst (słowo lub fraza)
+        region: Region ekranu do przeszukania (x, y, width, height)
+        exact: Czy słowa muszą być równe (domyślnie wystarczy, że zawierają szukany tekst)
+        case_sensitive: Czy rozróżniać wielkość liter
+
+    Returns:
+        Lista prostokątów (x, y, width, height) znalezionego tekstu
+    """
+    try:
+        index = get_word_index()
+        index.update()
+        return index.find(text, exact=exact, case_sensitive=case_sensitive, region=region)
+    except Exception as e:
+        logger.error(f"Błąd podczas wyszukiwania tekstu na ekranie: {str(e)}")
+        return []
+
+
+def find_text_on_screen(text: str, region: Tuple[int, int, int, int] = None, exact: bool = False,
+                        case_sensitive: bool = False) -> Optional[Tuple[int, int]]:
+    """
+    Znajduje tekst na ekranie.
+
+    Args:
+        text: Szukany tekst (słowo lub fraza)
+        region: Region ekranu do przeszukania (x, y, width, height)
+        exact: Czy słowa muszą być równe (domyślnie wystarczy, że zawierają szukany tekst)
+        case_sensitive: Czy rozróżniać wielkość liter
+
+    Returns:
+        Krotka (x, y) z pozycją środka pierwszego wystąpienia tekstu lub None, jeśli nie znaleziono
+    """
+    boxes = find_all_text_on_screen(text, region, exact, case_sensitive)
+    if not boxes:
+        return None
+
+    x, y, width, height = boxes[0]
+    position = (x + width // 2, y + height // 2)
+    logger.info(f"Znaleziono tekst '{text}' na pozycji {position}")
+    return position
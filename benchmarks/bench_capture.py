@@ -0,0 +1,77 @@
+# Benchmark backendów zrzutów ekranu
+"""
+bench_capture.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Porównuje backendy zrzutów ekranu (mss / MIT-SHM oraz PIL.ImageGrab):
+liczbę klatek na sekundę oraz bajty alokowane na jeden zrzut.
+
+Wymaga serwera X (np. Xvfb). Uruchomienie (z katalogu głównego repozytorium):
+    Xvfb :99 -screen 0 1920x1080x24 &
+    DISPLAY=:99 python -m benchmarks.bench_capture
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Dict
+
+from automatyzer_desktop.utils.capture import CAPTURE_BACKENDS, create_capture_backend
+
+
+def _measure(name: str, frames: int) -> Dict[str, float]:
+    """Mierzy liczbę klatek na sekundę i alokacje na zrzut dla jednego backendu."""
+    backend = create_capture_backend(name)
+    try:
+        # Rozgrzewka: połączenie z serwerem X i bufory wyjściowe
+        for _ in range(backend.ring_size):
+            backend()
+
+        start = time.perf_counter()
+        for _ in range(frames):
+            backend()
+        elapsed = time.perf_counter() - start
+
+        # Alokacje śledzone przez tracemalloc (Python i NumPy; bez wewnętrznych buforów C biblioteki PIL)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for _ in range(frames):
+            backend()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return {
+            "backend": backend.NAME,
+            "fps": frames / elapsed,
+            "peak_bytes": peak - before,
+            "buffer_allocations": backend.stats()["allocations"]
+        }
+    finally:
+        backend.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark backendów zrzutów ekranu")
+    parser.add_argument("--frames", type=int, default=50, help="Liczba zrzutów na pomiar")
+    parser.add_argument("--backends", nargs="+", default=["mss", "pil"],
+                        choices=[name for name in CAPTURE_BACKENDS if name != "auto"])
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'klatki/s':>10} {'szczyt alokacji na zrzut':>26} {'alokacje buforów':>18}")
+    for name in args.backends:
+        try:
+            result = _measure(name, args.frames)
+        except Exception as e:
+            print(f"{name:>8} niedostępny: {e}")
+            continue
+        print(f"{result['backend']:>8} {result['fps']:>10.1f} {result['peak_bytes'] / 1024 / 1024:>23.1f} MB "
+              f"{result['buffer_allocations']:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Benchmark wykonywania skryptów DSL
+"""
+bench_dsl.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Mierzy narzut interpretera DSL na pętlach: 10 000 iteracji akcji, która
+nic nie robi, więc czas wykonania to wyłącznie koszt interpretera
+(ewaluacja parametrów, wyszukanie i utworzenie akcji, sterowanie pętlą).
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_dsl
+    python -m benchmarks.bench_dsl --iterations 100000
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any, Dict, Optional, Type
+
+from automatyzer_desktop.actions.base import BaseAction
+from automatyzer_desktop.dsl.interpreter import DSLInterpreter
+
+ITERATIONS = 10000
+
+
+class NoopAction(BaseAction):
+    """Akcja, która nic nie robi (mierzy wyłącznie narzut interpretera)."""
+
+    ACTION_NAME = "noop"
+    ACTION_DESCRIPTION = "Nic nie robi"
+    REQUIRED_PARAMS = {}
+    OPTIONAL_PARAMS = {
+        "value": ((int, float, str), 0),  # Dowolna wartość
+        "label": (str, ""),  # Etykieta
+        "delay": ((int, float), 0.0)  # Opóźnienie (ignorowane)
+    }
+
+    def execute(self) -> Any:
+        return None
+
+
+class TickAction(BaseAction):
+    """Akcja zwracająca True przez podaną liczbę wywołań (warunek pętli while)."""
+
+    ACTION_NAME = "tick"
+    ACTION_DESCRIPTION = "Licznik wywołań"
+    REQUIRED_PARAMS = {"limit": int}
+    OPTIONAL_PARAMS = {}
+
+    calls = 0
+
+    def execute(self) -> bool:
+        TickAction.calls += 1
+        return TickAction.calls <= self.params["limit"]
+
+
+class BenchBot:
+    """Minimalny bot z rejestrem akcji benchmarku (jak AutomationBot, bez urządzeń wejścia)."""
+
+    def __init__(self):
+        self.actions_registry: Dict[str, Type[BaseAction]] = {
+            action.ACTION_NAME: action for action in (NoopAction, TickAction)
+        }
+
+    def get_action(self, action_name: str) -> Optional[Type[BaseAction]]:
+        return self.actions_registry.get(action_name)
+
+    def create_action(self, action_name: str, **kwargs) -> Optional[BaseAction]:
+        action_class = self.get_action(action_name)
+        if action_class:
+            return action_class(bot=self, **kwargs)
+        return None
+
+
+def cases(iterations: int) -> Dict[str, str]:
+    """Zwraca przypadki benchmarku (nazwa -> skrypt)."""
+    return {
+        "repeat: noop()": f"repeat {iterations} {{ noop(); }}",
+        "repeat: noop(literały)": f'repeat {iterations} {{ noop(value=1, label="stały", delay=0.5); }}',
+        "repeat: noop(zmienna)": f'x = 5;\nrepeat {iterations} {{ noop(value=x, label="stały"); }}',
+        "repeat: if true": f"repeat {iterations} {{ if true {{ noop(); }} }}",
+        "while: tick()": f"while tick(limit={iterations}) {{ noop(); }}",
+    }
+
+
+def main() -> None:
+    """Uruchamia benchmark i wypisuje tabelę wyników."""
+    parser = argparse.ArgumentParser(description="Benchmark wykonywania skryptów DSL")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS, help="Liczba iteracji pętli")
+    parser.add_argument("--repeats", type=int, default=5, help="Liczba powtórzeń każdego pomiaru")
+    args = parser.parse_args()
+
+    bot = BenchBot()
+    print(f"{'przypadek':<26} {'ms':>9} {'us/iter':>9}")
+    for name, script in cases(args.iterations).items():
+        durations = []
+        for _ in range(args.repeats):
+            interpreter = DSLInterpreter()
+            TickAction.calls = 0
+            start = time.perf_counter()
+            interpreter.interpret_script(script, bot)
+            durations.append(time.perf_counter() - start)
+        median = statistics.median(durations)
+        print(f"{name:<26} {median * 1000:>9.2f} {median / args.iterations * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
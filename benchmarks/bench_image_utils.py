@@ -0,0 +1,335 @@
+# Zestaw benchmarków image_utils
+"""
+bench_image_utils.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Powtarzalny zestaw benchmarków funkcji image_utils na syntetycznych ekranach
+(bez fizycznego ekranu): find_image_on_screen, find_all_on_screen,
+compare_images i take_screenshot dla różnych rozdzielczości, rozmiarów
+wzorców, progów pewności oraz przypadków trafienia i chybienia.
+
+Dla każdego przypadku mierzone są percentyle opóźnienia (p50, p90, p99)
+i szczyt alokacji pamięci (tracemalloc - Python i NumPy, bez wewnętrznych
+buforów OpenCV). Wyniki są zapisywane do pliku JSON, a porównanie z plikiem
+z poprzedniego wydania wskazuje regresje.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_image_utils
+    python -m benchmarks.bench_image_utils --resolutions 1920x1080 3840x2160
+    python -m benchmarks.bench_image_utils --quick --compare benchmarks/results/image_utils_0.1.8.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import invalidate_frames, set_frame_provider
+from automatyzer_desktop.utils.image_utils import (
+    compare_images, find_all_on_screen, find_image_on_screen, take_screenshot
+)
+from automatyzer_desktop.utils.template_cache import get_template_cache
+from benchmarks.synthetic import install_screen, make_missing_templates, make_screen, write_templates
+
+RESOLUTIONS = [(1280, 720), (1920, 1080)]
+QUICK_RESOLUTIONS = [(1280, 720)]
+CONFIDENCES = [0.7, 0.8, 0.95]
+COMPARE_METHODS = ["correlation", "dhash", "phash"]
+SCREENSHOT_FORMATS = ["png", "jpg", "webp"]
+
+# Rozmiar dużych wzorców (fragmenty ekranu z kilkoma elementami)
+LARGE_TEMPLATE_SIZE = (160, 96)
+
+# Domyślny próg regresji: wzrost mediany opóźnienia o więcej niż 20%
+DEFAULT_TOLERANCE = 0.2
+
+# Minimalne bezwzględne wzrosty uznawane za regresję (mniejsze to szum pomiaru)
+NOISE_FLOOR = {"p50_ms": 1.0, "peak_bytes": 64 * 1024}
+
+
+def _percentile(samples: Sequence[float], percent: float) -> float:
+    """Zwraca percentyl próbek (interpolacja liniowa, jak numpy.percentile)."""
+    return float(np.percentile(np.asarray(samples), percent))
+
+
+def _measure(call: Callable[[], Any], repeats: int, warmup: int = 1) -> Dict[str, float]:
+    """
+    Mierzy opóźnienie i szczyt alokacji pamięci wywołania.
+
+    Pomiar pamięci jest wykonywany w osobnym przebiegu, bo tracemalloc
+    spowalnia alokacje i zafałszowałby czasy.
+    """
+    for _ in range(warmup):
+        call()
+
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        call()
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p90_ms": _percentile(latencies, 90) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "mean_ms": float(np.mean(latencies)) * 1000,
+        "peak_bytes": int(peak),
+        "samples": repeats
+    }
+
+
+def _large_crops(screen: np.ndarray, placed: List[Tuple[np.ndarray, Tuple[int, int]]],
+                 count: int) -> List[Tuple[np.ndarray, Tuple[int, int]]]:
+    """Wycina z ekranu duże fragmenty zawierające umieszczone elementy."""
+    height, width = screen.shape[:2]
+    crop_width, crop_height = LARGE_TEMPLATE_SIZE
+    crops = []
+    for _, (x, y) in placed[-count:]:
+        x, y = min(max(0, x - 40), width - crop_width), min(max(0, y - 30), height - crop_height)
+        crops.append((screen[y:y + crop_height, x:x + crop_width].copy(), (x, y)))
+    return crops
+
+
+def _template_cases(screen: np.ndarray, placed: List[Tuple[np.ndarray, Tuple[int, int]]],
+                    count: int) -> Dict[Tuple[str, str], List[np.ndarray]]:
+    """
+    Przygotowuje wzorce dla przypadków (rozmiar, trafienie/chybienie).
+
+    Ikony i przyciski pochodzą z make_screen (elementy o parzystych indeksach to przyciski),
+    wzorce chybione z make_missing_templates lub z innego ekranu.
+    """
+    buttons = [template for index, (template, _) in enumerate(placed) if index % 2 == 0]
+    icons = [template for index, (template, _) in enumerate(placed) if index % 2 == 1]
+    missing = make_missing_templates(2 * count)
+
+    other_screen, other_placed = make_screen(screen.shape[1], screen.shape[0], seed=1)
+    return {
+        ("ikona", "trafienie"): icons[:count],
+        ("ikona", "chybienie"): missing[1::2][:count],
+        ("przycisk", "trafienie"): buttons[:count],
+        ("przycisk", "chybienie"): missing[0::2][:count],
+        ("duży", "trafienie"): [crop for crop, _ in _large_crops(screen, placed, count)],
+        ("duży", "chybienie"): [crop for crop, _ in _large_crops(other_screen, other_placed, count)],
+    }
+
+
+def _find_call(function: Callable, paths: List[str], **kwargs) -> Callable[[], None]:
+    """Tworzy wywołanie wyszukujące kolejno wszystkie wzorce, każdy na świeżej klatce."""
+    def call() -> None:
+        for path in paths:
+            invalidate_frames()
+            function(path, **kwargs)
+    return call
+
+
+def run_suite(resolutions: Sequence[Tuple[int, int]], templates: int, repeats: int,
+              tmp_dir: str, progress: Callable[[Dict[str, Any]], None] = None) -> List[Dict[str, Any]]:
+    """
+    Uruchamia wszystkie benchmarki.
+
+    Args:
+        resolutions: Rozdzielczości syntetycznych ekranów
+        templates: Liczba wzorców w każdym przypadku
+        repeats: Liczba powtórzeń każdego pomiaru
+        tmp_dir: Katalog na wzorce i zrzuty
+        progress: Funkcja wywoływana po każdym wyniku (opcjonalnie)
+
+    Returns:
+        Lista wyników (nazwa przypadku, parametry i pomiary)
+    """
+    results = []
+
+    def record(benchmark: str, params: Dict[str, Any], call: Callable[[], None], per_call: int = 1) -> None:
+        stats = _measure(call, repeats)
+        # Opóźnienia w przeliczeniu na jedno wywołanie funkcji
+        for key in ("p50_ms", "p90_ms", "p99_ms", "mean_ms"):
+            stats[key] /= per_call
+        name = "|".join([benchmark] + [f"{key}={value}" for key, value in params.items()])
+        result = {"name": name, "benchmark": benchmark, "params": params, **stats}
+        results.append(result)
+        if progress is not None:
+            progress(result)
+
+    for width, height in resolutions:
+        resolution = f"{width}x{height}"
+        screen, placed = make_screen(width, height)
+        previous = install_screen(screen)
+        try:
+            for (size, case), items in _template_cases(screen, placed, templates).items():
+                paths = write_templates(tmp_dir, items, f"{resolution}_{size}_{case}")
+                for confidence in CONFIDENCES:
+                    params = {"resolution": resolution, "template": size, "case": case, "confidence": confidence}
+                    record("find_image_on_screen", params,
+                           _find_call(find_image_on_screen, paths, confidence=confidence,
+                                      use_location_memory=False), len(paths))
+                    record("find_all_on_screen", params,
+                           _find_call(find_all_on_screen, paths, confidence=confidence), len(paths))
+
+            # Porównanie zrzutu z ekranem podobnym (drobna zmiana) i innym
+            first = os.path.join(tmp_dir, f"{resolution}_screen.png")
+            similar = os.path.join(tmp_dir, f"{resolution}_similar.png")
+            different = os.path.join(tmp_dir, f"{resolution}_different.png")
+            cv2.imwrite(first, screen)
+            changed = screen.copy()
+            changed[10:40, 10:200] = 0
+            cv2.imwrite(similar, changed)
+            cv2.imwrite(different, make_screen(width, height, seed=2)[0])
+
+            for method in COMPARE_METHODS:
+                for case, other in (("podobny", similar), ("inny", different)):
+                    params = {"resolution": resolution, "method": method, "case": case}
+
+                    def cold(other: str = other, method: str = method) -> None:
+                        # Bez pamięci podręcznej: dekodowanie plików wchodzi w pomiar
+                        get_template_cache().clear()
+                        compare_images(first, other, method)
+
+                    record("compare_images", {**params, "cache": "zimna"}, cold)
+                    record("compare_images", {**params, "cache": "ciepła"},
+                           lambda other=other, method=method: compare_images(first, other, method))
+
+            for image_format in SCREENSHOT_FORMATS:
+                output_path = os.path.join(tmp_dir, f"{resolution}_shot.{image_format}")
+
+                def screenshot(output_path: str = output_path) -> None:
+                    invalidate_frames()
+                    take_screenshot(output_path)
+
+                record("take_screenshot", {"resolution": resolution, "format": image_format}, screenshot)
+        finally:
+            set_frame_provider(previous)
+            get_template_cache().clear()
+
+    return results
+
+
+def _metadata() -> Dict[str, Any]:
+    """Opisuje środowisko pomiaru (wersje bibliotek i sprzęt)."""
+    try:
+        from importlib.metadata import version
+        package_version = version("automatyzer_desktop")
+    except Exception:
+        package_version = "nieznana"
+
+    return {
+        "package_version": package_version,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def compare_results(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Wskazuje przypadki, w których mediana opóźnienia lub szczyt pamięci wzrosły ponad próg.
+
+    Args:
+        current: Bieżące wyniki
+        baseline: Wyniki odniesienia (np. z poprzedniego wydania)
+        tolerance: Dopuszczalny względny wzrost (0.2 = 20%)
+
+    Returns:
+        Lista regresji (nazwa przypadku, metryka, wartość odniesienia i bieżąca)
+    """
+    reference = {result["name"]: result for result in baseline}
+    regressions = []
+    for result in current:
+        previous = reference.get(result["name"])
+        if previous is None:
+            continue
+        for metric, floor in NOISE_FLOOR.items():
+            growth = result[metric] - previous[metric]
+            if growth > floor and result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append({"name": result["name"], "metric": metric,
+                                    "baseline": previous[metric], "current": result[metric]})
+    return regressions
+
+
+def _print_result(result: Dict[str, Any]) -> None:
+    """Wypisuje wiersz tabeli wyników."""
+    params = " ".join(str(value) for value in result["params"].values())
+    print(f"{result['benchmark']:>21} {params:<40} {result['p50_ms']:>9.2f} {result['p90_ms']:>9.2f} "
+          f"{result['p99_ms']:>9.2f} {result['peak_bytes'] / 1024 / 1024:>9.1f}")
+
+
+def main() -> int:
+    """Uruchamia zestaw, zapisuje wyniki i opcjonalnie porównuje je z plikiem odniesienia."""
+    parser = argparse.ArgumentParser(description="Zestaw benchmarków image_utils")
+    parser.add_argument("--quick", action="store_true", help="Tylko najmniejsza rozdzielczość")
+    parser.add_argument("--resolutions", nargs="+", default=None, help="Rozdzielczości ekranów, np. 3840x2160")
+    parser.add_argument("--templates", type=int, default=3, help="Liczba wzorców w każdym przypadku")
+    parser.add_argument("--repeats", type=int, default=10, help="Liczba powtórzeń każdego pomiaru")
+    parser.add_argument("--output", default=None,
+                        help="Plik wyników JSON (domyślnie benchmarks/results/image_utils_<wersja>.json)")
+    parser.add_argument("--compare", default=None, help="Plik wyników odniesienia do wykrywania regresji")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Dopuszczalny względny wzrost mediany opóźnienia i pamięci")
+    args = parser.parse_args()
+
+    metadata = _metadata()
+    if args.resolutions:
+        resolutions = [tuple(int(side) for side in value.lower().split("x")) for value in args.resolutions]
+    else:
+        resolutions = QUICK_RESOLUTIONS if args.quick else RESOLUTIONS
+
+    print(f"{'funkcja':>21} {'przypadek':<40} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'pamięć MB':>9}")
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        results = run_suite(resolutions, args.templates, args.repeats, tmp_dir, progress=_print_result)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                                         f"image_utils_{metadata['package_version']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"metadata": metadata, "settings": vars(args), "results": results}, f,
+                  indent=2, ensure_ascii=False)
+    print(f"Zapisano wyniki: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline["results"], args.tolerance)
+        version = baseline.get("metadata", {}).get("package_version", "?")
+        if not regressions:
+            print(f"Brak regresji względem wersji {version}")
+            return 0
+        print(f"Regresje względem wersji {version} (próg {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"  {regression['name']} {regression['metric']}: "
+                  f"{regression['baseline']:.2f} -> {regression['current']:.2f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# Benchmark leksera DSL
+"""
+bench_lexer.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Porównuje przepustowość (tokeny na sekundę) leksera DSL dla skryptów
+o rosnącej długości: obecnego leksera (jedno wyrażenie główne dopasowywane
+od pozycji w źródle) i wcześniejszego podejścia, które dla każdego tokenu
+próbowało kolejnych wzorców na kopii reszty źródła.
+
+Przy liniowym czasie tokenizacji liczba tokenów na sekundę pozostaje
+w przybliżeniu stała niezależnie od długości skryptu; w podejściu
+z kopiowaniem spada ona wraz z długością (czas kwadratowy).
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_lexer
+    python -m benchmarks.bench_lexer --lines 100 1000 10000 --slicing-limit 2000
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from automatyzer_desktop.dsl.grammar import COMPILED_PATTERNS, KEYWORDS, TokenType
+from automatyzer_desktop.dsl.lexer import Lexer, LexerError
+
+LINES = [100, 400, 1600, 6400]
+
+# Powyżej tej liczby linii podejście z kopiowaniem źródła jest pomijane (zbyt wolne)
+SLICING_LIMIT = 1600
+
+# Fragment typowego skryptu powtarzany do uzyskania żądanej liczby linii
+SCRIPT_BLOCK = [
+    '# Logowanie do aplikacji',
+    'username = env.APP_USERNAME;  # Nazwa użytkownika',
+    'if screen_contains(image="login_form.png", confidence=0.7) {',
+    '    click(x=120, y=-40, region="0,0,800,600");',
+    '    type_text(text="Zalogowano: \\"admin\\"", delay=0.05);',
+    '    wait(seconds=0.5);',
+    '} else {',
+    '    print(text=\'Nie znaleziono formularza\');',
+    '}',
+    'pipeline logowanie { open_application(name="firefox") -> wait(seconds=3) }',
+]
+
+
+def make_script(lines: int) -> str:
+    """Buduje skrypt DSL o podanej liczbie linii."""
+    return "\n".join(SCRIPT_BLOCK[i % len(SCRIPT_BLOCK)] for i in range(lines)) + "\n"
+
+
+def slicing_tokenize(source: str) -> List[TokenType]:
+    """
+    Tokenizacja wcześniejszym sposobem: każdy wzorzec po kolei na kopii reszty źródła.
+    Zwraca tylko typy tokenów (do porównania przepustowości).
+    """
+    types = []
+    pos = 0
+    while pos < len(source):
+        for pattern, token_type in COMPILED_PATTERNS:
+            match = pattern.match(source[pos:])
+            if match:
+                if token_type == TokenType.IDENTIFIER:
+                    token_type = KEYWORDS.get(match.group(0), token_type)
+                if token_type not in (TokenType.WHITESPACE, TokenType.COMMENT):
+                    types.append(token_type)
+                pos += len(match.group(0))
+                break
+        else:
+            raise LexerError(f"Nierozpoznany znak: '{source[pos]}'", 0, pos)
+    types.append(TokenType.EOF)
+    return types
+
+
+def master_tokenize(source: str) -> List[TokenType]:
+    """Tokenizacja obecnym lekserem. Zwraca typy tokenów."""
+    return [token.type for token in Lexer(source).iter_tokens()]
+
+
+def _tokens_per_second(tokenize: Callable[[str], List[TokenType]], source: str, repeats: int) -> float:
+    """Mierzy medianę przepustowości tokenizacji (tokeny na sekundę)."""
+    durations = []
+    count = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        count = len(tokenize(source))
+        durations.append(time.perf_counter() - start)
+    return count / statistics.median(durations)
+
+
+def main() -> None:
+    """Uruchamia benchmark i wypisuje tabelę wyników."""
+    parser = argparse.ArgumentParser(description="Benchmark leksera DSL")
+    parser.add_argument("--lines", nargs="+", type=int, default=LINES, help="Długości skryptów (w liniach)")
+    parser.add_argument("--repeats", type=int, default=5, help="Liczba powtórzeń każdego pomiaru")
+    parser.add_argument("--slicing-limit", type=int, default=SLICING_LIMIT,
+                        help="Maksymalna długość skryptu dla podejścia z kopiowaniem źródła")
+    args = parser.parse_args()
+
+    print(f"{'linie':>7} {'tokeny':>8} {'kopiowanie tok/s':>17} {'master tok/s':>13}")
+    for lines in args.lines:
+        source = make_script(lines)
+        tokens = master_tokenize(source)
+        if lines <= args.slicing_limit:
+            # Oba podejścia muszą dawać te same tokeny
+            assert slicing_tokenize(source) == tokens
+            slicing = f"{_tokens_per_second(slicing_tokenize, source, args.repeats):17,.0f}"
+        else:
+            slicing = f"{'-':>17}"
+        master = _tokens_per_second(master_tokenize, source, args.repeats)
+        print(f"{lines:>7} {len(tokens):>8} {slicing} {master:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Benchmark OCR
+"""
+bench_ocr.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Porównuje liczbę odczytów tekstu na sekundę:
+- dotychczasowe podejście (zapis PNG na dysk i nowy proces tesseract na każdy region),
+- usługę OCR bez pamięci wyników (silnik utrzymywany w pamięci lub partia regionów),
+- usługę OCR z pamięcią wyników (powtarzane odczyty niezmienionych regionów).
+
+Wymaga programu tesseract (i opcjonalnie biblioteki tesserocr). Uruchomienie
+(z katalogu głównego repozytorium):
+    python -m benchmarks.bench_ocr
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from automatyzer_desktop.utils.ocr import OCR_ENGINES, OCRService, create_ocr_engine, pytesseract
+from benchmarks.synthetic import LABELS
+
+
+def _make_regions(count: int) -> List[np.ndarray]:
+    """Tworzy regiony BGR z etykietami (jak pola formularza)."""
+    regions = []
+    for index in range(count):
+        region = np.full((40, 260, 3), 250, dtype=np.uint8)
+        text = f"{LABELS[index % len(LABELS)]} {index}"
+        cv2.putText(region, text, (8, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (20, 20, 20), 2, cv2.LINE_AA)
+        regions.append(region)
+    return regions
+
+
+def _spawn_per_call(tmp_dir: str) -> Callable[[np.ndarray], str]:
+    """Odczyt jak w dotychczasowym bot.py: zapis PNG i nowy proces tesseract."""
+    def read(region: np.ndarray) -> str:
+        path = os.path.join(tmp_dir, f"ocr_region_{time.strftime('%Y%m%d_%H%M%S')}.png")
+        image = Image.fromarray(cv2.cvtColor(region, cv2.COLOR_BGR2RGB))
+        image.save(path)
+        return pytesseract.image_to_string(image)
+    return read
+
+
+def _rate(read: Callable[[np.ndarray], str], regions: List[np.ndarray], rounds: int) -> float:
+    """Mierzy liczbę odczytów regionów na sekundę."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for region in regions:
+            read(region)
+    return rounds * len(regions) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark OCR")
+    parser.add_argument("--regions", type=int, default=8, help="Liczba regionów w partii")
+    parser.add_argument("--rounds", type=int, default=3, help="Liczba powtórzeń")
+    parser.add_argument("--engine", default="auto", choices=OCR_ENGINES)
+    args = parser.parse_args()
+
+    regions = _make_regions(args.regions)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results.append(("zapis PNG + proces na odczyt", _rate(_spawn_per_call(tmp_dir), regions, args.rounds)))
+
+    engine = create_ocr_engine(args.engine)
+    try:
+        # Bez pamięci wyników: każdy odczyt trafia do silnika
+        uncached = OCRService(engine=engine, max_entries=0)
+        results.append((f"{engine.NAME}, pojedynczo", _rate(uncached.read, regions, args.rounds)))
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            uncached.read_many(regions)
+        results.append((f"{engine.NAME}, partia", args.rounds * len(regions) / (time.perf_counter() - start)))
+
+        # Z pamięcią wyników: pierwszy odczyt rozpoznaje, kolejne trafiają w pamięć
+        cached = OCRService(engine=engine)
+        results.append((f"{engine.NAME}, pamięć wyników", _rate(cached.read, regions, args.rounds)))
+    finally:
+        engine.close()
+
+    baseline = results[0][1]
+    print(f"{'wariant':>32} {'odczyty/s':>10} {'przyspieszenie':>15}")
+    for name, rate in results:
+        print(f"{name:>32} {rate:>10.1f} {rate / baseline:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Benchmark strategii dopasowania "exact" i "pyramid"
+"""
+bench_pyramid.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Porównuje dokładność i opóźnienie find_image_on_screen dla strategii
+"exact" oraz "pyramid" na syntetycznych ekranach.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.bench_pyramid
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import invalidate_frames, set_frame_provider
+from automatyzer_desktop.utils.image_utils import find_image_on_screen
+from benchmarks.synthetic import install_screen, make_missing_templates, make_screen, write_templates
+
+RESOLUTIONS = [(1920, 1080), (3840, 2160)]
+STRATEGIES = ["exact", "pyramid"]
+
+
+def _large_crops(screen: np.ndarray, placed: List[Tuple[np.ndarray, Tuple[int, int]]],
+                 count: int) -> List[Tuple[np.ndarray, Tuple[int, int]]]:
+    """Wycina z ekranu większe fragmenty (96x160) zawierające umieszczone elementy."""
+    height, width = screen.shape[:2]
+    crops = []
+    for _, (x, y) in placed[-count:]:
+        x, y = min(max(0, x - 40), width - 160), min(max(0, y - 30), height - 96)
+        crops.append((screen[y:y + 96, x:x + 160].copy(), (x, y)))
+    return crops
+
+
+def _measure(paths: List[str], truths: List[Tuple[int, int]], strategy: str, repeats: int) -> Dict[str, float]:
+    """Mierzy medianę opóźnienia i dokładność dla listy wzorców."""
+    latencies = []
+    correct = 0
+    for path, truth in zip(paths, truths):
+        for i in range(repeats):
+            # Każde wyszukiwanie na świeżej klatce (bez współdzielonych poziomów piramidy)
+            invalidate_frames()
+            start = time.perf_counter()
+            position = find_image_on_screen(path, strategy=strategy, use_location_memory=False)
+            latencies.append(time.perf_counter() - start)
+            if i == 0:
+                if truth is None:
+                    correct += position is None
+                elif position is not None:
+                    correct += abs(position[0] - truth[0]) <= 2 and abs(position[1] - truth[1]) <= 2
+    return {
+        "median_ms": statistics.median(latencies) * 1000,
+        "p95_ms": sorted(latencies)[int(len(latencies) * 0.95) - 1] * 1000,
+        "accuracy": correct / len(paths)
+    }
+
+
+def main() -> None:
+    """Uruchamia benchmark i wypisuje tabelę wyników."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--templates', type=int, default=8, help='Liczba wzorców w każdej kategorii')
+    parser.add_argument('--repeats', type=int, default=3, help='Liczba powtórzeń każdego wyszukiwania')
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    print(f"{'ekran':>10} {'przypadek':>10} {'strategia':>9} {'mediana ms':>11} {'p95 ms':>8} {'trafność':>9}")
+    try:
+        for width, height in RESOLUTIONS:
+            screen, placed = make_screen(width, height)
+            previous = install_screen(screen)
+            try:
+                cases = {
+                    "mały": placed[:args.templates],
+                    "duży": _large_crops(screen, placed, args.templates),
+                    "brak": [(t, None) for t in make_missing_templates(args.templates)],
+                }
+                for case, items in cases.items():
+                    paths = write_templates(tmp_dir, [t for t, _ in items], f"{width}_{case}")
+                    truths = [None if pos is None else (pos[0] + t.shape[1] // 2, pos[1] + t.shape[0] // 2)
+                              for t, pos in items]
+                    for strategy in STRATEGIES:
+                        stats = _measure(paths, truths, strategy, args.repeats)
+                        print(f"{width}x{height:<5} {case:>10} {strategy:>9} {stats['median_ms']:>11.1f} "
+                              f"{stats['p95_ms']:>8.1f} {stats['accuracy']:>9.0%}")
+            finally:
+                set_frame_provider(previous)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Syntetyczne ekrany i wzorce do benchmarków
+"""
+synthetic.py
+"""
+
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Generator syntetycznych zrzutów ekranu przypominających interfejs użytkownika
+(okna, przyciski z napisami, ikony) oraz wzorców do wyszukiwania.
+Nie wymaga fizycznego ekranu.
+"""
+
+import os
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import FrameProvider, set_frame_provider
+
+# Słowa używane jako etykiety przycisków
+LABELS = ["Zaloguj", "Anuluj", "Dalej", "Wstecz", "Zapisz", "Otwórz", "Szukaj", "Wyślij",
+          "Next", "Cancel", "Login", "Submit", "Open", "Close", "Settings", "Help"]
+
+
+def _button(label: str, rng: np.random.Generator, height: int = 32) -> np.ndarray:
+    """Rysuje przycisk z etykietą."""
+    width = 24 + 12 * len(label)
+    color = tuple(int(c) for c in rng.integers(120, 230, size=3))
+    button = np.full((height, width, 3), color, dtype=np.uint8)
+    cv2.rectangle(button, (0, 0), (width - 1, height - 1), (60, 60, 60), 1)
+    cv2.putText(button, label, (10, height - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (20, 20, 20), 1, cv2.LINE_AA)
+    return button
+
+
+def _icon(rng: np.random.Generator, size: int = 32) -> np.ndarray:
+    """Rysuje ikonę z kilku kolorowych kształtów."""
+    icon = np.full((size, size, 3), 245, dtype=np.uint8)
+    for _ in range(4):
+        color = tuple(int(c) for c in rng.integers(0, 255, size=3))
+        center = tuple(int(c) for c in rng.integers(4, size - 4, size=2))
+        cv2.circle(icon, center, int(rng.integers(3, size // 3)), color, -1)
+    cv2.rectangle(icon, (0, 0), (size - 1, size - 1), (90, 90, 90), 1)
+    return icon
+
+
+def make_screen(width: int, height: int, seed: int = 0,
+                widgets: int = 60) -> Tuple[np.ndarray, List[Tuple[np.ndarray, Tuple[int, int]]]]:
+    """
+    Tworzy syntetyczny ekran BGR.
+
+    Args:
+        width: Szerokość ekranu
+        height: Wysokość ekranu
+        seed: Ziarno generatora
+        widgets: Liczba przycisków i ikon
+
+    Returns:
+        Krotka (ekran, lista (wzorzec, lewy górny róg)) z umieszczonymi elementami
+    """
+    rng = np.random.default_rng(seed)
+    screen = np.zeros((height, width, 3), dtype=np.uint8)
+    screen[:] = np.linspace(200, 240, width, dtype=np.uint8)[None, :, None]
+
+    # Okna
+    for _ in range(8):
+        x, y = int(rng.integers(0, width - 200)), int(rng.integers(0, height - 150))
+        w, h = int(rng.integers(200, width // 2)), int(rng.integers(150, height // 2))
+        cv2.rectangle(screen, (x, y), (x + w, y + h), (250, 250, 250), -1)
+        cv2.rectangle(screen, (x, y), (x + w, y + 24), (160, 110, 40), -1)
+        cv2.rectangle(screen, (x, y), (x + w, y + h), (80, 80, 80), 1)
+
+    placed = []
+    for i in range(widgets):
+        widget = _button(LABELS[i % len(LABELS)] + str(i), rng) if i % 2 == 0 else _icon(rng)
+        h, w = widget.shape[:2]
+        x, y = int(rng.integers(0, width - w)), int(rng.integers(0, height - h))
+        screen[y:y + h, x:x + w] = widget
+        placed.append((widget, (x, y)))
+
+    # Elementy mogły się nakładać - wzorce wycinamy z gotowego ekranu
+    placed = [(screen[y:y + w.shape[0], x:x + w.shape[1]].copy(), (x, y)) for w, (x, y) in placed]
+    return screen, placed
+
+
+def make_missing_templates(count: int, seed: int = 1000) -> List[np.ndarray]:
+    """
+    Tworzy wzorce, których nie ma na ekranie.
+
+    Args:
+        count: Liczba wzorców
+        seed: Ziarno generatora
+
+    Returns:
+        Lista wzorców BGR
+    """
+    rng = np.random.default_rng(seed)
+    return [_button("Brak" + str(i), rng) if i % 2 == 0 else _icon(rng) for i in range(count)]
+
+
+def write_templates(directory: str, templates: List[np.ndarray], prefix: str) -> List[str]:
+    """
+    Zapisuje wzorce do plików PNG.
+
+    Args:
+        directory: Katalog docelowy
+        templates: Lista wzorców
+        prefix: Prefiks nazw plików
+
+    Returns:
+        Lista ścieżek do zapisanych plików
+    """
+    paths = []
+    for i, template in enumerate(templates):
+        path = os.path.join(directory, f"{prefix}_{i}.png")
+        cv2.imwrite(path, template)
+        paths.append(path)
+    return paths
+
+
+def install_screen(screen: np.ndarray) -> FrameProvider:
+    """
+    Ustawia syntetyczny ekran jako źródło klatek dla image_utils.
+
+    Args:
+        screen: Ekran BGR
+
+    Returns:
+        Poprzedni dostawca klatek
+    """
+    return set_frame_provider(FrameProvider(max_age=float("inf"), capture=lambda: screen))
@@ -55,6 +55,12 @@ EXTRAS = {
         'seaborn>=0.12.0',
         'scikit-learn>=1.1.0',
     ],
+    'capture': [
+        'mss>=10.0.0',
+    ],
+    'ocr': [
+        'tesserocr>=2.6.0',
+    ],
     'test': [
         'pytest>=7.2.0',
         'pytest-cov>=4.0.0',
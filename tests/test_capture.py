@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from automatyzer_desktop.utils import capture
+from automatyzer_desktop.utils.capture import CaptureBackend, PILCapture, create_capture_backend
+
+
+class _FakeCapture(CaptureBackend):
+    NAME = "fake"
+
+    def __init__(self, ring_size=2):
+        super().__init__(ring_size)
+        self.size = (30, 40)
+        self.value = 0
+
+    def grab(self):
+        self.value += 1
+        output = self._output(*self.size)
+        output[:] = self.value
+        return output
+
+
+class TestCaptureBackend(unittest.TestCase):
+
+    def test_ring_buffers_are_reused(self):
+        """Output buffers are allocated once and reused once callers release them."""
+        backend = _FakeCapture(ring_size=2)
+        first_id = id(backend())
+        backend()
+        self.assertEqual(id(backend()), first_id)
+        self.assertEqual(backend.stats(), {"captures": 3, "allocations": 1})
+
+    def test_held_frames_are_not_overwritten(self):
+        """A frame (or a view of it) kept across later captures keeps its pixels."""
+        backend = _FakeCapture(ring_size=2)
+        first = backend()
+        view = backend()[:10]
+        third = backend()
+
+        self.assertEqual(int(first[0, 0, 0]), 1)
+        self.assertEqual(int(view[0, 0, 0]), 2)
+        self.assertEqual(int(third[0, 0, 0]), 3)
+        self.assertEqual(backend.stats()["allocations"], 3)
+
+        # Released buffers return to the ring
+        del first, view, third
+        backend(), backend()
+        self.assertEqual(backend.stats()["allocations"], 3)
+
+    def test_resolution_change_reallocates(self):
+        """A new screen size replaces the buffer instead of writing out of bounds."""
+        backend = _FakeCapture(ring_size=1)
+        backend()
+        backend.size = (60, 80)
+        self.assertEqual(backend().shape, (60, 80, 3))
+        self.assertEqual(backend.stats()["allocations"], 2)
+
+    def test_falls_back_to_pil_without_mss(self):
+        """Without mss installed both "auto" and "mss" fall back to PIL."""
+        with mock.patch.object(capture, "mss", None):
+            self.assertIsInstance(create_capture_backend("auto"), PILCapture)
+            self.assertIsInstance(create_capture_backend("mss"), PILCapture)
+
+    def test_unknown_backend(self):
+        """Unknown backend names are rejected."""
+        with self.assertRaises(ValueError):
+            create_capture_backend("dxgi")
+
+    def test_pil_backend_converts_to_bgr(self):
+        """The PIL backend returns BGR pixels in a reused buffer."""
+        rgb = np.zeros((10, 20, 3), dtype=np.uint8)
+        rgb[..., 0] = 255
+        with mock.patch.object(capture.ImageGrab, "grab", return_value=rgb):
+            frame = PILCapture()()
+        self.assertEqual(frame.shape, (10, 20, 3))
+        self.assertEqual(frame[0, 0].tolist(), [0, 0, 255])
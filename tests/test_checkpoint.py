@@ -0,0 +1,129 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from automatyzer_desktop.dsl.checkpoint import CHECKPOINT_SUFFIX, CheckpointJournal
+from automatyzer_desktop.dsl.interpreter import DSLInterpreter, InterpreterError
+from automatyzer_desktop.dsl.program_cache import ProgramCache
+
+SCRIPT = ('name = "raport";\n'
+          'pipeline p { step(n=1) -> step(n=2) }\n'
+          'step(n=3);\n'
+          'flaky();\n'
+          'execute_pipeline(name="p");\n'
+          'step(label=name);\n')
+
+
+class StepAction:
+    """Action recording its parameters on the bot."""
+
+    def __init__(self, bot, **params):
+        self.bot = bot
+        self.params = params
+
+    def execute(self):
+        self.bot.calls.append(self.params)
+        return len(self.bot.calls)
+
+
+class FlakyAction:
+    """Action failing while the bot is marked as broken."""
+
+    def __init__(self, bot, **params):
+        self.bot = bot
+
+    def execute(self):
+        if self.bot.broken:
+            raise RuntimeError("połączenie przerwane")
+        return "ok"
+
+
+class HandleAction:
+    """Action returning a value that cannot be pickled."""
+
+    def __init__(self, bot, **params):
+        pass
+
+    def execute(self):
+        return lambda: None
+
+
+class FakeBot:
+    """Minimal bot exposing the action registry lookup used by the interpreter."""
+
+    def __init__(self):
+        self.calls = []
+        self.broken = True
+
+    def get_action(self, action_name):
+        return {"step": StepAction, "flaky": FlakyAction, "handle": HandleAction}.get(action_name)
+
+
+class TestCheckpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.tmp_dir, "report.abot")
+        with open(self.script, "w", encoding="utf-8") as f:
+            f.write(SCRIPT)
+        self.journal_path = self.script + CHECKPOINT_SUFFIX
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _fail_once(self, bot):
+        """Run the script until flaky() fails and return the interpreter."""
+        with self.assertRaises(InterpreterError):
+            DSLInterpreter(ProgramCache()).interpret_file(self.script, bot, checkpoints=True)
+        self.assertTrue(os.path.exists(self.journal_path))
+        self.assertEqual(bot.calls, [{"n": 3}])
+        bot.broken = False
+
+    def test_resume_skips_completed_statements(self):
+        """A resumed run restores variables and pipelines and does not repeat finished steps."""
+        bot = FakeBot()
+        self._fail_once(bot)
+
+        interpreter = DSLInterpreter(ProgramCache())
+        results = interpreter.interpret_file(self.script, bot, resume=True)
+        self.assertEqual(bot.calls, [{"n": 3}, {"n": 1}, {"n": 2}, {"label": "raport"}])
+        self.assertEqual(results, ["raport", None, 1, "ok", 3, 4])
+        self.assertIn("p", interpreter.pipelines)
+        self.assertFalse(os.path.exists(self.journal_path))
+
+    def test_changed_script_starts_over(self):
+        """A checkpoint written for a different version of the script is ignored."""
+        bot = FakeBot()
+        self._fail_once(bot)
+        with open(self.script, "a", encoding="utf-8") as f:
+            f.write("step(n=4);\n")
+
+        DSLInterpreter(ProgramCache()).interpret_file(self.script, bot, resume=True)
+        self.assertEqual(bot.calls[:2], [{"n": 3}, {"n": 3}])
+
+    def test_unserializable_values_are_skipped(self):
+        """Variables that cannot be pickled are left out of the snapshot with a warning and listed as skipped."""
+        journal = CheckpointJournal(self.journal_path, "hash")
+        with self.assertLogs("automatyzer_desktop.dsl.checkpoint", level="WARNING"):
+            journal.record(1, {"ok": [1, 2], "handle": lambda: None}, {}, [None])
+        checkpoint = CheckpointJournal(self.journal_path, "hash").load()
+        self.assertEqual(checkpoint["environment"], {"ok": [1, 2]})
+        self.assertEqual(checkpoint["skipped"], ["handle"])
+        self.assertEqual(checkpoint["completed"], 1)
+        self.assertIsNone(CheckpointJournal(self.journal_path, "other").load())
+
+    def test_resume_refuses_incomplete_snapshot(self):
+        """Resuming is refused when later statements use a variable missing from the snapshot."""
+        with open(self.script, "w", encoding="utf-8") as f:
+            f.write('h = handle();\nunused = handle();\nflaky();\nstep(label=h);\n')
+        bot = FakeBot()
+        with self.assertRaises(InterpreterError):
+            DSLInterpreter(ProgramCache()).interpret_file(self.script, bot, checkpoints=True)
+        bot.broken = False
+
+        with self.assertRaises(InterpreterError) as error:
+            DSLInterpreter(ProgramCache()).interpret_file(self.script, bot, resume=True)
+        self.assertIn("zmiennych h (", error.exception.message)
+        self.assertNotIn("unused", error.exception.message)
+        self.assertEqual(bot.calls, [])
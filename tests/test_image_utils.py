@@ -0,0 +1,503 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import FrameProvider, set_frame_provider, invalidate_frames
+from automatyzer_desktop.utils.image_utils import (
+    find_all_on_screen, find_all_templates, find_any_on_screen, find_image_on_screen, parse_region,
+    parse_scales, wait_for_image, DEFAULT_SCALES
+)
+from automatyzer_desktop.utils.location_memory import LocationMemory, get_location_memory
+from automatyzer_desktop.utils.template_cache import TemplateCache, get_template_cache
+
+
+def _random_image(height, width, seed=0):
+    """Create a deterministic noisy BGR image."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+class TestTemplateCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, name, image):
+        path = os.path.join(self.tmp_dir, name)
+        cv2.imwrite(path, image)
+        return path
+
+    def test_hit_after_first_load(self):
+        """Second lookup of the same file is served from memory."""
+        path = self._write("a.png", _random_image(40, 60))
+        cache = TemplateCache()
+
+        first = cache.get(path)
+        second = cache.get(path)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.gray.shape, (40, 60))
+        self.assertEqual(len(first.pyramid), 2)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_mtime_change_reloads(self):
+        """Rewriting the file on disk invalidates the cached entry."""
+        path = self._write("a.png", _random_image(20, 20, seed=1))
+        cache = TemplateCache()
+        first = cache.get(path)
+
+        self._write("a.png", _random_image(30, 30, seed=2))
+        os.utime(path, (first.mtime + 10, first.mtime + 10))
+
+        second = cache.get(path)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.bgr.shape[:2], (30, 30))
+
+    def test_lru_eviction_by_bytes(self):
+        """Least recently used entries are evicted once the byte budget is exceeded."""
+        paths = [self._write(f"{i}.png", _random_image(50, 50, seed=i)) for i in range(3)]
+        cache = TemplateCache()
+        entry_size = cache.get(paths[0]).nbytes
+        cache.clear()
+        cache.max_bytes = entry_size * 2
+
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])
+        cache.get(paths[2])
+
+        self.assertIn(paths[0], cache)
+        self.assertNotIn(paths[1], cache)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_missing_file(self):
+        """Missing files are reported as None and not cached."""
+        cache = TemplateCache()
+        self.assertIsNone(cache.get(os.path.join(self.tmp_dir, "missing.png")))
+        self.assertEqual(len(cache), 0)
+
+
+class TestFrameProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = _random_image(120, 160, seed=3)
+        self.calls = 0
+
+        def capture():
+            self.calls += 1
+            return self.screen
+
+        self.provider = FrameProvider(max_age=60.0, capture=capture)
+        self.previous = set_frame_provider(self.provider)
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+
+    def test_frame_reused_within_window(self):
+        """Several lookups within the freshness window share one capture."""
+        self.provider.get_frame()
+        self.provider.get_frame((10, 10, 20, 20))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.provider.stats(), {"grabs": 1, "reuses": 1})
+
+    def test_invalidate_forces_new_capture(self):
+        """Invalidation after input actions forces a fresh capture."""
+        self.provider.get_frame()
+        invalidate_frames()
+        self.provider.get_frame()
+        self.assertEqual(self.calls, 2)
+
+    def test_crop_is_clipped_and_offset(self):
+        """Regions are (x, y, width, height) and clipped to the screen."""
+        frame = self.provider.get_frame((150, 100, 50, 50))
+        self.assertEqual(frame.origin, (150, 100))
+        self.assertEqual((frame.width, frame.height), (10, 20))
+        self.assertEqual(frame.gray.shape, (20, 10))
+
+    def test_find_image_uses_shared_frame(self):
+        """find_image_on_screen returns screen coordinates of the template centre."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "t.png")
+            cv2.imwrite(path, self.screen[40:60, 70:100])
+            self.assertEqual(find_image_on_screen(path), (85, 50))
+            self.assertEqual(find_image_on_screen(path, region=(60, 30, 50, 40)), (85, 50))
+            self.assertIsNone(find_image_on_screen(path, region=(0, 0, 40, 40)))
+            self.assertEqual(self.calls, 1)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+class TestMatchingStrategies(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = cv2.GaussianBlur(_random_image(240, 320, seed=4), (5, 5), 0)
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.screen))
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, name, image):
+        path = os.path.join(self.tmp_dir, name)
+        cv2.imwrite(path, image)
+        return path
+
+    def test_pyramid_matches_exact(self):
+        """The pyramid strategy finds the same position as exact matching."""
+        path = self._write("t.png", self.screen[101:141, 53:113])
+        exact = find_image_on_screen(path, strategy="exact", use_location_memory=False)
+        self.assertEqual(exact, (83, 121))
+        self.assertEqual(find_image_on_screen(path, strategy="pyramid", use_location_memory=False), exact)
+        self.assertEqual(find_all_on_screen(path, strategy="pyramid"), [exact])
+
+    def test_pyramid_miss(self):
+        """A template absent from the screen is not found by the pyramid strategy."""
+        path = self._write("t.png", cv2.GaussianBlur(_random_image(40, 60, seed=5), (5, 5), 0))
+        self.assertIsNone(find_image_on_screen(path, strategy="pyramid"))
+
+    def test_find_all_suppresses_overlapping_hits(self):
+        """A low threshold on a grid of icons yields one match per icon, best first."""
+        icon = cv2.GaussianBlur(_random_image(24, 24, seed=6), (3, 3), 0)
+        for row in range(3):
+            for col in range(4):
+                self.screen[20 + row * 60:44 + row * 60, 20 + col * 70:44 + col * 70] = icon
+        path = self._write("icon.png", icon)
+
+        matches = find_all_on_screen(path, confidence=0.3, return_scores=True)
+
+        self.assertEqual(len(matches), 12)
+        self.assertEqual({(x, y) for x, y, _ in matches},
+                         {(32 + col * 70, 32 + row * 60) for row in range(3) for col in range(4)})
+        scores = [score for _, _, score in matches]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_unknown_strategy(self):
+        """Unknown strategies are reported as a failed lookup."""
+        path = self._write("t.png", self.screen[0:30, 0:30])
+        self.assertIsNone(find_image_on_screen(path, strategy="bogus"))
+
+
+class TestBatchSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = cv2.GaussianBlur(_random_image(200, 300, seed=7), (5, 5), 0)
+        self.calls = 0
+
+        def capture():
+            self.calls += 1
+            return self.screen
+
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=capture))
+        self.tmp_dir = tempfile.mkdtemp()
+        self.present = os.path.join(self.tmp_dir, "present.png")
+        self.absent = os.path.join(self.tmp_dir, "absent.png")
+        cv2.imwrite(self.present, self.screen[50:80, 100:140])
+        cv2.imwrite(self.absent, cv2.GaussianBlur(_random_image(30, 40, seed=8), (5, 5), 0))
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_find_all_templates_single_frame(self):
+        """All templates are evaluated against one captured frame."""
+        for parallel in (False, True):
+            results = find_all_templates([self.absent, self.present], parallel=parallel)
+            self.assertEqual(list(results), [self.absent, self.present])
+            self.assertIsNone(results[self.absent])
+            self.assertEqual(results[self.present][:2], (120, 65))
+            self.assertGreater(results[self.present][2], 0.99)
+        self.assertEqual(self.calls, 1)
+
+    def test_find_any_returns_matching_template(self):
+        """find_any_on_screen reports which template matched, where and how well."""
+        path, position, score = find_any_on_screen([self.absent, self.present])
+        self.assertEqual((path, position), (self.present, (120, 65)))
+        self.assertIsNone(find_any_on_screen([self.absent]))
+
+
+class TestLocationMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = cv2.GaussianBlur(_random_image(200, 300, seed=9), (5, 5), 0)
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.screen))
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "button.png")
+        self.button = self.screen[120:150, 200:240].copy()
+        cv2.imwrite(self.path, self.button)
+        get_location_memory().forget()
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+        shutil.rmtree(self.tmp_dir)
+        get_location_memory().forget()
+
+    def test_recall_is_padded_and_keyed_by_resolution(self):
+        """The remembered box is padded and only recalled for the same screen size."""
+        memory = LocationMemory(padding=10)
+        memory.remember("a.png", (1920, 1080), (100, 200, 30, 40))
+        self.assertEqual(memory.recall("a.png", (1920, 1080)), (90, 190, 50, 60))
+        self.assertIsNone(memory.recall("a.png", (3840, 2160)))
+        memory.forget("a.png")
+        self.assertIsNone(memory.recall("a.png", (1920, 1080)))
+
+    def test_second_lookup_hits_remembered_area(self):
+        """After a match, the next lookup is answered from the padded area around it."""
+        memory = get_location_memory()
+        self.assertEqual(find_image_on_screen(self.path), (220, 135))
+        self.assertEqual(memory.recall(self.path, (300, 200)), (168, 88, 104, 94))
+
+        hits = memory.stats()["hits"]
+        self.assertEqual(find_image_on_screen(self.path), (220, 135))
+        self.assertEqual(memory.stats()["hits"], hits + 1)
+
+    def test_moved_template_falls_back_to_full_search(self):
+        """A miss in the remembered area widens the search to the whole region."""
+        find_image_on_screen(self.path)
+        misses = get_location_memory().stats()["misses"]
+        invalidate_frames()
+        self.screen = cv2.GaussianBlur(_random_image(200, 300, seed=10), (5, 5), 0)
+        self.screen[10:40, 20:60] = self.button
+
+        self.assertEqual(find_image_on_screen(self.path), (40, 25))
+        self.assertEqual(get_location_memory().stats()["misses"], misses + 1)
+        self.assertEqual(get_location_memory().recall(self.path, (300, 200)), (-12, -22, 104, 94))
+
+    def test_parse_region(self):
+        """Regions are accepted as tuples, lists and "x,y,width,height" strings."""
+        self.assertEqual(parse_region("10, 20, 30, 40"), (10, 20, 30, 40))
+        self.assertEqual(parse_region([1, 2, 3, 4]), (1, 2, 3, 4))
+        self.assertIsNone(parse_region(None))
+        with self.assertRaises(ValueError):
+            parse_region("1,2,3")
+
+
+class TestWaitForImage(unittest.TestCase):
+
+    def setUp(self):
+        self.background = cv2.GaussianBlur(_random_image(200, 300, seed=11), (5, 5), 0)
+        self.button = cv2.GaussianBlur(_random_image(30, 40, seed=12), (5, 5), 0)
+        self.appear_after = 3
+        self.calls = 0
+
+        def capture():
+            self.calls += 1
+            screen = self.background.copy()
+            if self.calls > self.appear_after:
+                screen[100:130, 150:190] = self.button
+            return screen
+
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=capture))
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "button.png")
+        cv2.imwrite(self.path, self.button)
+        get_location_memory().forget()
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_matches_only_after_screen_changes(self):
+        """Unchanged frames skip template matching; the changed area is searched."""
+        position, stats = wait_for_image(self.path, timeout=5.0, interval=0.001)
+
+        self.assertEqual(position, (170, 115))
+        self.assertEqual(stats["frames"], 4)
+        self.assertEqual(stats["unchanged"], 2)
+        self.assertEqual(stats["matches"], 2)
+        self.assertIsNotNone(stats["time_to_match"])
+
+    def test_timeout(self):
+        """A template that never appears is reported as None after the timeout."""
+        self.appear_after = 10 ** 6
+        position, stats = wait_for_image(self.path, timeout=0.05, interval=0.001, max_interval=0.01)
+
+        self.assertIsNone(position)
+        self.assertGreater(stats["frames"], 1)
+        self.assertEqual(stats["matches"], 1)
+        self.assertIsNone(stats["time_to_match"])
+
+
+class TestColorModes(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = cv2.GaussianBlur(_random_image(200, 300, seed=13), (5, 5), 0)
+        cv2.rectangle(self.screen, (150, 60), (210, 100), (255, 255, 255), 2)
+        cv2.putText(self.screen, "OK", (165, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.screen))
+        self.tmp_dir = tempfile.mkdtemp()
+        get_location_memory().forget()
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_gray_and_edges_match_bgr(self):
+        """Grayscale and edge matching find the same position as colour matching."""
+        path = os.path.join(self.tmp_dir, "ok.png")
+        cv2.imwrite(path, self.screen[50:110, 140:220])
+        for color_mode in ("bgr", "gray", "edges"):
+            for strategy in ("exact", "pyramid"):
+                self.assertEqual(find_image_on_screen(path, strategy=strategy, use_location_memory=False,
+                                                      color_mode=color_mode), (180, 80))
+
+    def test_alpha_channel_is_used_as_mask(self):
+        """Transparent template pixels are ignored in masked mode."""
+        path = os.path.join(self.tmp_dir, "icon.png")
+        icon = np.dstack([self.screen[40:80, 40:80], np.full((40, 40), 255, np.uint8)])
+        icon[:12, :, :3] = 0
+        icon[:12, :, 3] = 0
+        cv2.imwrite(path, icon)
+
+        entry = TemplateCache().get(path)
+        self.assertEqual(entry.bgr.shape, (40, 40, 3))
+        self.assertEqual(int(entry.mask[:12].max()), 0)
+
+        self.assertIsNone(find_image_on_screen(path, confidence=0.95, use_location_memory=False))
+        self.assertEqual(find_image_on_screen(path, confidence=0.95, use_location_memory=False,
+                                              color_mode="masked"), (60, 60))
+
+    def test_unknown_color_mode(self):
+        """Unknown colour modes are reported as a failed lookup."""
+        path = os.path.join(self.tmp_dir, "ok.png")
+        cv2.imwrite(path, self.screen[50:110, 140:220])
+        self.assertIsNone(find_image_on_screen(path, color_mode="sepia"))
+
+
+class TestMultiScale(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = cv2.GaussianBlur(_random_image(300, 400, seed=14), (7, 7), 0)
+        self.icon = cv2.GaussianBlur(_random_image(40, 40, seed=15), (7, 7), 0)
+        # Icon rendered at 150% display scaling
+        self.screen[100:160, 200:260] = cv2.resize(self.icon, (60, 60), interpolation=cv2.INTER_LINEAR)
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.screen))
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "icon.png")
+        cv2.imwrite(self.path, self.icon)
+        get_location_memory().forget()
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+        shutil.rmtree(self.tmp_dir)
+        get_location_memory().forget()
+
+    def test_scaled_template_found_and_scale_learned(self):
+        """A template captured at 100% is found at 150% and the winning scale is remembered."""
+        self.assertIsNone(find_image_on_screen(self.path, confidence=0.9, use_location_memory=False))
+
+        position = find_image_on_screen(self.path, confidence=0.9, scales=DEFAULT_SCALES)
+        self.assertEqual(position, (230, 130))
+        self.assertEqual(get_location_memory().preferred_scale((400, 300)), 1.5)
+        self.assertEqual(get_location_memory().recall(self.path, (400, 300)), (168, 68, 124, 124))
+
+    def test_preferred_scale_checked_first(self):
+        """Later lookups hit the learned scale without trying the others."""
+        find_image_on_screen(self.path, confidence=0.9, scales=DEFAULT_SCALES)
+        get_location_memory().forget(self.path)
+
+        tried = []
+        cache = get_template_cache()
+        original_get = cache.get
+
+        def recording_get(path, scale=1.0):
+            tried.append(scale)
+            return original_get(path, scale)
+
+        cache.get = recording_get
+        try:
+            self.assertEqual(find_image_on_screen(self.path, confidence=0.9, scales=DEFAULT_SCALES), (230, 130))
+        finally:
+            del cache.get
+        self.assertEqual(tried, [1.0, 1.5])
+
+    def test_scaled_variants_cached_and_invalidated(self):
+        """Scaled variants live in the template cache and are dropped with their file."""
+        cache = TemplateCache()
+        scaled = cache.get(self.path, 1.25)
+        self.assertEqual((scaled.width, scaled.height, scaled.scale), (50, 50, 1.25))
+        self.assertIs(cache.get(self.path, 1.25), scaled)
+        self.assertEqual(len(cache), 2)
+        cache.invalidate(self.path)
+        self.assertEqual(len(cache), 0)
+
+    def test_parse_scales(self):
+        """Scales are accepted as sequences, comma separated strings and "auto"."""
+        self.assertEqual(parse_scales("1, 1.25"), (1.0, 1.25))
+        self.assertEqual(parse_scales("auto"), DEFAULT_SCALES)
+        self.assertIsNone(parse_scales(None))
+        with self.assertRaises(ValueError):
+            parse_scales([1.0] * 9)
+
+
+def _widget(seed=8):
+    """Create a deterministic textured widget (blocks and a label) as a BGR image."""
+    rng = np.random.default_rng(seed)
+    widget = np.full((80, 120, 3), 240, dtype=np.uint8)
+    for _ in range(12):
+        x, y = (int(v) for v in rng.integers(0, [100, 60]))
+        size = (int(rng.integers(5, 30)), int(rng.integers(5, 25)))
+        cv2.rectangle(widget, (x, y), (x + size[0], y + size[1]), tuple(int(c) for c in rng.integers(0, 200, 3)), -1)
+    cv2.putText(widget, "OK", (30, 55), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (10, 10, 10), 3)
+    return widget
+
+
+class TestFeatureMatching(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        self.screen = np.full((300, 400, 3), 200, dtype=np.uint8)
+        for _ in range(15):
+            center = tuple(int(v) for v in rng.integers(0, [390, 290]))
+            cv2.circle(self.screen, center, int(rng.integers(3, 12)), tuple(int(c) for c in rng.integers(0, 255, 3)), -1)
+
+        # Widget rotated by 25 degrees and scaled 1.3x, centred at (200, 150)
+        widget = _widget()
+        transform = cv2.getRotationMatrix2D((60, 40), 25, 1.3)
+        transform[:, 2] += [200 - 60, 150 - 40]
+        warped = cv2.warpAffine(widget, transform, (400, 300))
+        inside = cv2.warpAffine(np.full((80, 120), 255, dtype=np.uint8), transform, (400, 300)) > 0
+        self.screen[inside] = warped[inside]
+
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.screen))
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "widget.png")
+        cv2.imwrite(self.path, widget)
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+        shutil.rmtree(self.tmp_dir)
+        get_location_memory().forget()
+
+    def test_rotated_and_scaled_target(self):
+        """Template matching misses a rotated, scaled widget; feature matching finds its centre."""
+        self.assertIsNone(find_image_on_screen(self.path, use_location_memory=False))
+
+        x, y = find_image_on_screen(self.path, strategy="features")
+        self.assertLessEqual(abs(x - 200) + abs(y - 150), 3)
+
+    def test_partially_occluded_target(self):
+        """A widget partly covered by another window is still found."""
+        self.screen = self.screen.copy()
+        self.screen[150:230, 200:280] = 90
+        x, y = find_image_on_screen(self.path, strategy="features")
+        self.assertLessEqual(abs(x - 200) + abs(y - 150), 3)
+
+    def test_absent_target_and_shared_frame_features(self):
+        """Features of one frame are shared between lookups; absent targets are not found."""
+        other = os.path.join(self.tmp_dir, "other.png")
+        cv2.imwrite(other, cv2.GaussianBlur(_random_image(60, 60, seed=10), (3, 3), 0))
+
+        results = find_all_templates([self.path, other], strategy="features", confidence=0.5)
+        self.assertIsNotNone(results[self.path])
+        self.assertIsNone(results[other])
+        self.assertEqual(len(find_all_on_screen(self.path, strategy="features")), 1)
@@ -0,0 +1,163 @@
+import unittest
+
+from automatyzer_desktop.actions.base import BaseAction
+from automatyzer_desktop.dsl.interpreter import DSLInterpreter, InterpreterError
+from automatyzer_desktop.dsl.program_cache import ProgramCache
+
+
+class RecordAction:
+    """Action that records its parameters on the bot."""
+
+    def __init__(self, bot, **params):
+        self.bot = bot
+        self.params = params
+
+    def execute(self):
+        self.bot.calls.append(self.params)
+        return len(self.bot.calls)
+
+
+class CountdownAction:
+    """Action returning True until the bot's counter runs out."""
+
+    def __init__(self, bot, **params):
+        self.bot = bot
+
+    def execute(self):
+        self.bot.remaining -= 1
+        return self.bot.remaining >= 0
+
+
+class FakeBot:
+    """Minimal bot exposing the action registry lookup used by the interpreter."""
+
+    def __init__(self, remaining=0):
+        self.calls = []
+        self.remaining = remaining
+        self.lookups = 0
+
+    def get_action(self, action_name):
+        self.lookups += 1
+        return {"record": RecordAction, "countdown": CountdownAction}.get(action_name)
+
+
+class TestInterpreter(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = DSLInterpreter(ProgramCache())
+
+    def test_loops_resolve_actions_once(self):
+        """Loop bodies reuse the resolved action class and evaluate variables on every run."""
+        bot = FakeBot(remaining=3)
+        script = 'x = "a";\nrepeat 4 { record(value=x, n=1); }\nwhile countdown() { record(); }'
+        results = self.interpreter.interpret_script(script, bot)
+        self.assertEqual(results, ["a", 4, 7])
+        self.assertEqual(bot.calls[0], {"n": 1, "value": "a"})
+        self.assertEqual(bot.lookups, 3)
+
+        # A second run of the cached program is already linked to this bot
+        bot.remaining = 0
+        self.interpreter.interpret_script(script, bot)
+        self.assertEqual(bot.lookups, 3)
+
+    def test_conditionals_and_pipelines(self):
+        """Literal conditions pick a branch; pipelines run their steps in order."""
+        bot = FakeBot()
+        script = ('if false { record(branch="true"); } else { record(branch="false"); }\n'
+                  'pipeline p { record(step=1) -> record(step=2) }\n'
+                  'execute_pipeline(name="p");')
+        self.interpreter.interpret_script(script, bot)
+        self.assertEqual(bot.calls, [{"branch": "false"}, {"step": 1}, {"step": 2}])
+        self.assertIn("p", self.interpreter.pipelines)
+
+    def test_errors_report_location(self):
+        """Unknown actions fail at link time, before any statement runs; runtime errors carry their position."""
+        bot = FakeBot()
+        with self.assertRaises(InterpreterError) as error:
+            self.interpreter.interpret_script("record();\nmissing(a=1);", bot)
+        self.assertIn("line 2", str(error.exception))
+        self.assertEqual(bot.calls, [])
+
+        with self.assertRaises(InterpreterError):
+            self.interpreter.interpret("record(value=undefined);", bot)
+        with self.assertRaises(InterpreterError):
+            self.interpreter.interpret('execute_pipeline(name="none");', bot)
+
+
+class TypedAction(BaseAction):
+    """Minimal action with typed parameters and no desktop dependencies."""
+
+    ACTION_NAME = "typed"
+    REQUIRED_PARAMS = {"count": int}
+    OPTIONAL_PARAMS = {"label": (str, "none")}
+
+    def execute(self):
+        return self.params
+
+
+class CustomInitAction(TypedAction):
+    """Action with its own constructor."""
+
+    def __init__(self, bot, **kwargs):
+        super().__init__(bot, **kwargs)
+        self.initialized = True
+
+
+class TestBindParams(unittest.TestCase):
+
+    def test_bound_constructor_matches_init(self):
+        """The bound constructor builds the same action as __init__ without re-checking constants."""
+        bot = object()
+        create = TypedAction.bind_params({"label": "a"}, ["count"])
+        action = create(bot, {"count": 3})
+        expected = TypedAction(bot, count=3, label="a")
+
+        self.assertIs(action.bot, bot)
+        self.assertEqual(action.params, expected.params)
+        self.assertEqual(action.logger.name, expected.logger.name)
+        self.assertEqual(TypedAction.bind_params({"count": 1}, [])(bot, {}).params, {"count": 1, "label": "none"})
+
+    def test_invalid_params(self):
+        """Missing required or mistyped constant params fail at bind time, dynamic ones on create."""
+        with self.assertRaises(ValueError):
+            TypedAction.bind_params({"label": "a"}, [])
+        with self.assertRaises(TypeError):
+            TypedAction.bind_params({"count": "3"}, [])
+
+        create = TypedAction.bind_params({}, ["count", "label"])
+        with self.assertRaises(TypeError):
+            create(None, {"count": 1, "label": 2})
+
+    def test_custom_init_is_called(self):
+        """Subclasses overriding __init__ are still built through their constructor."""
+        action = CustomInitAction.bind_params({"count": 2}, [])(None, {})
+        self.assertTrue(action.initialized)
+        self.assertEqual(action.params, {"count": 2, "label": "none"})
+
+
+class TestActionLinking(unittest.TestCase):
+
+    def setUp(self):
+        class Bot:
+            def get_action(self, action_name):
+                return TypedAction if action_name == "typed" else None
+
+        self.bot = Bot()
+        self.interpreter = DSLInterpreter(ProgramCache())
+
+    def test_literal_params_are_checked_before_running(self):
+        """A literal of the wrong type is reported with its position before earlier statements run."""
+        with self.assertRaises(InterpreterError) as error:
+            self.interpreter.interpret_script('x = 1;\ntyped(count="3");', self.bot)
+        self.assertIn("line 2", str(error.exception))
+        self.assertNotIn("x", self.interpreter.environment)
+
+        with self.assertRaises(InterpreterError):
+            self.interpreter.interpret_script('typed(label="a");', self.bot)
+
+    def test_dynamic_params_are_checked_at_run_time(self):
+        """Variables are type-checked when the command runs; defaults are filled in."""
+        self.assertEqual(self.interpreter.interpret('n = 2;\ntyped(count=n);', self.bot),
+                         {"count": 2, "label": "none"})
+        with self.assertRaises(InterpreterError):
+            self.interpreter.interpret('n = "2";\ntyped(count=n);', self.bot)
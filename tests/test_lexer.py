@@ -0,0 +1,37 @@
+import unittest
+
+from automatyzer_desktop.dsl.grammar import TokenType
+from automatyzer_desktop.dsl.lexer import Lexer, LexerError
+
+
+class TestLexer(unittest.TestCase):
+
+    def test_tokens_and_positions(self):
+        """Tokens carry converted values and their line/column; whitespace and comments are skipped."""
+        tokens = Lexer('a -> b(x=-5, s="q\\"s")  # c\nif true { wait(seconds=0.5); }').tokenize()
+        self.assertEqual([t.type for t in tokens[:4]], [TokenType.IDENTIFIER, TokenType.ARROW,
+                                                        TokenType.IDENTIFIER, TokenType.OPEN_PAREN])
+        values = [t.value for t in tokens]
+        self.assertIn(-5, values)
+        self.assertIn('q"s', values)
+        self.assertIn(0.5, values)
+        self.assertIn(True, values)
+
+        if_token = next(t for t in tokens if t.type == TokenType.IF)
+        self.assertEqual((if_token.line, if_token.column), (2, 1))
+        self.assertEqual(tokens[-1].type, TokenType.EOF)
+        self.assertNotIn(TokenType.COMMENT, [t.type for t in tokens])
+
+    def test_tokens_are_streamed(self):
+        """iter_tokens() yields tokens before the rest of the source is scanned."""
+        tokens = Lexer("first(); @").iter_tokens()
+        self.assertEqual(next(tokens).value, "first")
+        with self.assertRaises(LexerError) as error:
+            list(tokens)
+        self.assertEqual((error.exception.line, error.exception.column), (1, 10))
+
+    def test_multiline_string_advances_lines(self):
+        """Lines inside a string literal are counted for the following tokens."""
+        tokens = Lexer('x = "a\nb"\ny').tokenize()
+        self.assertEqual((tokens[3].line, tokens[3].type), (2, TokenType.NEWLINE))
+        self.assertEqual((tokens[4].line, tokens[4].column), (3, 1))
@@ -0,0 +1,80 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import FrameProvider, set_frame_provider
+from automatyzer_desktop.utils.image_utils import find_all_on_screen, find_image_on_screen, parse_region
+from automatyzer_desktop.utils.location_memory import get_location_memory
+from automatyzer_desktop.utils.monitors import Monitor, get_monitor, set_monitors, split_screen
+
+
+class TestMonitors(unittest.TestCase):
+
+    def setUp(self):
+        # Three 200x150 monitors side by side; the third one is shorter (dead space below it)
+        self.previous_monitors = set_monitors([
+            Monitor("monitor1", 0, 0, 200, 150, primary=True),
+            Monitor("monitor2", 200, 0, 200, 150),
+            Monitor("monitor3", 400, 0, 200, 100),
+        ])
+        rng = np.random.default_rng(11)
+        self.screen = cv2.GaussianBlur(rng.integers(0, 256, (150, 600, 3), dtype=np.uint8), (5, 5), 0)
+        self.icon = self.screen[20:50, 30:70].copy()
+        self.previous_provider = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.screen))
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "icon.png")
+        cv2.imwrite(self.path, self.icon)
+
+    def tearDown(self):
+        set_frame_provider(self.previous_provider)
+        set_monitors(self.previous_monitors)
+        shutil.rmtree(self.tmp_dir)
+        get_location_memory().forget()
+
+    def test_named_monitors(self):
+        """Monitors are resolved by name, number or "primary"."""
+        self.assertEqual(get_monitor("monitor2").region, (200, 0, 200, 150))
+        self.assertEqual(get_monitor("3").name, "monitor3")
+        self.assertEqual(get_monitor("primary").name, "monitor1")
+        self.assertIsNone(get_monitor("monitor9"))
+        self.assertEqual(parse_region("monitor2"), (200, 0, 200, 150))
+        with self.assertRaises(ValueError):
+            parse_region("monitor9")
+
+    def test_split_requires_matching_desktop(self):
+        """The screen is only split when the monitors cover exactly the captured frame."""
+        self.assertEqual(len(split_screen((600, 150))), 3)
+        self.assertEqual(split_screen((1920, 1080)), [])
+
+    def test_per_monitor_search_uses_global_coordinates(self):
+        """A template on the third monitor is found at its global position."""
+        self.screen = self.screen.copy()
+        self.screen[40:70, 480:520] = self.icon
+
+        self.assertEqual(sorted(find_all_on_screen(self.path, confidence=0.95, per_monitor=True)),
+                         [(50, 35), (500, 55)])
+        self.assertEqual(sorted(find_all_on_screen(self.path, confidence=0.95)), [(50, 35), (500, 55)])
+        self.assertIn(find_image_on_screen(self.path, confidence=0.95, use_location_memory=False, per_monitor=True),
+                      [(50, 35), (500, 55)])
+
+    def test_template_across_monitor_border(self):
+        """A full-desktop lookup finds a template straddling two monitors; the per-monitor split cannot."""
+        self.screen = self.screen.copy()
+        self.screen[60:90, 180:220] = self.icon
+
+        self.assertEqual(sorted(find_all_on_screen(self.path, confidence=0.95)), [(50, 35), (200, 75)])
+        self.assertEqual(find_all_on_screen(self.path, confidence=0.95, per_monitor=True), [(50, 35)])
+
+        # With a remembered location the hinted area is searched first, without the split
+        get_location_memory().remember(self.path, (600, 150), (180, 60, 40, 30))
+        self.assertEqual(find_image_on_screen(self.path, confidence=0.95, per_monitor=True), (200, 75))
+
+    def test_restricted_to_named_monitor(self):
+        """A lookup restricted to one monitor ignores matches on the others."""
+        region = parse_region("monitor3")
+        self.assertIsNone(find_image_on_screen(self.path, confidence=0.95, region=region))
+        self.assertEqual(find_image_on_screen(self.path, confidence=0.95, region=parse_region("primary")), (50, 35))
@@ -0,0 +1,119 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from automatyzer_desktop.utils import ocr
+from automatyzer_desktop.utils.frame_provider import FrameProvider, set_frame_provider
+from automatyzer_desktop.utils.ocr import OCREngine, OCRService, PytesseractEngine, create_ocr_engine
+
+
+class _FakeEngine(OCREngine):
+    NAME = "fake"
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def recognize(self, image):
+        return f"{image.shape[1]}x{image.shape[0]}:{int(image.mean())}"
+
+    def recognize_batch(self, images):
+        self.batches.append(len(images))
+        return super().recognize_batch(images)
+
+    def recognize_words(self, image):
+        return []
+
+
+class TestOCRService(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = _FakeEngine()
+        self.service = OCRService(engine=self.engine)
+        self.image = np.full((20, 60, 3), 100, dtype=np.uint8)
+
+    def test_same_content_is_cached(self):
+        """Reading identical pixels again does not call the engine."""
+        first = self.service.read(self.image)
+        second = self.service.read(self.image.copy())
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.engine.batches, [1])
+        self.assertEqual(self.service.stats()["hits"], 1)
+
+    def test_changed_content_is_recognized(self):
+        """Different pixels in a region of the same size are a cache miss."""
+        self.service.read(self.image)
+        changed = self.image.copy()
+        changed[5:10, 5:10] = 0
+        self.service.read(changed)
+        self.assertEqual(self.engine.batches, [1, 1])
+
+    def test_missing_regions_are_batched(self):
+        """Uncached images are recognized in one engine call, cached ones are reused."""
+        images = [np.full((20, 60), value, dtype=np.uint8) for value in (10, 20, 30)]
+        self.service.read(images[0])
+        texts = self.service.read_many(images + [images[1]])
+
+        self.assertEqual(texts, ["60x20:10", "60x20:20", "60x20:30", "60x20:20"])
+        self.assertEqual(self.engine.batches, [1, 2])
+
+    def test_lru_limit(self):
+        """The oldest result is dropped when the cache is full."""
+        service = OCRService(engine=self.engine, max_entries=2)
+        for value in (10, 20, 30):
+            service.read(np.full((5, 5), value, dtype=np.uint8))
+        self.assertEqual(service.stats()["entries"], 2)
+
+    def test_read_regions_from_shared_frame(self):
+        """Screen regions are cropped from one frame and passed as arrays."""
+        screen = np.zeros((100, 200, 3), dtype=np.uint8)
+        screen[10:30, 20:80] = 200
+        previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: screen))
+        try:
+            texts = self.service.read_regions([(20, 10, 60, 20), (0, 50, 40, 10)])
+        finally:
+            set_frame_provider(previous)
+        self.assertEqual(texts, ["60x20:200", "40x10:0"])
+        self.assertEqual(self.engine.batches, [2])
+
+
+class TestOCREngines(unittest.TestCase):
+
+    def test_unknown_engine(self):
+        """Unknown engine names are rejected."""
+        with self.assertRaises(ValueError):
+            create_ocr_engine("easyocr")
+
+    @unittest.skipIf(ocr.pytesseract is None, "pytesseract is not installed")
+    def test_falls_back_to_pytesseract(self):
+        """Without tesserocr both "auto" and "tesserocr" use pytesseract."""
+        with mock.patch.object(ocr, "tesserocr", None):
+            self.assertIsInstance(create_ocr_engine("auto"), PytesseractEngine)
+            self.assertIsInstance(create_ocr_engine("tesserocr"), PytesseractEngine)
+
+    @unittest.skipIf(ocr.pytesseract is None, "pytesseract is not installed")
+    def test_pytesseract_batch_splits_words_by_region(self):
+        """One tesseract call on stacked regions is split back into per-region text."""
+        images = [np.full((30, 100), 255, dtype=np.uint8), np.full((30, 80), 255, dtype=np.uint8)]
+        _, offsets = ocr._stack(images)
+        data = {
+            "text": ["Hello", "world", "", "Second"],
+            "top": [offsets[0] + 5, offsets[0] + 5, 0, offsets[1] + 8],
+            "height": [12, 12, 0, 12],
+            "block_num": [1, 1, 0, 2],
+            "par_num": [1, 1, 0, 1],
+            "line_num": [1, 1, 0, 1]
+        }
+        with mock.patch.object(ocr.pytesseract, "image_to_data", return_value=data) as image_to_data:
+            texts = PytesseractEngine().recognize_batch(images)
+
+        image_to_data.assert_called_once()
+        self.assertEqual(texts, ["Hello world", "Second"])
+
+        # A single region is read the same way, so cached batch and single results agree
+        single = {key: [value for value, top in zip(values, data["top"]) if top < offsets[1]]
+                  for key, values in data.items()}
+        with mock.patch.object(ocr.pytesseract, "image_to_data", return_value=single):
+            self.assertEqual(PytesseractEngine().recognize(images[0]), texts[0])
@@ -0,0 +1,119 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import Frame, FrameProvider, set_frame_provider
+from automatyzer_desktop.utils.image_utils import classify_screen, compare_images
+from automatyzer_desktop.utils.perceptual_hash import (
+    HASH_METHODS, ScreenStateIndex, hamming_distance, image_hash, load_screen_states
+)
+
+
+def _page(seed, height=240, width=320):
+    """Create a deterministic page-like screen: a few large blocks on a light background."""
+    rng = np.random.default_rng(seed)
+    page = np.full((height, width, 3), 235, dtype=np.uint8)
+    for _ in range(6):
+        x, y = (int(v) for v in rng.integers(0, [width - 60, height - 40]))
+        color = tuple(int(c) for c in rng.integers(0, 200, size=3))
+        cv2.rectangle(page, (x, y), (x + int(rng.integers(40, 160)), y + int(rng.integers(20, 100))), color, -1)
+    return page
+
+
+class TestImageHash(unittest.TestCase):
+
+    def test_hash_is_stable_under_small_changes(self):
+        """Resizing and mild noise change few bits; a different page changes many."""
+        page = cv2.cvtColor(_page(1), cv2.COLOR_BGR2GRAY)
+        noisy = cv2.add(page, np.random.default_rng(2).integers(0, 8, page.shape, dtype=np.uint8))
+        resized = cv2.resize(page, (640, 480))
+        other = cv2.cvtColor(_page(3), cv2.COLOR_BGR2GRAY)
+
+        for method in HASH_METHODS:
+            reference = image_hash(page, method)
+            self.assertLessEqual(hamming_distance(reference, image_hash(noisy, method)), 6, method)
+            self.assertLessEqual(hamming_distance(reference, image_hash(resized, method)), 6, method)
+            self.assertGreater(hamming_distance(reference, image_hash(other, method)), 12, method)
+
+    def test_unknown_method(self):
+        """Unknown hash methods are rejected."""
+        with self.assertRaises(ValueError):
+            image_hash(np.zeros((8, 8), dtype=np.uint8), "whash")
+        with self.assertRaises(ValueError):
+            ScreenStateIndex("whash")
+
+
+class TestScreenStateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.pages = {name: _page(seed) for seed, name in enumerate(["login", "dashboard", "settings"], 10)}
+        self.tmp_dir = tempfile.mkdtemp()
+        for name, page in self.pages.items():
+            cv2.imwrite(os.path.join(self.tmp_dir, f"{name}.png"), page)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_classifies_known_states(self):
+        """Each reference page is recognised, also with mild noise."""
+        index = ScreenStateIndex()
+        self.assertEqual(index.load_directory(self.tmp_dir), 3)
+
+        for name, page in self.pages.items():
+            noisy = cv2.add(page, np.random.default_rng(5).integers(0, 6, page.shape, dtype=np.uint8))
+            self.assertEqual(index.classify(Frame(noisy, 0.0))[0], name)
+
+    def test_unknown_screen(self):
+        """A screen far from every state is not classified."""
+        index = ScreenStateIndex(max_distance=4)
+        index.load_directory(self.tmp_dir)
+        self.assertIsNone(index.classify(Frame(_page(99), 0.0)))
+        self.assertEqual(len(index.rank(Frame(_page(99), 0.0))), 3)
+
+    def test_region_state(self):
+        """A state described by a region ignores changes elsewhere on the screen."""
+        index = ScreenStateIndex(max_distance=4)
+        dialog = self.pages["login"].copy()
+        index.add("dialog", dialog, region=(0, 0, 160, 120))
+
+        screen = dialog.copy()
+        screen[120:, 160:] = 0
+        self.assertEqual(index.classify(Frame(screen, 0.0))[0], "dialog")
+
+    def test_classify_screen_uses_current_frame(self):
+        """classify_screen() hashes the shared frame against the given index."""
+        index = load_screen_states(self.tmp_dir)
+        self.assertIs(load_screen_states(self.tmp_dir), index)
+
+        previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.pages["settings"]))
+        try:
+            self.assertEqual(classify_screen(index=index), ("settings", 0))
+        finally:
+            set_frame_provider(previous)
+
+    def test_overwritten_reference_reloads_index(self):
+        """Overwriting a reference screenshot in place (same directory mtime) rebuilds the index."""
+        index = load_screen_states(self.tmp_dir)
+        directory_stat = os.stat(self.tmp_dir)
+        login = os.path.join(self.tmp_dir, "login.png")
+        cv2.imwrite(login, _page(99))
+        os.utime(login, ns=(os.stat(login).st_atime_ns, os.stat(login).st_mtime_ns + 10 ** 9))
+        os.utime(self.tmp_dir, ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns))
+
+        reloaded = load_screen_states(self.tmp_dir)
+        self.assertIsNot(reloaded, index)
+        self.assertEqual(reloaded.classify(Frame(_page(99), 0.0)), ("login", 0))
+
+    def test_compare_images_with_hash(self):
+        """compare_images() can use perceptual hashes instead of correlation."""
+        login = os.path.join(self.tmp_dir, "login.png")
+        scaled = os.path.join(self.tmp_dir, "login_scaled.png")
+        cv2.imwrite(scaled, cv2.resize(self.pages["login"], (480, 360)))
+
+        self.assertGreater(compare_images(login, scaled, method="phash"), 0.9)
+        self.assertLess(compare_images(login, os.path.join(self.tmp_dir, "dashboard.png"), method="phash"), 0.8)
+        self.assertEqual(compare_images(login, scaled, method="unknown"), 0.0)
@@ -0,0 +1,72 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from automatyzer_desktop.dsl import program_cache as program_cache_module
+from automatyzer_desktop.dsl.interpreter import DSLInterpreter
+from automatyzer_desktop.dsl.program_cache import PROGRAM_CACHE_SUFFIX, ProgramCache
+
+SCRIPT = 'x = 5;\ny = "tekst";\n'
+
+
+class TestProgramCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.tmp_dir, "script.abot")
+        with open(self.script, "w", encoding="utf-8") as f:
+            f.write(SCRIPT)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_repeated_source_is_parsed_once(self):
+        """The same source is lexed and parsed only on first use; old entries are evicted."""
+        cache = ProgramCache(max_entries=2)
+        with patch.object(program_cache_module, "parse_source", wraps=program_cache_module.parse_source) as parse:
+            first = cache.parse(SCRIPT)
+            self.assertIs(cache.parse(SCRIPT), first)
+            self.assertEqual(parse.call_count, 1)
+
+            cache.parse("a = 1;")
+            cache.parse("b = 2;")
+            cache.parse(SCRIPT)
+            self.assertEqual(parse.call_count, 4)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_interpreter_uses_cache(self):
+        """Cached programs execute with the same results."""
+        interpreter = DSLInterpreter(ProgramCache())
+        self.assertEqual(interpreter.interpret_script(SCRIPT, bot=None), [5, "tekst"])
+        self.assertEqual(interpreter.interpret_script(SCRIPT, bot=None), [5, "tekst"])
+        self.assertEqual(interpreter.interpret("z = 1.5;", bot=None), 1.5)
+        self.assertEqual(interpreter.interpret_file(self.script, bot=None), [5, "tekst"])
+        self.assertEqual(interpreter.program_cache.stats()["hits"], 2)
+
+    def test_disk_cache_skips_parsing(self):
+        """A fresh process reuses the AST stored next to the script until the script changes."""
+        ProgramCache(disk_cache=True).parse_file(self.script)
+        self.assertTrue(os.path.exists(self.script + PROGRAM_CACHE_SUFFIX))
+
+        cache = ProgramCache(disk_cache=True)
+        with patch.object(program_cache_module, "parse_source") as parse:
+            self.assertEqual(DSLInterpreter(cache).interpret_file(self.script, bot=None), [5, "tekst"])
+            parse.assert_not_called()
+        self.assertEqual(cache.stats()["disk_hits"], 1)
+
+        with open(self.script, "w", encoding="utf-8") as f:
+            f.write("x = 6;\n")
+        program = ProgramCache(disk_cache=True).parse_file(self.script)
+        self.assertEqual(program[0].value.value, 6)
+
+    def test_disk_cache_invalidated_by_dsl_change(self):
+        """An AST stored by a different lexer/grammar/parser is parsed again."""
+        ProgramCache(disk_cache=True).parse_file(self.script)
+
+        cache = ProgramCache(disk_cache=True)
+        with patch.object(program_cache_module, "PROGRAM_CACHE_FINGERPRINT", "changed"):
+            self.assertEqual(cache.parse_file(self.script)[0].value.value, 5)
+        self.assertEqual(cache.stats()["disk_hits"], 0)
@@ -0,0 +1,193 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils import image_utils
+from automatyzer_desktop.utils.frame_provider import Frame, FrameProvider, set_frame_provider, invalidate_frames
+from automatyzer_desktop.utils.image_utils import find_image_on_screen
+from automatyzer_desktop.utils.location_memory import get_location_memory
+from automatyzer_desktop.utils.screen_changes import ChangeDetector, wait_for_screen_settled
+
+
+def _screen(seed=0):
+    """Create a deterministic smooth BGR screen."""
+    rng = np.random.default_rng(seed)
+    return cv2.GaussianBlur(rng.integers(0, 256, size=(200, 300, 3), dtype=np.uint8), (5, 5), 0)
+
+
+class TestChangeDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = _screen(21)
+
+    def test_unknown_without_reference(self):
+        """The first frame has no reference, later identical frames report no changes."""
+        detector = ChangeDetector()
+        self.assertIsNone(detector.changes(Frame(self.screen, 0.0)))
+        self.assertEqual(detector.changes(Frame(self.screen, 0.0)), [])
+
+    def test_dirty_rectangle_covers_change(self):
+        """A changed area is reported in screen coordinates, aligned to blocks."""
+        detector = ChangeDetector(block_size=8)
+        detector.reset(Frame(self.screen, 0.0, origin=(1000, 500)))
+        changed = self.screen.copy()
+        changed[40:60, 100:140] = 255
+
+        rects = detector.changes(Frame(changed, 0.0, origin=(1000, 500)))
+        self.assertEqual(len(rects), 1)
+        x, y, width, height = rects[0]
+        self.assertLessEqual(x, 1100)
+        self.assertLessEqual(y, 540)
+        self.assertGreaterEqual(x + width, 1140)
+        self.assertGreaterEqual(y + height, 560)
+
+    def test_separate_changes_and_merge_limit(self):
+        """Distant changes are separate rectangles unless there are more than max_rects."""
+        changed = self.screen.copy()
+        changed[0:16, 0:16] = 255
+        changed[160:176, 240:256] = 255
+
+        detector = ChangeDetector(block_size=8)
+        detector.reset(Frame(self.screen, 0.0))
+        self.assertEqual(len(detector.changes(Frame(changed, 0.0))), 2)
+
+        detector = ChangeDetector(block_size=8, max_rects=1)
+        detector.reset(Frame(self.screen, 0.0))
+        self.assertEqual(detector.changes(Frame(changed, 0.0)), [(0, 0, 256, 176)])
+
+    def test_keys_have_separate_references(self):
+        """Each key sees the changes since its own last check."""
+        detector = ChangeDetector()
+        changed = self.screen.copy()
+        changed[0:40, 0:40] = 255
+        detector.reset(Frame(self.screen, 0.0), key="a")
+        detector.reset(Frame(self.screen, 0.0), key="b")
+
+        self.assertTrue(detector.changes(Frame(changed, 0.0), key="a"))
+        self.assertEqual(detector.changes(Frame(changed, 0.0), key="a"), [])
+        self.assertTrue(detector.changes(Frame(changed, 0.0), key="b"))
+
+    def test_least_recently_used_references_are_dropped(self):
+        """Only max_keys references are kept; an evicted key has unknown changes again."""
+        detector = ChangeDetector(max_keys=2)
+        for key in ("a", "b", "c"):
+            detector.reset(Frame(self.screen, 0.0), key=key)
+
+        self.assertEqual(len(detector), 2)
+        self.assertIsNone(detector.changes(Frame(self.screen, 0.0), key="a"))
+        self.assertEqual(detector.changes(Frame(self.screen, 0.0), key="c"), [])
+
+    def test_different_region_is_fully_dirty(self):
+        """A frame of another screen region is treated as completely changed."""
+        detector = ChangeDetector()
+        detector.reset(Frame(self.screen, 0.0))
+        self.assertEqual(detector.changes(Frame(self.screen[:100], 0.0, origin=(0, 50))), [(0, 50, 300, 100)])
+
+
+class TestWaitForScreenSettled(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = _screen(22)
+        self.moving_frames = 3
+        self.calls = 0
+
+        def capture():
+            self.calls += 1
+            screen = self.screen.copy()
+            if self.calls <= self.moving_frames:
+                # Animation: a bright box moving to the right
+                screen[80:120, 20 * self.calls:20 * self.calls + 40] = 255
+            return screen
+
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=capture))
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+
+    def test_settles_after_animation(self):
+        """Waiting ends once the screen has not changed for settle_time."""
+        settled, stats = wait_for_screen_settled(settle_time=0.02, timeout=5.0, interval=0.005)
+
+        self.assertTrue(settled)
+        self.assertEqual(stats["changed"], self.moving_frames)
+        self.assertGreater(stats["frames"], self.moving_frames + 1)
+
+    def test_timeout_while_changing(self):
+        """A screen that keeps changing is reported after the timeout."""
+        self.moving_frames = 10 ** 6
+        self.screen = np.zeros((200, 3000, 3), dtype=np.uint8)
+        start = time.monotonic()
+        settled, _ = wait_for_screen_settled(settle_time=0.05, timeout=0.1, interval=0.005)
+
+        self.assertFalse(settled)
+        self.assertLess(time.monotonic() - start, 2.0)
+
+
+class TestChangedOnlySearch(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = _screen(23)
+        self.button = _screen(24)[:30, :40].copy()
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.screen))
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "button.png")
+        cv2.imwrite(self.path, self.button)
+        get_location_memory().forget()
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+        shutil.rmtree(self.tmp_dir)
+
+    def _find(self):
+        invalidate_frames()
+        return find_image_on_screen(self.path, changed_only=True, use_location_memory=False)
+
+    def test_unchanged_screen_skips_matching(self):
+        """A visible template in an unchanged area is returned without matching again."""
+        self.screen[100:130, 150:190] = self.button
+        self.assertEqual(self._find(), (170, 115))
+
+        with mock.patch.object(image_utils, "_locate", wraps=image_utils._locate) as locate:
+            self.assertEqual(self._find(), (170, 115))
+            locate.assert_not_called()
+
+    def test_only_dirty_area_is_searched(self):
+        """After a change only the dirty area (padded by the template size) is searched."""
+        self.assertIsNone(self._find())
+        self.screen = self.screen.copy()
+        self.screen[20:50, 30:70] = self.button
+
+        with mock.patch.object(image_utils, "_locate", wraps=image_utils._locate) as locate:
+            self.assertEqual(self._find(), (50, 35))
+            area = locate.call_args[0][0]
+            self.assertLess(area.width * area.height, 300 * 200 // 2)
+
+    def test_moved_template_is_found(self):
+        """A template that moved to another place is found in the new dirty area."""
+        background = self.screen.copy()
+        self.screen[100:130, 150:190] = self.button
+        self.assertEqual(self._find(), (170, 115))
+
+        self.screen = background.copy()
+        self.screen[20:50, 30:70] = self.button
+        self.assertEqual(self._find(), (50, 35))
+
+        self.screen = background
+        self.assertIsNone(self._find())
+
+    def test_remembered_results_are_bounded(self):
+        """Searches with varying options keep at most CHANGED_ONLY_MAX_RESULTS results; reset forgets them."""
+        with mock.patch.object(image_utils, "CHANGED_ONLY_MAX_RESULTS", 3):
+            for confidence in (0.80, 0.81, 0.82, 0.83, 0.84):
+                find_image_on_screen(self.path, confidence=confidence, changed_only=True, use_location_memory=False)
+            self.assertEqual(len(image_utils._changed_only_results), 3)
+
+        image_utils.reset_changed_only()
+        self.assertEqual(len(image_utils._changed_only_results), 0)
+        self.assertEqual(len(image_utils.get_change_detector()), 0)
@@ -0,0 +1,86 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import FrameProvider, set_frame_provider
+from automatyzer_desktop.utils.image_utils import take_screenshot
+from automatyzer_desktop.utils.screenshot_writer import ScreenshotWriter, get_screenshot_writer
+
+
+class TestScreenshotWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.image = np.random.default_rng(0).integers(0, 256, size=(60, 80, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_submit_returns_path_and_flush_writes(self):
+        """The path is returned immediately and the file exists after flush()."""
+        writer = ScreenshotWriter(workers=2)
+        paths = [writer.submit(self.image, os.path.join(self.tmp_dir, f"{i}.png")) for i in range(5)]
+        self.assertTrue(writer.flush(timeout=10))
+        writer.close()
+
+        for path in paths:
+            np.testing.assert_array_equal(cv2.imread(path), self.image)
+        self.assertEqual(writer.stats()["written"], 5)
+
+    def test_submitted_image_is_copied(self):
+        """Overwriting the caller's buffer after submit does not change the saved file."""
+        writer = ScreenshotWriter(workers=1)
+        buffer = self.image.copy()
+        path = writer.submit(buffer, os.path.join(self.tmp_dir, "a.png"))
+        buffer[:] = 0
+        writer.flush()
+        writer.close()
+        np.testing.assert_array_equal(cv2.imread(path), self.image)
+
+    def test_format_from_extension_and_default(self):
+        """The format follows the file extension, or the pool default for temporary files."""
+        writer = ScreenshotWriter(image_format="webp", quality=101)
+        webp = writer.submit(self.image)
+        jpg = writer.submit(self.image, os.path.join(self.tmp_dir, "a.jpeg"))
+        writer.flush()
+        writer.close()
+
+        self.assertTrue(webp.endswith(".webp"))
+        np.testing.assert_array_equal(cv2.imread(webp), self.image)
+        self.assertEqual(cv2.imread(jpg).shape, self.image.shape)
+        os.remove(webp)
+
+    def test_bounded_queue_blocks_submitter(self):
+        """A full queue makes submit() wait instead of buffering frames without limit."""
+        writer = ScreenshotWriter(workers=1, max_queue=1)
+        writer._start = lambda: None
+        writer.submit(self.image, os.path.join(self.tmp_dir, "a.png"))
+
+        submitted = threading.Event()
+        thread = threading.Thread(
+            target=lambda: (writer.submit(self.image, os.path.join(self.tmp_dir, "b.png")), submitted.set()))
+        thread.start()
+        self.assertFalse(submitted.wait(0.1))
+
+        del writer._start
+        writer._start()
+        thread.join(5)
+        self.assertTrue(writer.flush(timeout=5))
+        writer.close()
+        self.assertTrue(submitted.is_set())
+
+    def test_take_screenshot_in_background(self):
+        """take_screenshot(background=True) saves the current frame through the shared pool."""
+        previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.image))
+        try:
+            path = take_screenshot(os.path.join(self.tmp_dir, "shot.png"), region=(10, 10, 20, 30),
+                                   background=True)
+            get_screenshot_writer().flush()
+        finally:
+            set_frame_provider(previous)
+        np.testing.assert_array_equal(cv2.imread(path), self.image[10:40, 10:30])
@@ -0,0 +1,96 @@
+import unittest
+import time
+
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import FrameProvider, set_frame_provider
+from automatyzer_desktop.utils.settle import SettleSynchronizer
+
+
+class TestSettleSynchronizer(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = np.zeros((120, 160, 3), dtype=np.uint8)
+        self.changing = False
+        self.screen_at = None
+        self.calls = 0
+
+        def capture():
+            self.calls += 1
+            screen = self.screen.copy()
+            if self.screen_at is not None:
+                screen[:, :] = self.screen_at()
+            if self.changing:
+                screen[:, :] = (self.calls * 40) % 256
+            return screen
+
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=capture))
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+
+    def test_static_mode_sleeps_full_delay(self):
+        """The static mode keeps the fixed delay and reports no savings."""
+        synchronizer = SettleSynchronizer(mode="static")
+        waited = synchronizer.wait("click", 0.05)
+
+        self.assertGreaterEqual(waited, 0.05)
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(synchronizer.stats()["click"]["calls"], 1)
+
+    def test_adaptive_mode_returns_when_settled(self):
+        """A screen that never reacts ends the wait after reaction_time and the saving is recorded."""
+        synchronizer = SettleSynchronizer(mode="adaptive", settle_time=0.01, interval=0.002, reaction_time=0.1)
+        waited = synchronizer.wait("click", 0.5)
+
+        self.assertGreaterEqual(waited, 0.1)
+        self.assertLess(waited, 0.4)
+        stats = synchronizer.stats()["click"]
+        self.assertGreater(stats["saved_seconds"], 0.1)
+        self.assertEqual(stats["timeouts"], 0)
+
+    def test_adaptive_mode_waits_for_late_reaction(self):
+        """A reaction starting after settle_time is waited for until the screen is quiet again."""
+        start = time.monotonic()
+        # Animation between 80 ms and 150 ms after the action
+        self.screen_at = lambda: (self.calls * 40) % 256 if 0.08 <= time.monotonic() - start < 0.15 else 0
+        synchronizer = SettleSynchronizer(mode="adaptive", settle_time=0.03, interval=0.005, reaction_time=0.3)
+        waited = synchronizer.wait("click", 1.0)
+
+        self.assertGreaterEqual(waited, 0.15 + 0.03)
+        self.assertLess(waited, 0.3)
+
+    def test_adaptive_mode_not_bounded_by_action_delay(self):
+        """With the default delay=0.1 and no max_delay a reaction later than the delay is still waited for."""
+        start = time.monotonic()
+        # Animation between 150 ms and 300 ms after the action
+        self.screen_at = lambda: (self.calls * 40) % 256 if 0.15 <= time.monotonic() - start < 0.3 else 0
+        synchronizer = SettleSynchronizer(mode="adaptive")
+        waited = synchronizer.wait("click", 0.1)
+
+        self.assertGreaterEqual(waited, 0.3 + synchronizer.settle_time)
+        self.assertLess(waited, synchronizer.max_delay)
+        stats = synchronizer.stats()["click"]
+        self.assertEqual(stats["timeouts"], 0)
+        self.assertAlmostEqual(stats["saved_seconds"], 0.1 - waited)
+
+    def test_adaptive_mode_bounded_by_max_delay(self):
+        """A screen that keeps changing is waited for at most max_delay."""
+        self.changing = True
+        synchronizer = SettleSynchronizer(mode="adaptive", settle_time=0.05, max_delay=0.08, interval=0.002)
+        waited = synchronizer.wait("type_text", 0.1)
+
+        self.assertLess(waited, 0.5)
+        self.assertEqual(synchronizer.stats()["type_text"]["timeouts"], 1)
+
+    def test_zero_delay_does_not_wait(self):
+        """delay=0 disables waiting in both modes."""
+        synchronizer = SettleSynchronizer(mode="adaptive")
+        self.assertEqual(synchronizer.wait("click", 0), 0.0)
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(synchronizer.stats(), {})
+
+    def test_unknown_mode(self):
+        """Unknown synchronization modes are rejected."""
+        with self.assertRaises(ValueError):
+            SettleSynchronizer(mode="fast")
@@ -0,0 +1,113 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+import cv2
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import FrameProvider, set_frame_provider
+from automatyzer_desktop.utils.image_utils import find_image_on_screen
+from automatyzer_desktop.utils.template_bundle import (
+    DEFAULT_BUNDLE_NAME, TemplateBundle, build_template_bundle, load_template_bundle
+)
+from automatyzer_desktop.utils.template_cache import TemplateCache, get_template_cache
+
+
+def _random_image(height, width, seed=0, channels=3):
+    """Create a deterministic noisy image."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(height, width, channels), dtype=np.uint8)
+
+
+class TestTemplateBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.tmp_dir, "dialogs"))
+        self.button = os.path.join(self.tmp_dir, "button.png")
+        self.icon = os.path.join(self.tmp_dir, "dialogs", "icon.png")
+        cv2.imwrite(self.button, _random_image(40, 60, seed=1))
+        icon = _random_image(32, 32, seed=2, channels=4)
+        icon[:, :, 3] = 255
+        icon[:8, :8, 3] = 0
+        cv2.imwrite(self.icon, icon)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_bundle_matches_decoded_templates(self):
+        """Bundled variants are identical to the ones decoded from the files."""
+        bundle = TemplateBundle(build_template_bundle(self.tmp_dir))
+        self.assertEqual(sorted(bundle.names()), ["button.png", "dialogs/icon.png"])
+
+        cache = TemplateCache()
+        for path in (self.button, self.icon):
+            bundled, decoded = bundle.lookup(path), cache.get(path)
+            for name in ("bgr", "gray", "edges"):
+                np.testing.assert_array_equal(getattr(bundled, name), getattr(decoded, name))
+            self.assertEqual(len(bundled.pyramid), len(decoded.pyramid))
+            self.assertEqual(bundled.mask is None, decoded.mask is None)
+            self.assertEqual(bundled.path, os.path.abspath(path))
+        self.assertIsNone(bundle.lookup(os.path.join(self.tmp_dir, "missing.png")))
+
+    def test_cache_serves_bundle_without_files(self):
+        """A deployment shipping only the bundle still resolves template paths."""
+        bundle = TemplateBundle(build_template_bundle(self.tmp_dir))
+        os.remove(self.button)
+
+        cache = TemplateCache()
+        cache.add_bundle(bundle)
+        entry = cache.get(self.button)
+        self.assertIs(entry, bundle.lookup(self.button))
+        self.assertEqual(cache.get(self.button, 1.5).width, 90)
+        self.assertEqual(cache.stats()["bundle_hits"], 2)
+        self.assertEqual(cache.stats()["entries"], 1)
+
+    def test_reloading_bundle_replaces_it(self):
+        """Loading the same bundle file again (e.g. a second bot) does not attach a duplicate."""
+        path = build_template_bundle(self.tmp_dir)
+        cache = TemplateCache()
+        cache.add_bundle(TemplateBundle(path))
+        cache.add_bundle(TemplateBundle(self.icon.replace("icon.png", os.path.join("..", DEFAULT_BUNDLE_NAME))))
+        reloaded = TemplateBundle(path)
+        cache.add_bundle(reloaded)
+
+        self.assertEqual(cache.stats()["bundles"], 1)
+        self.assertIs(cache.get(self.button), reloaded.lookup(self.button))
+
+    def test_newer_file_overrides_bundle(self):
+        """A template edited after the bundle was built is decoded from disk."""
+        cache = TemplateCache()
+        cache.add_bundle(TemplateBundle(build_template_bundle(self.tmp_dir)))
+
+        cv2.imwrite(self.button, _random_image(40, 60, seed=3))
+        stat = os.stat(self.button)
+        os.utime(self.button, (stat.st_atime, stat.st_mtime + 10))
+        np.testing.assert_array_equal(cache.get(self.button).bgr, cv2.imread(self.button))
+        self.assertEqual(cache.stats()["bundle_hits"], 0)
+
+    def test_image_lookup_uses_loaded_bundle(self):
+        """find_image_on_screen() resolves templates through a loaded bundle."""
+        screen = _random_image(200, 300, seed=4)
+        screen[50:90, 100:160] = cv2.imread(self.button)
+        output = os.path.join(self.tmp_dir, "out", DEFAULT_BUNDLE_NAME)
+        os.makedirs(os.path.dirname(output))
+        build_template_bundle(self.tmp_dir, output)
+        os.remove(self.button)
+
+        cache = get_template_cache()
+        previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: screen))
+        try:
+            self.assertIsNotNone(load_template_bundle(output, root=self.tmp_dir))
+            self.assertEqual(find_image_on_screen(self.button, use_location_memory=False), (130, 70))
+        finally:
+            set_frame_provider(previous)
+            cache.clear_bundles()
+            cache.clear()
+
+    def test_invalid_bundle(self):
+        """Files that are not bundles are rejected."""
+        with self.assertRaises(ValueError):
+            TemplateBundle(self.button)
+        self.assertIsNone(load_template_bundle(self.button))
@@ -0,0 +1,95 @@
+import unittest
+
+import numpy as np
+
+from automatyzer_desktop.utils.frame_provider import FrameProvider, set_frame_provider, invalidate_frames
+from automatyzer_desktop.utils.ocr import OCREngine, OCRService, Word
+from automatyzer_desktop.utils.word_index import WordIndex
+
+# Gray level of a painted block -> the word the fake engine "reads" there
+VOCABULARY = {50: "Zaloguj", 80: "Next", 110: "Log", 140: "in:", 170: "Anuluj"}
+
+
+class _BlockEngine(OCREngine):
+    """Fake OCR engine that reads each uniformly painted block as one word."""
+
+    NAME = "blocks"
+
+    def __init__(self):
+        super().__init__()
+        self.pixels = []
+
+    def recognize(self, image):
+        return " ".join(word.text for word in self.recognize_words(image))
+
+    def recognize_words(self, image):
+        self.pixels.append(image.size)
+        words = []
+        for value, text in VOCABULARY.items():
+            ys, xs = np.nonzero(image == value)
+            if len(xs):
+                words.append(Word(text, int(xs.min()), int(ys.min()), int(np.ptp(xs)) + 1, int(np.ptp(ys)) + 1, 95.0))
+        return words
+
+
+class TestWordIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.screen = np.full((300, 400, 3), 255, dtype=np.uint8)
+        self.screen[20:40, 30:110] = 50
+        self.screen[200:220, 300:350] = 80
+        self.previous = set_frame_provider(FrameProvider(max_age=60.0, capture=lambda: self.screen))
+        self.engine = _BlockEngine()
+        self.index = WordIndex(OCRService(engine=self.engine))
+
+    def tearDown(self):
+        set_frame_provider(self.previous)
+
+    def _find(self, text, **kwargs):
+        invalidate_frames()
+        self.index.update()
+        return self.index.find(text, **kwargs)
+
+    def test_repeated_lookups_use_index(self):
+        """The first lookup reads the whole screen, repeated ones do not call the engine."""
+        self.assertEqual(self._find("zaloguj"), [(30, 20, 80, 20)])
+        self.assertEqual(self._find("Next"), [(300, 200, 50, 20)])
+
+        self.assertEqual(self.engine.pixels, [400 * 300])
+        self.assertEqual(self.index.stats()["unchanged"], 1)
+
+    def test_only_dirty_region_is_read(self):
+        """A new label is found by reading only the changed area; other words stay indexed."""
+        self._find("Next")
+        self.screen = self.screen.copy()
+        self.screen[120:140, 150:220] = 170
+
+        self.assertEqual(self._find("Anuluj"), [(150, 120, 70, 20)])
+        self.assertEqual(self._find("Zaloguj"), [(30, 20, 80, 20)])
+        self.assertLess(self.engine.pixels[-1], 400 * 300 // 4)
+        self.assertEqual(self.index.stats()["partial_updates"], 1)
+
+    def test_removed_word_is_dropped(self):
+        """A label that disappears is removed from the index."""
+        self._find("Next")
+        self.screen = self.screen.copy()
+        self.screen[200:220, 300:350] = 255
+        self.assertEqual(self._find("Next"), [])
+
+    def test_phrase_on_one_line(self):
+        """Words of a phrase must follow each other on the same line."""
+        self.screen[100:120, 50:80] = 110
+        self.screen[100:120, 88:110] = 140
+        self.assertEqual(self._find("log in"), [(50, 100, 60, 20)])
+
+        self.screen = self.screen.copy()
+        self.screen[100:120, 88:110] = 255
+        self.screen[250:270, 88:110] = 140
+        self.assertEqual(self._find("log in"), [])
+
+    def test_matching_options(self):
+        """Substring, exact, case-sensitive and region-restricted lookups."""
+        self.assertEqual(len(self._find("zalog")), 1)
+        self.assertEqual(self._find("zalog", exact=True), [])
+        self.assertEqual(self._find("zaloguj", case_sensitive=True), [])
+        self.assertEqual(self._find("Zaloguj", region=(200, 150, 200, 150)), [])